@@ -5,8 +5,6 @@ import functools
 import getpass
 import logging
 import os
-import pip
-import pkg_resources
 import platform
 import shutil
 import signal
@@ -16,6 +14,12 @@ from copy import deepcopy
 from pathlib import Path
 from typing import NoReturn
 
+# This has to happen before anything heavy gets imported, which is before the CLI flags are parsed.
+if any(arg.split("=", 1)[0] == "--profile-startup" for arg in sys.argv[1:]):
+    from redbot import _startup_profiler
+
+    _startup_profiler.install()
+
 from redbot import aiohttp
 
 import discord
@@ -24,7 +28,7 @@ import rich
 # Set the event loop policies here so any subsequent `new_event_loop()`
 # calls, in particular those as a result of the following imports,
 # return the correct loop object.
-from redbot import _early_init, __version__, json
+from redbot import _early_init, _startup_profiler, __version__, json
 
 _early_init()
 
@@ -66,6 +70,8 @@ def list_instances():
 
 def debug_info():
     """Shows debug information useful for debugging."""
+    import pip
+
     if sys.platform == "linux":
         import distro  # pylint: disable=import-error
 
@@ -332,12 +338,14 @@ async def run_bot(red: Red, cli_flags: Namespace) -> None:
     driver_cls = drivers.get_driver_class()
 
     await driver_cls.initialize(**data_manager.storage_details())
+    _startup_profiler.mark("Storage driver initialization")
 
     redbot.logging.init_logging(
         level=cli_flags.logging_level,
         location=data_manager.core_data_path() / "logs",
         cli_flags=cli_flags,
     )
+    _startup_profiler.mark("Logging initialization")
 
     log.debug("====Basic Config====")
     log.debug("Data Path: %s", data_manager._base_data_path())
@@ -356,7 +364,9 @@ async def run_bot(red: Red, cli_flags: Namespace) -> None:
         # `sys.path`, you must invoke the appropriate methods on the `working_set` instance
         # to keep it in sync."
         # Source: https://setuptools.readthedocs.io/en/latest/pkg_resources.html#workingset-objects
-        pkg_resources.working_set.add_entry(str(LIB_PATH))
+        # If it hasn't been imported yet, it will pick up the modified `sys.path` once it is.
+        if "pkg_resources" in sys.modules:
+            sys.modules["pkg_resources"].working_set.add_entry(str(LIB_PATH))
     sys.meta_path.insert(0, SharedLibImportWarner())
 
     if cli_flags.token:
@@ -482,6 +492,7 @@ def red_exception_handler(red, red_task: asyncio.Future):
 
 def main():
     red = None  # Error handling for users misusing the bot
+    _startup_profiler.mark("Imports")
     cli_flags = parse_cli_flags(sys.argv[1:])
     handle_early_exit_flags(cli_flags)
     if cli_flags.edit:
@@ -556,6 +567,7 @@ def main():
         asyncio.set_event_loop(None)
         loop.stop()
         loop.close()
+        redbot.logging.shutdown_queue_logging()
         exit_code = red._shutdown_mode if red is not None else 1
         sys.exit(exit_code)
 
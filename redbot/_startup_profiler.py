@@ -0,0 +1,120 @@
+"""
+Startup profiler enabled with the ``--profile-startup`` flag.
+
+It has to be installed before Red's heavy dependencies are imported,
+which is why it only uses the standard library and lives outside of ``redbot.core``.
+"""
+import contextlib
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+__all__ = ("StartupProfiler", "install", "uninstall", "mark", "get_profiler")
+
+_profiler: Optional["StartupProfiler"] = None
+
+
+class StartupProfiler:
+    """
+    Records how long importing each module takes and the durations of the startup phases.
+
+    Phases are recorded as marks, each mark ends the phase started by the previous one.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        # module name -> (cumulative time, self time)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self.marks: List[Tuple[str, float]] = []
+        self._import_stack: List[float] = []
+
+    # region import timing
+    def find_spec(self, fullname, path=None, target=None):
+        # Let the other finders do the work and just time the loader of the found spec.
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Some loaders (e.g. for builtin modules) are classes shared by all of their modules.
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            with contextlib.suppress(AttributeError, TypeError):
+                loader.exec_module = self._timed_exec_module(fullname, loader.exec_module)
+        return spec
+
+    def _timed_exec_module(self, fullname, exec_module):
+        def timed_exec_module(module):
+            self._import_stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._import_stack.pop()
+                if self._import_stack:
+                    self._import_stack[-1] += elapsed
+                self.imports[fullname] = (elapsed, elapsed - children)
+
+        return timed_exec_module
+
+    # endregion
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, time.perf_counter()))
+
+    def iter_phases(self) -> Iterator[Tuple[str, float]]:
+        previous = self.start
+        for name, timestamp in self.marks:
+            yield name, timestamp - previous
+            previous = timestamp
+
+    def format_report(self, *, limit: int = 40) -> str:
+        lines = ["Startup phases:"]
+        for name, duration in self.iter_phases():
+            lines.append(f"  {duration * 1000:>10.1f}ms  {name}")
+        if self.marks:
+            total = self.marks[-1][1] - self.start
+            lines.append(f"  {total * 1000:>10.1f}ms  Total")
+
+        for title, idx in (("cumulative", 0), ("self", 1)):
+            lines.append("")
+            lines.append(f"Slowest imports by {title} time:")
+            ranked = sorted(self.imports.items(), key=lambda item: item[1][idx], reverse=True)
+            for module_name, times in ranked[:limit]:
+                lines.append(f"  {times[idx] * 1000:>10.1f}ms  {module_name}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.format_report(), encoding="utf-8")
+
+
+def install() -> StartupProfiler:
+    """Start profiling the startup. Imports done before this can't be timed."""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def get_profiler() -> Optional[StartupProfiler]:
+    return _profiler
+
+
+def mark(name: str) -> None:
+    """End the current startup phase with the given name. Does nothing unless profiling."""
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def uninstall() -> None:
+    """Stop timing imports. The recorded data is kept."""
+    if _profiler is not None:
+        with contextlib.suppress(ValueError):
+            sys.meta_path.remove(_profiler)
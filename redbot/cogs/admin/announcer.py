@@ -1,10 +1,9 @@
-import asyncio
 from typing import Optional
 
 import discord
 from redbot.core import commands
 from redbot.core.i18n import Translator
-from redbot.core.utils import AsyncIter
+from redbot.core.utils import bounded_gather_stream
 from redbot.core.utils.chat_formatting import humanize_list, inline
 
 _ = Translator("Announcer", __file__)
@@ -45,23 +44,45 @@ class Announcer:
         channel_id = await self.config.guild(guild).announce_channel()
         return guild.get_channel(channel_id)
 
+    async def _announce(self, guild: discord.Guild) -> bool:
+        channel = await self._get_announce_channel(guild)
+        if not channel:
+            return True
+        if not channel.permissions_for(guild.me).send_messages:
+            return False
+        try:
+            await channel.send(self.message)
+        except discord.Forbidden:
+            return False
+        return True
+
     async def announcer(self):
+        try:
+            await self._announce_all()
+        finally:
+            self.active = False
+
+    async def _announce_all(self):
         guild_list = self.ctx.bot.guilds
         failed = []
-        async for g in AsyncIter(guild_list, delay=0.5):
+        # exceptions are yielded, so that one failed guild (or getting rate limited,
+        # which lowers the concurrency) doesn't abort the whole announcement
+        results = bounded_gather_stream(
+            map(self._announce, guild_list),
+            limit=4,
+            rate=2,
+            adaptive=True,
+            return_exceptions=True,
+        )
+        # results are yielded in the order of guild_list
+        idx = 0
+        async for result in results:
             if not self.active:
+                await results.aclose()
                 return
-
-            channel = await self._get_announce_channel(g)
-
-            if channel:
-                if channel.permissions_for(g.me).send_messages:
-                    try:
-                        await channel.send(self.message)
-                    except discord.Forbidden:
-                        failed.append(str(g.id))
-                else:
-                    failed.append(str(g.id))
+            if isinstance(result, Exception) or not result:
+                failed.append(str(guild_list[idx].id))
+            idx += 1
 
         if failed:
             msg = (
@@ -71,4 +92,3 @@ class Announcer:
             )
             msg += humanize_list(tuple(map(inline, failed)))
             await self.ctx.bot.send_to_owners(msg)
-        self.active = False
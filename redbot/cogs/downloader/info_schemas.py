@@ -217,6 +217,7 @@ INSTALLABLE_SCHEMA: SchemaType = {
     "hidden": ensure_bool,
     "disabled": ensure_bool,
     "required_cogs": ensure_required_cogs_mapping,
+    "load_after": ensure_tuple_of_str,
     "requirements": ensure_tuple_of_str,
     "tags": ensure_tuple_of_str,
     "type": ensure_installable_type,
@@ -1,19 +1,40 @@
 import asyncio
+import functools
+import time
 import discord
-import re
 from datetime import timezone
-from typing import Union, Set, Literal
+from typing import Any, Dict, Iterable, Optional, Union, Set, Literal, Tuple
 
 from redbot.core import checks, Config, modlog, commands
 from redbot.core.bot import Red
+from redbot.core.config import Group
 from redbot.core.i18n import Translator, cog_i18n, set_contextual_locales_from_guild
 from redbot.core.utils.predicates import MessagePredicate
-from redbot.core.utils import AsyncIter
-from redbot.core.utils.chat_formatting import pagify, humanize_list
+from redbot.core.utils import AsyncIter, bounded_gather_stream
+from redbot.core.utils.caching import AsyncCache
+from redbot.core.utils.chat_formatting import humanize_list, humanize_number, pagify
+
+from .matcher import WordMatcher
 
 _ = Translator("Filter", __file__)
 
 
+def _sizeof(matcher: Optional[WordMatcher]) -> int:
+    return matcher.memory_size if matcher is not None else 0
+
+
+class NameSweep:
+    """A running `[p]filter sweepnames`."""
+
+    __slots__ = ("progress", "total", "task")
+
+    def __init__(self, progress: Dict[str, int], total: int):
+        #: ``last_id``, ``checked`` and ``renamed`` - saved to Config to resume the sweep
+        self.progress = progress
+        self.total = total
+        self.task: Optional[asyncio.Task] = None
+
+
 @cog_i18n(_)
 class Filter(commands.Cog):
     """This cog is designed for "filtering" unwanted words and phrases from a server.
@@ -23,6 +44,8 @@ class Filter(commands.Cog):
     This can be used to prevent inappropriate language, off-topic discussions, invite links, and more.
     """
 
+    NAME_SWEEP_CHUNK_SIZE = 1000
+
     def __init__(self, bot: Red):
         super().__init__()
         self.bot = bot
@@ -33,13 +56,32 @@ class Filter(commands.Cog):
             "filterban_time": 0,
             "filter_names": False,
             "filter_default_name": "John Doe",
+            # progress of an unfinished `[p]filter sweepnames`, so that it can be resumed
+            "name_sweep": None,
         }
         default_member_settings = {"filter_count": 0, "next_reset_time": 0}
         default_channel_settings = {"filter": []}
         self.config.register_guild(**default_guild_settings)
         self.config.register_member(**default_member_settings)
         self.config.register_channel(**default_channel_settings)
-        self.pattern_cache = {}
+        # Matchers for the guild's words and for the channel's words (overlaid on the guild's),
+        # so that changing the guild's list doesn't require rebuilding them for each channel.
+        self._guild_matchers: AsyncCache[int, Optional[WordMatcher]] = AsyncCache(
+            name="filter.guild_matchers", maxsize=2000, max_bytes=64 * 1024**2, sizeof=_sizeof
+        )
+        self._channel_matchers: AsyncCache[int, Optional[WordMatcher]] = AsyncCache(
+            name="filter.channel_matchers", maxsize=5000, max_bytes=16 * 1024**2, sizeof=_sizeof
+        )
+        # guild ID -> guild settings, invalidated by the commands changing them
+        self._guild_settings: Dict[int, Dict[str, Any]] = {}
+        # (guild ID, member ID) -> member settings (the autoban counter),
+        # written to Config in batches by the checkpoint task
+        self._filter_counts: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._dirty_filter_counts: Set[Tuple[int, int]] = set()
+        self._checkpoint_task = None
+        # guild ID -> running name sweep
+        self._name_sweeps: Dict[int, NameSweep] = {}
+        self._resume_task = None
 
     async def red_delete_data_for_user(
         self,
@@ -50,6 +92,10 @@ class Filter(commands.Cog):
         if requester != "discord_deleted_user":
             return
 
+        for key in [key for key in self._filter_counts if key[1] == user_id]:
+            del self._filter_counts[key]
+            self._dirty_filter_counts.discard(key)
+
         all_members = await self.config.all_members()
 
         async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
@@ -58,6 +104,53 @@ class Filter(commands.Cog):
 
     async def initialize(self) -> None:
         await self.register_casetypes()
+        self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+        # the loop only writes once a minute, what's left has to be written before shutting down
+        self.bot.add_shutdown_hook(self.checkpoint_filter_counts)
+        self._resume_task = asyncio.create_task(self._resume_name_sweeps())
+
+    def cog_unload(self) -> None:
+        if self._checkpoint_task is not None:
+            self._checkpoint_task.cancel()
+            self.bot.remove_shutdown_hook(self.checkpoint_filter_counts)
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+        # the progress is saved, so the sweeps are resumed when the cog is loaded again
+        for sweep in self._name_sweeps.values():
+            sweep.task.cancel()
+        asyncio.create_task(self.checkpoint_filter_counts())
+
+    async def _checkpoint_loop(self) -> None:
+        while True:
+            await asyncio.sleep(60)
+            await self.checkpoint_filter_counts()
+
+    async def checkpoint_filter_counts(self) -> None:
+        """Write the changed autoban counters to Config."""
+        dirty, self._dirty_filter_counts = self._dirty_filter_counts, set()
+        try:
+            for key in list(dirty):
+                data = self._filter_counts.get(key)
+                if data is not None:
+                    await self.config.member_from_ids(*key).set(dict(data))
+                dirty.discard(key)
+        finally:
+            # whatever wasn't written (e.g. when cancelled) is kept for the next checkpoint
+            self._dirty_filter_counts |= dirty
+        # counters whose time frame ended will be reset on the next hit anyway
+        now = time.time()
+        for key, data in list(self._filter_counts.items()):
+            if key not in self._dirty_filter_counts and data["next_reset_time"] <= now:
+                del self._filter_counts[key]
+
+    async def get_guild_settings(self, guild: discord.Guild) -> Dict[str, Any]:
+        """Get the (cached) settings of the guild."""
+        try:
+            return self._guild_settings[guild.id]
+        except KeyError:
+            pass
+        data = await self.config.guild(guild).all()
+        return self._guild_settings.setdefault(guild.id, data)
 
     @staticmethod
     async def register_casetypes() -> None:
@@ -103,6 +196,7 @@ class Filter(commands.Cog):
         """
         guild = ctx.guild
         await self.config.guild(guild).filter_default_name.set(name)
+        self._guild_settings.pop(guild.id, None)
         await ctx.send(_("The name to use on filtered names has been set."))
 
     @filterset.command(name="ban")
@@ -135,11 +229,13 @@ class Filter(commands.Cog):
             async with self.config.guild(ctx.guild).all() as guild_data:
                 guild_data["filterban_count"] = 0
                 guild_data["filterban_time"] = 0
+            self._guild_settings.pop(ctx.guild.id, None)
             await ctx.send(_("Autoban disabled."))
         else:
             async with self.config.guild(ctx.guild).all() as guild_data:
                 guild_data["filterban_count"] = count
                 guild_data["filterban_time"] = timeframe
+            self._guild_settings.pop(ctx.guild.id, None)
             await ctx.send(_("Count and time have been set."))
 
     @commands.group(name="filter")
@@ -341,18 +437,141 @@ class Filter(commands.Cog):
         async with self.config.guild(guild).all() as guild_data:
             current_setting = guild_data["filter_names"]
             guild_data["filter_names"] = not current_setting
+        self._guild_settings.pop(guild.id, None)
         if current_setting:
             await ctx.send(_("Names and nicknames will no longer be filtered."))
         else:
             await ctx.send(_("Names and nicknames will now be filtered."))
 
+    @_filter.group(name="sweepnames", invoke_without_command=True)
+    @checks.admin_or_permissions(manage_guild=True)
+    async def filter_sweepnames(self, ctx: commands.Context):
+        """Filter the names and nicknames of all current members.
+
+        Names are normally only filtered when members join or change them,
+        so this can be used after adding words to the filter.
+        Filtering names has to be enabled (to toggle, run `[p]filter names`).
+
+        The sweep runs in the background and it continues after the bot restarts.
+        """
+        guild = ctx.guild
+        if guild.id in self._name_sweeps:
+            await ctx.send(
+                _(
+                    "A sweep is already running in this server,"
+                    " use `{command}` to see its progress."
+                ).format(command=f"{ctx.clean_prefix}filter sweepnames status")
+            )
+            return
+        if not (await self.get_guild_settings(guild))["filter_names"]:
+            await ctx.send(
+                _("Filtering names is disabled, use `{command}` to enable it.").format(
+                    command=f"{ctx.clean_prefix}filter names"
+                )
+            )
+            return
+        if not guild.me.guild_permissions.manage_nicknames:
+            await ctx.send(_("I need the Manage Nicknames permission to change names."))
+            return
+        self._start_name_sweep(guild, {"last_id": 0, "checked": 0, "renamed": 0})
+        await ctx.send(
+            _(
+                "Started filtering the names of {count} members,"
+                " use `{command}` to see the progress."
+            ).format(
+                count=humanize_number(guild.member_count),
+                command=f"{ctx.clean_prefix}filter sweepnames status",
+            )
+        )
+
+    @filter_sweepnames.command(name="status")
+    async def filter_sweepnames_status(self, ctx: commands.Context):
+        """Show the progress of the name sweep."""
+        sweep = self._name_sweeps.get(ctx.guild.id)
+        if sweep is None:
+            await ctx.send(_("There is no sweep running in this server."))
+            return
+        await ctx.send(
+            _("Checked {checked} of {total} members, {renamed} were renamed.").format(
+                checked=humanize_number(sweep.progress["checked"]),
+                total=humanize_number(sweep.total),
+                renamed=humanize_number(sweep.progress["renamed"]),
+            )
+        )
+
+    @filter_sweepnames.command(name="cancel")
+    async def filter_sweepnames_cancel(self, ctx: commands.Context):
+        """Cancel the name sweep."""
+        sweep = self._name_sweeps.pop(ctx.guild.id, None)
+        if sweep is None:
+            await ctx.send(_("There is no sweep running in this server."))
+            return
+        sweep.task.cancel()
+        await self.config.guild(ctx.guild).name_sweep.clear()
+        await ctx.send(_("The sweep has been cancelled."))
+
+    def _start_name_sweep(self, guild: discord.Guild, progress: Dict[str, int]) -> None:
+        sweep = NameSweep(progress, guild.member_count)
+        sweep.task = asyncio.create_task(self._sweep_names(guild, sweep))
+        self._name_sweeps[guild.id] = sweep
+
+    async def _resume_name_sweeps(self) -> None:
+        await self.bot.wait_until_red_ready()
+        all_guilds = await self.config.all_guilds()
+        for guild_id, guild_data in all_guilds.items():
+            progress = guild_data.get("name_sweep")
+            guild = self.bot.get_guild(guild_id)
+            if progress is None or guild is None or guild_id in self._name_sweeps:
+                continue
+            self._start_name_sweep(guild, progress)
+
+    async def _sweep_names(self, guild: discord.Guild, sweep: NameSweep) -> None:
+        try:
+            progress = sweep.progress
+            # members are checked in the order of their IDs, so that the sweep can be resumed
+            members = sorted(
+                (m for m in guild.members if m.id > progress["last_id"]), key=lambda m: m.id
+            )
+            sweep.total = progress["checked"] + len(members)
+            loop = asyncio.get_running_loop()
+            for idx in range(0, len(members), self.NAME_SWEEP_CHUNK_SIZE):
+                chunk = members[idx : idx + self.NAME_SWEEP_CHUNK_SIZE]
+                matcher = await self._get_guild_matcher(guild)
+                if matcher is None:
+                    break
+                matched_ids = set(
+                    await loop.run_in_executor(
+                        None,
+                        matcher.matching_keys,
+                        [(m.id, m.display_name) for m in chunk],
+                    )
+                )
+                to_rename = [m for m in chunk if m.id in matched_ids]
+                # renames are paced to stay below the rate limits
+                async for renamed in bounded_gather_stream(
+                    map(self.maybe_filter_name, to_rename),
+                    limit=2,
+                    rate=2,
+                    adaptive=True,
+                    return_exceptions=True,
+                ):
+                    if renamed is True:
+                        progress["renamed"] += 1
+                progress["checked"] += len(chunk)
+                progress["last_id"] = chunk[-1].id
+                await self.config.guild(guild).name_sweep.set(progress)
+            await self.config.guild(guild).name_sweep.clear()
+        finally:
+            if self._name_sweeps.get(guild.id) is sweep:
+                del self._name_sweeps[guild.id]
+
     def invalidate_cache(self, guild: discord.Guild, channel: discord.TextChannel = None):
         """ Invalidate a cached pattern"""
-        self.pattern_cache.pop((guild, channel), None)
+        self._guild_settings.pop(guild.id, None)
         if channel is None:
-            for keyset in list(self.pattern_cache.keys()):  # cast needed, no remove
-                if guild in keyset:
-                    self.pattern_cache.pop(keyset, None)
+            self._guild_matchers.invalidate(guild.id)
+        else:
+            self._channel_matchers.invalidate(channel.id)
 
     async def add_to_filter(
         self, server_or_channel: Union[discord.Guild, discord.TextChannel], words: list
@@ -405,90 +624,107 @@ class Filter(commands.Cog):
             guild = server_or_channel
             channel = None
 
-        hits: Set[str] = set()
+        matcher = await self._get_guild_matcher(guild)
+        hits: Set[str] = matcher.find_all(text) if matcher else set()
+        if channel:
+            matcher = await self._channel_matchers.get_or_load(
+                channel.id, functools.partial(self._load_matcher, self.config.channel(channel))
+            )
+            if matcher:
+                hits |= matcher.find_all(text)
+        return hits
 
-        try:
-            pattern = self.pattern_cache[(guild, channel)]
-        except KeyError:
-            word_list = set(await self.config.guild(guild).filter())
-            if channel:
-                word_list |= set(await self.config.channel(channel).filter())
+    async def _get_guild_matcher(self, guild: discord.Guild) -> Optional[WordMatcher]:
+        return await self._guild_matchers.get_or_load(
+            guild.id, functools.partial(self._load_matcher, self.config.guild(guild))
+        )
 
-            if word_list:
-                pattern = re.compile(
-                    "|".join(rf"\b{re.escape(w)}\b" for w in word_list), flags=re.I
-                )
-            else:
-                pattern = None
+    async def _load_matcher(self, group: Group) -> Optional[WordMatcher]:
+        words = await group.filter()
+        return await self._build_matcher(words) if words else None
 
-            self.pattern_cache[(guild, channel)] = pattern
+    async def _build_matcher(self, words: Iterable[str]) -> WordMatcher:
+        """Build a matcher for the words, in an executor if there are a lot of them."""
+        words = set(words)
+        if len(words) < 200:
+            return WordMatcher(words)
+        return await self.bot.loop.run_in_executor(None, WordMatcher, words)
 
-        if pattern:
-            hits |= set(pattern.findall(text))
-        return hits
+    async def _count_filter_hit(
+        self, member: discord.Member, timestamp: float, filter_count: int, filter_time: int
+    ) -> bool:
+        """
+        Count a filter hit of the member.
+
+        The time frame starts at the first hit after the previous time frame ended.
+
+        Returns whether the member reached the amount of hits for an autoban.
+        """
+        key = (member.guild.id, member.id)
+        try:
+            member_data = self._filter_counts[key]
+        except KeyError:
+            member_data = await self.config.member(member).all()
+            member_data = self._filter_counts.setdefault(key, member_data)
+        if timestamp >= member_data["next_reset_time"]:
+            member_data["next_reset_time"] = timestamp + filter_time
+            member_data["filter_count"] = 0
+        member_data["filter_count"] += 1
+        self._dirty_filter_counts.add(key)
+        return member_data["filter_count"] >= filter_count
 
     async def check_filter(self, message: discord.Message):
+        # Most messages don't have any hits, so no data is read before checking for them.
+        hits = await self.filter_hits(message.content, message.channel)
+        if not hits:
+            return
+
         guild = message.guild
         author = message.author
-        guild_data = await self.config.guild(guild).all()
-        member_data = await self.config.member(author).all()
+        guild_data = await self.get_guild_settings(guild)
         filter_count = guild_data["filterban_count"]
         filter_time = guild_data["filterban_time"]
-        user_count = member_data["filter_count"]
-        next_reset_time = member_data["next_reset_time"]
         created_at = message.created_at.replace(tzinfo=timezone.utc)
 
-        if filter_count > 0 and filter_time > 0:
-            if created_at.timestamp() >= next_reset_time:
-                next_reset_time = created_at.timestamp() + filter_time
-                async with self.config.member(author).all() as member_data:
-                    member_data["next_reset_time"] = next_reset_time
-                    if user_count > 0:
-                        user_count = 0
-                        member_data["filter_count"] = user_count
-
-        hits = await self.filter_hits(message.content, message.channel)
-
-        if hits:
-            await modlog.create_case(
-                bot=self.bot,
-                guild=guild,
-                created_at=message.created_at.replace(tzinfo=timezone.utc),
-                action_type="filterhit",
-                user=author,
-                moderator=guild.me,
-                reason=(
-                    _("Filtered words used: {words}").format(words=humanize_list(list(hits)))
-                    if len(hits) > 1
-                    else _("Filtered word used: {word}").format(word=list(hits)[0])
-                ),
-                channel=message.channel,
-            )
-            try:
-                await message.delete()
-            except discord.HTTPException:
-                pass
-            else:
-                self.bot.dispatch("filter_message_delete", message, hits)
-                if filter_count > 0 and filter_time > 0:
-                    user_count += 1
-                    await self.config.member(author).filter_count.set(user_count)
-                    if user_count >= filter_count and created_at.timestamp() < next_reset_time:
-                        reason = _("Autoban (too many filtered messages.)")
-                        try:
-                            await guild.ban(author, reason=reason)
-                        except discord.HTTPException:
-                            pass
-                        else:
-                            await modlog.create_case(
-                                self.bot,
-                                guild,
-                                message.created_at.replace(tzinfo=timezone.utc),
-                                "filterban",
-                                author,
-                                guild.me,
-                                reason,
-                            )
+        await modlog.create_case(
+            bot=self.bot,
+            guild=guild,
+            created_at=message.created_at.replace(tzinfo=timezone.utc),
+            action_type="filterhit",
+            user=author,
+            moderator=guild.me,
+            reason=(
+                _("Filtered words used: {words}").format(words=humanize_list(list(hits)))
+                if len(hits) > 1
+                else _("Filtered word used: {word}").format(word=list(hits)[0])
+            ),
+            channel=message.channel,
+        )
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+        else:
+            self.bot.dispatch("filter_message_delete", message, hits)
+            if filter_count > 0 and filter_time > 0:
+                if await self._count_filter_hit(
+                    author, created_at.timestamp(), filter_count, filter_time
+                ):
+                    reason = _("Autoban (too many filtered messages.)")
+                    try:
+                        await guild.ban(author, reason=reason)
+                    except discord.HTTPException:
+                        pass
+                    else:
+                        await modlog.create_case(
+                            self.bot,
+                            guild,
+                            message.created_at.replace(tzinfo=timezone.utc),
+                            "filterban",
+                            author,
+                            guild.me,
+                            reason,
+                        )
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -525,21 +761,21 @@ class Filter(commands.Cog):
     async def on_member_join(self, member: discord.Member):
         await self.maybe_filter_name(member)
 
-    async def maybe_filter_name(self, member: discord.Member):
+    async def maybe_filter_name(self, member: discord.Member) -> bool:
 
         guild = member.guild
         if (not guild) or await self.bot.cog_disabled_in_guild(self, guild):
-            return
+            return False
 
         if not member.guild.me.guild_permissions.manage_nicknames:
-            return  # No permissions to manage nicknames, so can't do anything
+            return False  # No permissions to manage nicknames, so can't do anything
         if member.top_role >= member.guild.me.top_role:
-            return  # Discord Hierarchy applies to nicks
+            return False  # Discord Hierarchy applies to nicks
         if await self.bot.is_automod_immune(member):
-            return
-        guild_data = await self.config.guild(member.guild).all()
+            return False
+        guild_data = await self.get_guild_settings(member.guild)
         if not guild_data["filter_names"]:
-            return
+            return False
 
         await set_contextual_locales_from_guild(self.bot, guild)
 
@@ -549,5 +785,6 @@ class Filter(commands.Cog):
             try:
                 await member.edit(nick=name_to_use, reason=reason)
             except discord.HTTPException:
-                pass
-            return
+                return False
+            return True
+        return False
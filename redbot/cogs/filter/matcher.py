@@ -0,0 +1,246 @@
+"""
+Multi-word matching for the Filter cog.
+
+`WordMatcher` finds all of the filtered words in a text in a single pass
+(using the Aho-Corasick algorithm), no matter how many words there are.
+Words only match as whole words, with the same word boundaries as regex's ``\\b``.
+
+Both the words and the text are case-folded and common confusable characters
+(e.g. Cyrillic or fullwidth lookalikes of Latin letters) are replaced,
+so ``Bаd`` with a Cyrillic ``а`` matches the filtered word ``bad``.
+"""
+import sys
+import unicodedata
+from typing import Dict, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+__all__ = ("WordMatcher", "normalize")
+
+_K = TypeVar("_K", bound=Hashable)
+
+# Lookalikes that NFKC normalization doesn't map to the Latin letters.
+_CONFUSABLES = {
+    # Cyrillic
+    "а": "a",
+    "в": "b",
+    "е": "e",
+    "ё": "e",
+    "к": "k",
+    "м": "m",
+    "н": "h",
+    "о": "o",
+    "р": "p",
+    "с": "c",
+    "т": "t",
+    "у": "y",
+    "х": "x",
+    "і": "i",
+    "ї": "i",
+    "ј": "j",
+    "ѕ": "s",
+    "һ": "h",
+    "ԁ": "d",
+    "ԛ": "q",
+    "ԝ": "w",
+    # Greek
+    "α": "a",
+    "β": "b",
+    "ε": "e",
+    "η": "n",
+    "ι": "i",
+    "κ": "k",
+    "ν": "v",
+    "ο": "o",
+    "ρ": "p",
+    "τ": "t",
+    "υ": "u",
+    "χ": "x",
+    "ϲ": "c",
+    # other
+    "ı": "i",
+    "ȷ": "j",
+    "ɑ": "a",
+    "ɡ": "g",
+    "ɩ": "i",
+    "ℓ": "l",
+}
+
+_normalized_chars: Dict[str, str] = {}
+
+
+def _normalize_char(char: str) -> str:
+    try:
+        return _normalized_chars[char]
+    except KeyError:
+        pass
+    if char.isascii():
+        ret = char.lower()
+    else:
+        ret = "".join(
+            _CONFUSABLES.get(c, c) for c in unicodedata.normalize("NFKC", char).casefold()
+        )
+    if len(_normalized_chars) < 100_000:
+        _normalized_chars[char] = ret
+    return ret
+
+
+def normalize(text: str) -> str:
+    """Case-fold the text and replace confusable characters."""
+    return "".join(map(_normalize_char, text))
+
+
+def _is_word_char(char: str) -> bool:
+    # what regex's \w matches
+    return char.isalnum() or char == "_"
+
+
+class WordMatcher:
+    """
+    Matches a set of words in texts.
+
+    Building the matcher for thousands of words can take a while,
+    so it's best done in an executor.
+
+    Parameters
+    ----------
+    words: Iterable[str]
+        The words (or phrases) to match.
+    """
+
+    __slots__ = ("words", "memory_size", "_goto", "_fail", "_out")
+
+    def __init__(self, words: Iterable[str]):
+        self.words: Tuple[str, ...] = tuple(sorted({w for w in words if w}))
+        # trie of the normalized words, node 0 is the root
+        goto: List[Dict[str, int]] = [{}]
+        # lengths of the (normalized) words ending at the node
+        out: List[Tuple[int, ...]] = [()]
+        for word in self.words:
+            normalized = normalize(word)
+            if not normalized:
+                continue
+            node = 0
+            for char in normalized:
+                try:
+                    node = goto[node][char]
+                except KeyError:
+                    goto.append({})
+                    out.append(())
+                    goto[node][char] = node = len(goto) - 1
+            if len(normalized) not in out[node]:
+                out[node] += (len(normalized),)
+
+        # breadth-first, so that the failure links of shallower nodes are known
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while char not in goto[state] and state:
+                    state = fail[state]
+                target = goto[state].get(char, 0)
+                fail[child] = target if target != child else 0
+                out[child] += out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        #: Approximate amount of memory (in bytes) used by the matcher.
+        self.memory_size: int = (
+            sum(map(sys.getsizeof, goto))
+            + sys.getsizeof(goto)
+            + sys.getsizeof(fail)
+            + sys.getsizeof(out)
+            + sum(map(sys.getsizeof, self.words))
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Find all matched words in the text.
+
+        Returns
+        -------
+        Set[str]
+            The matched parts of the text, as they appear in it.
+        """
+        if not self.words:
+            return set()
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        hits: Set[str] = set()
+        node = 0
+        if text.isascii():
+            # lowering is all the normalization ASCII needs and it doesn't change indexes
+            root = goto[0]
+            for idx, char in enumerate(text.lower()):
+                while node:
+                    next_node = goto[node].get(char)
+                    if next_node is not None:
+                        node = next_node
+                        break
+                    node = fail[node]
+                else:
+                    node = root.get(char, 0)
+                if out[node]:
+                    for length in out[node]:
+                        self._maybe_add_hit(text, idx + 1 - length, idx + 1, hits)
+            return hits
+
+        # for each character of the normalized text, the index of the original character
+        # it came from, and whether it's the first one coming from it
+        origin: List[int] = []
+        starts: List[bool] = []
+        for idx, char in enumerate(text):
+            normalized = _normalize_char(char)
+            if not normalized:
+                continue
+            for pos, norm_char in enumerate(normalized):
+                origin.append(idx)
+                starts.append(pos == 0)
+                while node and norm_char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(norm_char, 0)
+            # matches ending inside of what a single character was normalized to are ignored
+            if out[node]:
+                end = len(origin)
+                for length in out[node]:
+                    start = end - length
+                    if starts[start]:
+                        self._maybe_add_hit(text, origin[start], idx + 1, hits)
+        return hits
+
+    def matching_keys(self, texts: Iterable[Tuple[_K, str]]) -> List[_K]:
+        """
+        Find the texts containing any of the words.
+
+        This is meant for checking a lot of texts at once in an executor.
+
+        Parameters
+        ----------
+        texts: Iterable[Tuple[Hashable, str]]
+            Pairs of keys and the texts to check.
+
+        Returns
+        -------
+        List[Hashable]
+            The keys of the texts that contain any of the words.
+        """
+        return [key for key, text in texts if self.find_all(text)]
+
+    @staticmethod
+    def _maybe_add_hit(text: str, start: int, end: int, hits: Set[str]) -> None:
+        # \b semantics: whether the characters are word characters has to change
+        # at both ends of the match
+        if start and _is_word_char(text[start - 1]) == _is_word_char(text[start]):
+            return
+        if not start and not _is_word_char(text[start]):
+            return
+        if end < len(text) and _is_word_char(text[end]) == _is_word_char(text[end - 1]):
+            return
+        if end == len(text) and not _is_word_char(text[end - 1]):
+            return
+        hits.add(text[start:end])
@@ -1,9 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from typing import Deque, Dict, List, Tuple, Optional
 
 import discord
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.utils.scheduling import Scheduler
+
+from .utils import RepeatTracker
 
 
 class MixinMeta(ABC):
@@ -15,7 +19,14 @@ class MixinMeta(ABC):
 
     config: Config
     bot: Red
-    cache: dict
+    cache: Dict[int, Optional[RepeatTracker]]
+    mention_spam_cache: Dict[int, dict]
+    _tempban_scheduler: Scheduler[Tuple[int, int]]
+    _pending_names: Dict[int, Deque[str]]
+    _pending_nicks: Dict[Tuple[int, int], Deque[str]]
+    _flushing_names: Dict[int, Deque[str]]
+    _flushing_nicks: Dict[Tuple[int, int], Deque[str]]
+    _flush_names_lock: asyncio.Lock
 
     @staticmethod
     @abstractmethod
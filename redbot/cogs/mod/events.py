@@ -1,11 +1,13 @@
+import asyncio
 import logging
 from datetime import timezone
-from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Hashable
 
 import discord
 from redbot.core import i18n, modlog, commands
 from redbot.core.utils.mod import is_mod_or_superior
 from .abc import MixinMeta
+from .utils import RepeatTracker, buffer_name, merge_name_history
 
 _ = i18n.Translator("Mod", __file__)
 log = logging.getLogger("red.mod")
@@ -21,19 +23,19 @@ class Events(MixinMeta):
         guild = message.guild
         author = message.author
 
-        guild_cache = self.cache.get(guild.id, None)
-        if guild_cache is None:
+        try:
+            tracker = self.cache[guild.id]
+        except KeyError:
             repeats = await self.config.guild(guild).delete_repeats()
-            if repeats == -1:
-                return False
-            guild_cache = self.cache[guild.id] = defaultdict(lambda: deque(maxlen=repeats))
+            # `None` is cached too, so that guilds with this disabled don't hit Config
+            tracker = self.cache[guild.id] = RepeatTracker(repeats) if repeats != -1 else None
+        if tracker is None:
+            return False
 
         if not message.content:
             return False
 
-        guild_cache[author].append(message.content)
-        msgs = guild_cache[author]
-        if len(msgs) == msgs.maxlen and len(set(msgs)) == 1:
+        if tracker.add(author.id, message.content):
             try:
                 await message.delete()
                 return True
@@ -41,9 +43,18 @@ class Events(MixinMeta):
                 pass
         return False
 
+    async def get_mention_spam_settings(self, guild: discord.Guild) -> dict:
+        try:
+            return self.mention_spam_cache[guild.id]
+        except KeyError:
+            pass
+        mention_spam = await self.config.guild(guild).mention_spam.all()
+        self.mention_spam_cache[guild.id] = mention_spam
+        return mention_spam
+
     async def check_mention_spam(self, message):
         guild, author = message.guild, message.author
-        mention_spam = await self.config.guild(guild).mention_spam.all()
+        mention_spam = await self.get_mention_spam_settings(guild)
 
         if mention_spam["strict"]:  # if strict is enabled
             mentions = message.raw_mentions
@@ -164,15 +175,7 @@ class Events(MixinMeta):
             track_all_names = await self.config.track_all_names()
             if not track_all_names:
                 return
-            async with self.config.user(before).past_names() as name_list:
-                while None in name_list:  # clean out null entries from a bug
-                    name_list.remove(None)
-                if before.name in name_list:
-                    # Ensure order is maintained without duplicates occurring
-                    name_list.remove(before.name)
-                name_list.append(before.name)
-                while len(name_list) > 20:
-                    name_list.pop(0)
+            buffer_name(self._pending_names, before.id, before.name)
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
@@ -184,11 +187,50 @@ class Events(MixinMeta):
             track_nicknames = await self.config.guild(guild).track_nicknames()
             if (not track_all_names) or (not track_nicknames):
                 return
-            async with self.config.member(before).past_nicks() as nick_list:
-                while None in nick_list:  # clean out null entries from a bug
-                    nick_list.remove(None)
-                if before.nick in nick_list:
-                    nick_list.remove(before.nick)
-                nick_list.append(before.nick)
-                while len(nick_list) > 20:
-                    nick_list.pop(0)
+            buffer_name(self._pending_nicks, (guild.id, before.id), before.nick)
+
+    async def _flush_name_history_loop(self) -> None:
+        while True:
+            await asyncio.sleep(60)
+            try:
+                await self.flush_name_history()
+            except Exception:
+                log.exception("Failed to save the name history.")
+
+    async def flush_name_history(self) -> None:
+        """Write the buffered name and nickname changes to Config."""
+        # the loop, unloading and shutting down can all flush at once
+        async with self._flush_names_lock:
+            self._flushing_names, self._pending_names = self._pending_names, {}
+            await self._flush_name_buffer(
+                self._flushing_names,
+                self._pending_names,
+                lambda user_id: self.config.user_from_id(user_id).past_names,
+            )
+            self._flushing_nicks, self._pending_nicks = self._pending_nicks, {}
+            await self._flush_name_buffer(
+                self._flushing_nicks,
+                self._pending_nicks,
+                lambda key: self.config.member_from_ids(*key).past_nicks,
+            )
+
+    @staticmethod
+    async def _flush_name_buffer(
+        flushing: Dict[Hashable, Deque[str]],
+        pending: Dict[Hashable, Deque[str]],
+        get_value: Callable,
+    ) -> None:
+        try:
+            while flushing:
+                key, names = next(iter(flushing.items()))
+                value = get_value(key)
+                await value.set(merge_name_history(await value(), names))
+                # the buffer could have been cleared in the meantime
+                flushing.pop(key, None)
+        finally:
+            # whatever wasn't written is kept for the next flush, merging is idempotent
+            for key, names in flushing.items():
+                for name in pending.get(key, ()):
+                    buffer_name(flushing, key, name)
+                pending[key] = names
+            flushing.clear()
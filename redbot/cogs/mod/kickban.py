@@ -1,6 +1,6 @@
-import asyncio
 import contextlib
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Union
 
@@ -172,6 +172,7 @@ class KickBanMixin(MixinMeta):
                 if user.id in tempbans:
                     async with self.config.guild(guild).current_tempbans() as tempbans:
                         tempbans.remove(user.id)
+                    self._tempban_scheduler.unschedule((guild.id, user.id))
                     removed_temp = True
                 else:
                     return (
@@ -230,30 +231,49 @@ class KickBanMixin(MixinMeta):
         return True, success_message
 
     async def tempban_expirations_task(self) -> None:
-        while True:
+        """Schedule the unbans of all current tempbans and start the scheduler."""
+        await self.bot.wait_until_red_ready()
+        guilds_data = await self.config.all_guilds()
+        members_data = await self.config.all_members()
+        async for guild_id, guild_data in AsyncIter(guilds_data.items(), steps=100):
+            guild_members = members_data.get(guild_id, {})
+            for uid in guild_data["current_tempbans"]:
+                banned_until = guild_members.get(uid, {}).get("banned_until")
+                # members without an expiry (e.g. from a bug) are checked right away
+                self._tempban_scheduler.schedule((guild_id, uid), banned_until or 0)
+        self._tempban_scheduler.start()
+
+    async def _expire_tempbans(self, keys: List[Tuple[int, int]]) -> None:
+        # called by the scheduler with the (guild ID, user ID) pairs of expired tempbans
+        guild_ids = {guild_id for guild_id, uid in keys}
+        for guild_id in guild_ids:
             try:
-                await self._check_tempban_expirations()
+                await self._expire_guild_tempbans(guild_id)
             except Exception:
                 log.exception("Something went wrong in check_tempban_expirations:")
+            # anything that couldn't be unbanned is retried later,
+            # but the tempbans extended in the meantime are kept as they are
+            retry_at = time.time() + 60
+            async for uid in AsyncIter(
+                await self.config.guild_from_id(guild_id).current_tempbans(), steps=100
+            ):
+                key = (guild_id, uid)
+                if key not in self._tempban_scheduler:
+                    banned_until = await self.config.member_from_ids(*key).banned_until()
+                    self._tempban_scheduler.schedule(key, max(banned_until or 0, retry_at))
+
+    async def _expire_guild_tempbans(self, guild_id: int) -> None:
+        if not (guild := self.bot.get_guild(guild_id)):
+            return
+        if guild.unavailable or not guild.me.guild_permissions.ban_members:
+            return
+        if await self.bot.cog_disabled_in_guild(self, guild):
+            return
 
-            await asyncio.sleep(60)
-
-    async def _check_tempban_expirations(self) -> None:
-        guilds_data = await self.config.all_guilds()
-        async for guild_id, guild_data in AsyncIter(guilds_data.items(), steps=100):
-            if not (guild := self.bot.get_guild(guild_id)):
-                continue
-            if guild.unavailable or not guild.me.guild_permissions.ban_members:
-                continue
-            if await self.bot.cog_disabled_in_guild(self, guild):
-                continue
-
-            guild_tempbans = guild_data["current_tempbans"]
-            if not guild_tempbans:
-                continue
-            async with self.config.guild(guild).current_tempbans.get_lock():
-                if await self._check_guild_tempban_expirations(guild, guild_tempbans):
-                    await self.config.guild(guild).current_tempbans.set(guild_tempbans)
+        async with self.config.guild(guild).current_tempbans.get_lock():
+            guild_tempbans = await self.config.guild(guild).current_tempbans()
+            if await self._check_guild_tempban_expirations(guild, guild_tempbans):
+                await self.config.guild(guild).current_tempbans.set(guild_tempbans)
 
     async def _check_guild_tempban_expirations(
         self, guild: discord.Guild, guild_tempbans: List[int]
@@ -536,6 +556,7 @@ class KickBanMixin(MixinMeta):
             async with self.config.guild(guild).current_tempbans() as tempbans:
                 if user_id in tempbans:
                     tempbans.remove(user_id)
+                    self._tempban_scheduler.unschedule((guild.id, user_id))
                     upgrades.append(str(user_id))
                     log.info(
                         "{}({}) upgraded the tempban for {} to a permaban.".format(
@@ -639,6 +660,7 @@ class KickBanMixin(MixinMeta):
         await self.config.member(member).banned_until.set(unban_time.timestamp())
         async with self.config.guild(guild).current_tempbans() as current_tempbans:
             current_tempbans.append(member.id)
+        self._tempban_scheduler.schedule((guild.id, member.id), unban_time.timestamp())
 
         with contextlib.suppress(discord.HTTPException):
             # We don't want blocked DMs preventing us from banning
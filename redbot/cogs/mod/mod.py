@@ -3,7 +3,7 @@ import logging
 import re
 from abc import ABC
 from collections import defaultdict
-from typing import List, Tuple, Literal
+from typing import Deque, Dict, List, Literal, Optional, Tuple
 
 import discord
 from redbot.core.utils import AsyncIter
@@ -12,11 +12,13 @@ from redbot.core import Config, modlog, commands
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils._internal_utils import send_to_owners_with_prefix_replaced
+from redbot.core.utils.scheduling import Scheduler
 from .events import Events
 from .kickban import KickBanMixin
 from .names import ModInfo
 from .slowmode import Slowmode
 from .settings import ModSettings
+from .utils import RepeatTracker
 
 _ = T_ = Translator("Mod", __file__)
 
@@ -79,7 +81,20 @@ class Mod(
         self.config.register_channel(**self.default_channel_settings)
         self.config.register_member(**self.default_member_settings)
         self.config.register_user(**self.default_user_settings)
-        self.cache: dict = {}
+        # guild ID -> tracker of repeated messages, `None` if deleting repeats is disabled
+        self.cache: Dict[int, Optional[RepeatTracker]] = {}
+        # guild ID -> mention spam settings
+        self.mention_spam_cache: Dict[int, dict] = {}
+        # name and nickname changes waiting to be written by `flush_name_history()`
+        self._pending_names: Dict[int, Deque[str]] = {}
+        self._pending_nicks: Dict[Tuple[int, int], Deque[str]] = {}
+        # the ones being written right now
+        self._flushing_names: Dict[int, Deque[str]] = {}
+        self._flushing_nicks: Dict[Tuple[int, int], Deque[str]] = {}
+        self._flush_names_task = None
+        self._flush_names_lock = asyncio.Lock()
+        # (guild ID, user ID) pairs of the tempbans, scheduled for their expiry
+        self._tempban_scheduler: Scheduler[Tuple[int, int]] = Scheduler(self._expire_tempbans)
         self.tban_expiry_task = asyncio.create_task(self.tempban_expirations_task())
         self.last_case: dict = defaultdict(dict)
 
@@ -94,6 +109,12 @@ class Mod(
         if requester != "discord_deleted_user":
             return
 
+        for buffer in (self._pending_names, self._flushing_names):
+            buffer.pop(user_id, None)
+        for buffer in (self._pending_nicks, self._flushing_nicks):
+            for key in [key for key in buffer if key[1] == user_id]:
+                del buffer[key]
+
         all_members = await self.config.all_members()
 
         async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
@@ -105,6 +126,7 @@ class Mod(
         guild_data = await self.config.all_guilds()
 
         async for guild_id, guild_data in AsyncIter(guild_data.items(), steps=100):
+            self._tempban_scheduler.unschedule((guild_id, user_id))
             if user_id in guild_data["current_tempbans"]:
                 async with self.config.guild_from_id(guild_id).current_tempbans() as tbs:
                     try:
@@ -115,6 +137,9 @@ class Mod(
 
     async def initialize(self):
         await self._maybe_update_config()
+        self._flush_names_task = asyncio.create_task(self._flush_name_history_loop())
+        # the loop only writes once a minute, what's left has to be written before shutting down
+        self.bot.add_shutdown_hook(self.flush_name_history)
         self._ready.set()
 
     async def cog_before_invoke(self, ctx: commands.Context) -> None:
@@ -122,6 +147,11 @@ class Mod(
 
     def cog_unload(self):
         self.tban_expiry_task.cancel()
+        self._tempban_scheduler.stop()
+        if self._flush_names_task is not None:
+            self._flush_names_task.cancel()
+            self.bot.remove_shutdown_hook(self.flush_name_history)
+        asyncio.create_task(self.flush_name_history())
 
     async def _maybe_update_config(self):
         """Maybe update `delete_delay` value set by Config prior to Mod 1.0.0."""
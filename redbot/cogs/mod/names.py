@@ -10,7 +10,7 @@ from redbot.core.utils.common_filters import (
 )
 from redbot.core.utils.mod import get_audit_reason
 from .abc import MixinMeta
-from .utils import is_allowed_by_hierarchy
+from .utils import is_allowed_by_hierarchy, merge_name_history
 
 _ = i18n.Translator("Mod", __file__)
 
@@ -21,8 +21,18 @@ class ModInfo(MixinMeta):
     """
 
     async def get_names_and_nicks(self, user):
-        names = await self.config.user(user).past_names()
-        nicks = await self.config.member(user).past_nicks()
+        # name changes that haven't been written to Config yet are included too
+        names = merge_name_history(
+            await self.config.user(user).past_names(),
+            self._flushing_names.get(user.id, ()),
+            self._pending_names.get(user.id, ()),
+        )
+        key = (user.guild.id, user.id)
+        nicks = merge_name_history(
+            await self.config.member(user).past_nicks(),
+            self._flushing_nicks.get(key, ()),
+            self._pending_nicks.get(key, ()),
+        )
         if names:
             names = [escape_spoilers_and_mass_mentions(name) for name in names if name]
         if nicks:
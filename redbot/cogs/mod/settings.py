@@ -1,13 +1,19 @@
 import asyncio
-from collections import defaultdict, deque
 from typing import Optional
 from datetime import timedelta
 
 from redbot.core import commands, i18n, checks
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.chat_formatting import box, humanize_timedelta, inline
+from redbot.core.utils.chat_formatting import (
+    box,
+    humanize_number,
+    humanize_timedelta,
+    inline,
+    pagify,
+)
 
 from .abc import MixinMeta
+from .utils import RepeatTracker
 
 _ = i18n.Translator("Mod", __file__)
 
@@ -160,6 +166,7 @@ class ModSettings(MixinMeta):
         else:
             msg = _("Mention spam will only account for mentions of different users.")
         await self.config.guild(guild).mention_spam.strict.set(enabled)
+        self.mention_spam_cache.pop(guild.id, None)
         await ctx.send(msg)
 
     @mentionspam.command(name="warn")
@@ -178,6 +185,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["warn"]:
                 return await ctx.send(_("Autowarn for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.warn.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autowarn for mention spam disabled."))
 
         if max_mentions < 1:
@@ -194,6 +202,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutowarn is equal to or higher than autoban.")
 
         await self.config.guild(ctx.guild).mention_spam.warn.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autowarn for mention spam enabled. "
@@ -218,6 +227,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["kick"]:
                 return await ctx.send(_("Autokick for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.kick.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autokick for mention spam disabled."))
 
         if max_mentions < 1:
@@ -234,6 +244,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutokick is equal to or higher than autoban.")
 
         await self.config.guild(ctx.guild).mention_spam.kick.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autokick for mention spam enabled. "
@@ -257,6 +268,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["ban"]:
                 return await ctx.send(_("Autoban for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.ban.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autoban for mention spam disabled."))
 
         if max_mentions < 1:
@@ -273,6 +285,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutoban is equal to or lower than autokick.")
 
         await self.config.guild(ctx.guild).mention_spam.ban.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autoban for mention spam enabled. "
@@ -294,12 +307,12 @@ class ModSettings(MixinMeta):
         if repeats is not None:
             if repeats == -1:
                 await self.config.guild(guild).delete_repeats.set(repeats)
-                self.cache.pop(guild.id, None)  # remove cache with old repeat limits
+                self.cache[guild.id] = None  # remove cache with old repeat limits
                 await ctx.send(_("Repeated messages will be ignored."))
             elif 2 <= repeats <= 20:
                 await self.config.guild(guild).delete_repeats.set(repeats)
                 # purge and update cache to new repeat limits
-                self.cache[guild.id] = defaultdict(lambda: deque(maxlen=repeats))
+                self.cache[guild.id] = RepeatTracker(repeats)
                 await ctx.send(
                     _("Messages repeated up to {num} times will be deleted.").format(num=repeats)
                 )
@@ -323,6 +336,36 @@ class ModSettings(MixinMeta):
             else:
                 await ctx.send(_("Repeated messages will be ignored."))
 
+    @modset.command()
+    @commands.is_owner()
+    async def spamcache(self, ctx: commands.Context):
+        """Show the memory used for detecting repeated messages in each server."""
+        usage = sorted(
+            (
+                (tracker.memory_usage(), len(tracker), guild_id)
+                for guild_id, tracker in self.cache.items()
+                if tracker is not None
+            ),
+            reverse=True,
+        )
+        if not usage:
+            await ctx.send(_("No messages are being tracked."))
+            return
+        lines = []
+        for memory_usage, members, guild_id in usage:
+            guild = self.bot.get_guild(guild_id)
+            lines.append(
+                _("{guild}: {members} members, {size} KiB").format(
+                    guild=guild.name if guild is not None else guild_id,
+                    members=humanize_number(members),
+                    size=humanize_number(round(memory_usage / 1024, 1)),
+                )
+            )
+        total = sum(data[0] for data in usage)
+        lines.append(_("Total: {size} KiB").format(size=humanize_number(round(total / 1024, 1))))
+        for page in pagify("\n".join(lines)):
+            await ctx.send(box(page))
+
     @modset.command()
     @commands.guild_only()
     async def reinvite(self, ctx: commands.Context):
@@ -491,6 +534,13 @@ class ModSettings(MixinMeta):
             return
 
         async with ctx.typing():
+            for buffer in (
+                self._pending_names,
+                self._pending_nicks,
+                self._flushing_names,
+                self._flushing_nicks,
+            ):
+                buffer.clear()
             # Nickname data
             async with self.config._get_base_group(self.config.MEMBER).all() as mod_member_data:
                 guilds_to_remove = []
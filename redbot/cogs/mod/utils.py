@@ -1,3 +1,9 @@
+import hashlib
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
 import discord
 
 from redbot.core.bot import Red
@@ -11,3 +17,96 @@ async def is_allowed_by_hierarchy(
         return True
     is_special = mod == guild.owner or await bot.is_owner(mod)
     return mod.top_role > user.top_role or is_special
+
+
+#: The maximum amount of past names and nicknames stored for each user.
+MAX_NAME_HISTORY = 20
+
+
+def buffer_name(buffer: Dict[Hashable, Deque[str]], key: Hashable, name: str) -> None:
+    """Add a past name to the write buffer, moving it to the end if it's already there."""
+    names = buffer.get(key)
+    if names is None:
+        names = buffer[key] = deque(maxlen=MAX_NAME_HISTORY)
+    elif name in names:
+        names.remove(name)
+    names.append(name)
+
+
+def merge_name_history(stored: List[Optional[str]], *pending: Iterable[str]) -> List[str]:
+    """
+    Merge buffered past names into the stored ones.
+
+    Merging the same names more than once gives the same result.
+    """
+    names = [name for name in stored if name is not None]  # clean out null entries from a bug
+    for pending_names in pending:
+        for name in pending_names:
+            if name in names:
+                # Ensure order is maintained without duplicates occurring
+                names.remove(name)
+            names.append(name)
+    return names[-MAX_NAME_HISTORY:]
+
+
+class RepeatTracker:
+    """
+    Tracks how many times in a row the members of a guild sent the same message.
+
+    Only a fixed-size fingerprint of the last message is kept for each member.
+    Members who haven't sent anything for ``ttl`` seconds are forgotten
+    and when more than ``max_size`` members are tracked,
+    the least recently active ones are forgotten first.
+    """
+
+    __slots__ = ("repeats", "ttl", "max_size", "_entries")
+
+    def __init__(self, repeats: int, *, ttl: float = 3600.0, max_size: int = 10_000):
+        self.repeats = repeats
+        self.ttl = ttl
+        self.max_size = max_size
+        # member ID -> (fingerprint, repeat count, time.monotonic() of the last message)
+        # ordered from the least recently active
+        self._entries: "OrderedDict[int, Tuple[bytes, int, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _fingerprint(content: str) -> bytes:
+        return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+
+    def add(self, member_id: int, content: str) -> bool:
+        """
+        Record a message of the member.
+
+        Returns
+        -------
+        bool
+            Whether the member sent the same message at least ``repeats`` times in a row.
+        """
+        now = time.monotonic()
+        fingerprint = self._fingerprint(content)
+        entry = self._entries.pop(member_id, None)
+        if entry is not None and entry[0] == fingerprint and entry[2] + self.ttl > now:
+            count = min(entry[1] + 1, self.repeats)
+        else:
+            count = 1
+        self._evict(now)
+        self._entries[member_id] = (fingerprint, count, now)
+        return count >= self.repeats
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        expired_before = now - self.ttl
+        while entries and next(iter(entries.values()))[2] <= expired_before:
+            entries.popitem(last=False)
+        while len(entries) >= self.max_size:
+            entries.popitem(last=False)
+
+    def memory_usage(self) -> int:
+        """Approximate amount of memory (in bytes) used by the tracker."""
+        size = sys.getsizeof(self._entries)
+        for member_id, entry in self._entries.items():
+            size += sum(map(sys.getsizeof, (member_id, entry, entry[0], entry[2])))
+        return size
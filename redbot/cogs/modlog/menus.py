@@ -5,6 +5,7 @@ from typing import Union, List
 
 import discord
 
+from redbot.core import modlog
 from redbot.core.i18n import Translator
 from redbot.core.modlog import Case
 from redbot.core.utils.chat_formatting import humanize_number
@@ -16,12 +17,18 @@ _ = Translator("General", __file__)
 
 
 class CasesForSource(menus.ListPageSource):
-    def __init__(self, cases: List[Case]):
-        super().__init__(cases, per_page=1)
+    def __init__(self, case_numbers: List[int]):
+        super().__init__(case_numbers, per_page=1)
 
-    async def format_page(self, menu: SimpleHybridMenu, case: Case) -> Union[discord.Embed, str]:
+    async def format_page(
+        self, menu: SimpleHybridMenu, case_number: int
+    ) -> Union[discord.Embed, str]:
         current_entry = menu.current_page + 1
         total_entries = self._max_pages
+        try:
+            case = await modlog.get_case(case_number, menu.ctx.guild, menu.ctx.bot)
+        except RuntimeError:
+            return _("Case #{number} no longer exists.").format(number=case_number)
         use_embeds = await menu.ctx.embed_requested()
         message = await case.message_content(embed=use_embeds)
         if not use_embeds:
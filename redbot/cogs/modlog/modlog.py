@@ -1,15 +1,17 @@
 import asyncio
 from datetime import datetime, timezone
 
-from typing import Optional, Union
+from typing import AsyncIterable, AsyncIterator, Optional, Union
 
 import discord
 
 from redbot.core import checks, commands, modlog
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils.chat_formatting import box, pagify
+from redbot.core.modlog import Case
+from redbot.core.utils.chat_formatting import box, humanize_number, pagify
 from redbot.core.utils._dpy_menus_utils import SimpleHybridMenu, dpymenu
+from redbot.core.utils.menus import AsyncIterPageSource
 from redbot.core.utils.predicates import MessagePredicate
 
 from .menus import CasesForSource
@@ -26,7 +28,7 @@ class ModLog(commands.Cog):
         self.bot = bot
 
     async def red_delete_data_for_user(self, **kwargs):
-        """ Nothing to delete """
+        """Nothing to delete"""
         return
 
     @commands.group()
@@ -42,6 +44,22 @@ class ModLog(commands.Cog):
         await modlog.handle_auditype_key()
         await ctx.tick()
 
+    @modlogset.command(name="rebuildindex")
+    @commands.guild_only()
+    async def rebuild_index(self, ctx: commands.Context):
+        """Rebuild the index used to look up the cases of a member.
+
+        The index is kept up to date on its own, this is only needed
+        if the cases were changed without using the bot.
+        """
+        async with ctx.typing():
+            count = await modlog.rebuild_case_index(ctx.guild)
+        await ctx.send(
+            _("The index has been rebuilt from {count} cases.").format(
+                count=humanize_number(count)
+            )
+        )
+
     @modlogset.command(aliases=["channel"])
     @commands.guild_only()
     async def modlog(self, ctx: commands.Context, channel: discord.TextChannel = None):
@@ -146,28 +164,17 @@ class ModLog(commands.Cog):
     @commands.guild_only()
     async def casesfor(self, ctx: commands.Context, *, member: Union[discord.Member, int]):
         """Display cases for the specified member."""
+        member_id = member if isinstance(member, int) else member.id
         async with ctx.typing():
-            try:
-                if isinstance(member, int):
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member_id=member
-                    )
-                else:
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member=member
-                    )
-            except discord.NotFound:
-                return await ctx.send(_("That user does not exist."))
-            except discord.HTTPException:
-                return await ctx.send(
-                    _("Something unexpected went wrong while fetching that user by ID.")
-                )
-
-            if not cases:
+            case_numbers = await modlog.get_case_numbers_for_member(
+                guild=ctx.guild, member_id=member_id
+            )
+            if not case_numbers:
                 return await ctx.send(_("That user does not have any cases."))
 
+        # only the shown cases are loaded
         await SimpleHybridMenu(
-            source=CasesForSource(cases),
+            source=CasesForSource(case_numbers),
             cog=self,
             delete_message_after=True,
         ).start(ctx=ctx, wait=False)
@@ -176,37 +183,37 @@ class ModLog(commands.Cog):
     @commands.guild_only()
     async def listcases(self, ctx: commands.Context, *, member: Union[discord.Member, int]):
         """List cases for the specified member."""
+        member_id = member if isinstance(member, int) else member.id
         async with ctx.typing():
-            try:
-                if isinstance(member, int):
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member_id=member
-                    )
-                else:
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member=member
-                    )
-            except discord.NotFound:
-                return await ctx.send(_("That user does not exist."))
-            except discord.HTTPException:
-                return await ctx.send(
-                    _("Something unexpected went wrong while fetching that user by ID.")
-                )
-            if not cases:
+            case_numbers = await modlog.get_case_numbers_for_member(
+                guild=ctx.guild, member_id=member_id
+            )
+            if not case_numbers:
                 return await ctx.send(_("That user does not have any cases."))
 
-            rendered_cases = []
-            message = ""
-            for case in cases:
-                message += _("{case}\n**Timestamp:** {timestamp}\n\n").format(
-                    case=await case.message_content(embed=False),
-                    timestamp=datetime.utcfromtimestamp(case.created_at).strftime(
-                        "%Y-%m-%d %H:%M:%S UTC"
-                    ),
-                )
-            for page in pagify(message, ["\n\n", "\n"], priority=True):
-                rendered_cases.append(page)
-        await dpymenu(ctx, rendered_cases)
+        # cases are only loaded and rendered as far as the shown pages need
+        cases = modlog.iter_cases(ctx.guild, ctx.bot, case_numbers)
+        source = AsyncIterPageSource(
+            self._render_case_pages(cases), per_page=1, render=lambda pages, _num: pages[0]
+        )
+        await dpymenu(ctx, source)
+
+    @staticmethod
+    async def _render_case_pages(cases: AsyncIterable[Case]) -> AsyncIterator[str]:
+        message = ""
+        async for case in cases:
+            message += _("{case}\n**Timestamp:** {timestamp}\n\n").format(
+                case=await case.message_content(embed=False),
+                timestamp=datetime.utcfromtimestamp(case.created_at).strftime(
+                    "%Y-%m-%d %H:%M:%S UTC"
+                ),
+            )
+            if len(message) > 4000:
+                *pages, message = pagify(message, ["\n\n", "\n"], priority=True)
+                for page in pages:
+                    yield page
+        for page in pagify(message, ["\n\n", "\n"], priority=True):
+            yield page
 
     @commands.command()
     @commands.guild_only()
@@ -1,13 +1,15 @@
 import asyncio
 import contextlib
+import functools
 import discord
 import logging
 
 from abc import ABC
-from typing import cast, Optional, Dict, List, Tuple, Literal, Union
+from typing import cast, Optional, Dict, Iterator, List, Tuple, Literal, Union
 from datetime import datetime, timedelta, timezone
 
 from .converters import MuteTime
+from .overwrites import OverwriteBatch, order_by_category
 from .voicemutes import VoiceMutes
 
 from redbot.core.bot import Red
@@ -17,6 +19,7 @@ from redbot.core.utils.chat_formatting import bold, humanize_timedelta, humanize
 from redbot.core.utils.mod import get_audit_reason
 from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
+from redbot.core.utils.scheduling import Scheduler
 
 T_ = i18n.Translator("Mutes", __file__)
 
@@ -46,6 +49,9 @@ MUTE_UNMUTE_ISSUES = {
     "voice_mute_permission": _(
         "Because I don't have the Move Members permission, this will take into effect when the user rejoins."
     ),
+    "overwrite_failed": _("Discord failed to update the channel permissions, try again later."),
+    "overwrites_cancelled": _("Updating the channel permissions was cancelled."),
+    "overwrites_running": _("The channel permissions of that user are already being updated."),
 }
 _ = T_
 
@@ -95,9 +101,15 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         self._channel_mutes: Dict[int, Dict[int, dict]] = {}
         self._ready = asyncio.Event()
         self._unmute_tasks: Dict[str, asyncio.Task] = {}
-        self._unmute_task = None
+        # (guild ID, channel ID or None for server mutes, member ID) of the timed mutes,
+        # scheduled for their expiry
+        self._unmute_scheduler: Scheduler[Tuple[int, Optional[int], int]] = Scheduler(
+            self._handle_due_unmutes
+        )
         self.mute_role_cache: Dict[int, int] = {}
         self._channel_mute_events: Dict[int, asyncio.Event] = {}
+        # (guild ID, member or role ID) -> running or cancelled update of all channels' overwrites
+        self._overwrite_batches: Dict[Tuple[int, int], OverwriteBatch] = {}
         # this is a dict of guild ID's and asyncio.Events
         # to wait for a guild to finish channel unmutes before
         # checking for manual overwrites
@@ -136,12 +148,14 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 self.mute_role_cache[g_id] = mutes["mute_role"]
             for user_id, mute in mutes["muted_users"].items():
                 self._server_mutes[g_id][int(user_id)] = mute
+                self._schedule_unmute(g_id, None, mute)
         channel_data = await self.config.all_channels()
         for c_id, mutes in channel_data.items():
             self._channel_mutes[c_id] = {}
             for user_id, mute in mutes["muted_users"].items():
                 self._channel_mutes[c_id][int(user_id)] = mute
-        self._unmute_task = asyncio.create_task(self._handle_automatic_unmute())
+                self._schedule_unmute(mute["guild"], c_id, mute)
+        self._unmute_scheduler.start()
         self._ready.set()
 
     async def _maybe_update_config(self):
@@ -182,7 +196,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
 
     def cog_unload(self):
         self._init_task.cancel()
-        self._unmute_task.cancel()
+        self._unmute_scheduler.stop()
         for task in self._unmute_tasks.values():
             task.cancel()
 
@@ -192,28 +206,77 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         is_special = mod == guild.owner or await self.bot.is_owner(mod)
         return mod.top_role > user.top_role or is_special
 
-    async def _handle_automatic_unmute(self):
-        """This is the core task creator and loop
-        for automatic unmutes
+    def _schedule_unmute(self, guild_id: int, channel_id: Optional[int], data: dict) -> None:
+        """Schedule the automatic unmute of a mute, or unschedule it if it's not timed."""
+        key = (guild_id, channel_id, data["member"])
+        if data["until"]:
+            self._unmute_scheduler.schedule(key, data["until"])
+        else:
+            self._unmute_scheduler.unschedule(key)
+
+    def _get_mute_data(self, guild_id: int, channel_id: Optional[int], member_id: int):
+        if channel_id is None:
+            return self._server_mutes.get(guild_id, {}).get(member_id)
+        return self._channel_mutes.get(channel_id, {}).get(member_id)
 
-        A resolution of 30 seconds seems appropriate
-        to allow for decent resolution on low timed
-        unmutes and without being too busy on our event loop
+    async def _handle_due_unmutes(self, keys: List[Tuple[int, Optional[int], int]]):
+        """This is the core task creator for automatic unmutes
+
+        It's called by the scheduler with all mutes that expired at once,
+        channel unmutes of the same member are grouped, so they're handled together.
         """
-        await self.bot.wait_until_red_ready()
-        await self._ready.wait()
-        while True:
-            await self._clean_tasks()
-            try:
-                await self._handle_server_unmutes()
-            except Exception:
-                log.error("error checking server unmutes", exc_info=True)
-            await asyncio.sleep(0.1)
-            try:
-                await self._handle_channel_unmutes()
-            except Exception:
-                log.error("error checking channel unmutes", exc_info=True)
-            await asyncio.sleep(30)
+        await self._clean_tasks()
+        now = datetime.now(timezone.utc).timestamp()
+        # guild ID -> member ID -> channel ID or None -> mute data
+        due: Dict[int, Dict[int, Dict[Optional[int], dict]]] = {}
+        for key in keys:
+            guild_id, channel_id, member_id = key
+            data = self._get_mute_data(guild_id, channel_id, member_id)
+            # the mute was removed or changed since it was scheduled
+            if not data or not data["until"]:
+                continue
+            if data["until"] > now + 1:
+                self._unmute_scheduler.schedule(key, data["until"])
+                continue
+            due.setdefault(guild_id, {}).setdefault(member_id, {})[channel_id] = data
+
+        for guild_id, members in due.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
+                # try again later, like when the guild was being polled
+                for member_id, mutes in members.items():
+                    for channel_id in mutes:
+                        self._unmute_scheduler.schedule(
+                            (guild_id, channel_id, member_id), now + 60
+                        )
+                continue
+            await i18n.set_contextual_locales_from_guild(self.bot, guild)
+            for member_id, mutes in members.items():
+                server_mute = mutes.pop(None, None)
+                if server_mute is not None:
+                    self._create_unmute_task(
+                        f"server-unmute-{guild_id}-{member_id}",
+                        self._auto_unmute_user(guild, server_mute),
+                    )
+                if len(mutes) > 1:
+                    member = guild.get_member(member_id)
+                    self._create_unmute_task(
+                        f"server-unmute-channels-{guild_id}-{member_id}",
+                        self._auto_channel_unmute_user_multi(member, guild, mutes),
+                    )
+                else:
+                    for channel_id, data in mutes.items():
+                        self._create_unmute_task(
+                            f"channel-unmute-{channel_id}-{member_id}",
+                            self._auto_channel_unmute_user(guild.get_channel(channel_id), data),
+                        )
+
+    def _create_unmute_task(self, task_name: str, coro) -> None:
+        if task_name in self._unmute_tasks:
+            coro.close()
+            return
+        log.debug(f"Creating task: {task_name}")
+        self._unmute_tasks[task_name] = asyncio.create_task(coro)
 
     async def _clean_tasks(self):
         """This is here to cleanup our tasks
@@ -237,30 +300,6 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                         log.exception("Dead task when trying to unmute")
                 self._unmute_tasks.pop(task_id, None)
 
-    async def _handle_server_unmutes(self):
-        """This is where the logic for role unmutes is taken care of"""
-        log.debug("Checking server unmutes")
-        for g_id in self._server_mutes:
-            guild = self.bot.get_guild(g_id)
-            if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
-                continue
-            await i18n.set_contextual_locales_from_guild(self.bot, guild)
-            for u_id in self._server_mutes[guild.id]:
-                if self._server_mutes[guild.id][u_id]["until"] is None:
-                    continue
-                time_to_unmute = (
-                    self._server_mutes[guild.id][u_id]["until"]
-                    - datetime.now(timezone.utc).timestamp()
-                )
-                if time_to_unmute < 60.0:
-                    task_name = f"server-unmute-{g_id}-{u_id}"
-                    if task_name in self._unmute_tasks:
-                        continue
-                    log.debug(f"Creating task: {task_name}")
-                    self._unmute_tasks[task_name] = asyncio.create_task(
-                        self._auto_unmute_user(guild, self._server_mutes[guild.id][u_id])
-                    )
-
     async def _auto_unmute_user(self, guild: discord.Guild, data: dict):
         """
         This handles role unmutes automatically
@@ -317,57 +356,6 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 log.info(error_msg)
                 return
 
-    async def _handle_channel_unmutes(self):
-        """This is where the logic for handling channel unmutes is taken care of"""
-        log.debug("Checking channel unmutes")
-        multiple_mutes = {}
-        for c_id, c_data in self._channel_mutes.items():
-            for u_id in self._channel_mutes[c_id]:
-                if (
-                    not self._channel_mutes[c_id][u_id]
-                    or not self._channel_mutes[c_id][u_id]["until"]
-                ):
-                    continue
-                guild = self.bot.get_guild(self._channel_mutes[c_id][u_id]["guild"])
-                if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
-                    continue
-                time_to_unmute = (
-                    self._channel_mutes[c_id][u_id]["until"]
-                    - datetime.now(timezone.utc).timestamp()
-                )
-                if time_to_unmute < 60.0:
-                    if guild not in multiple_mutes:
-                        multiple_mutes[guild] = {}
-                    if u_id not in multiple_mutes[guild]:
-                        multiple_mutes[guild][u_id] = {c_id: self._channel_mutes[c_id][u_id]}
-                    else:
-                        multiple_mutes[guild][u_id][c_id] = self._channel_mutes[c_id][u_id]
-
-        for guild, users in multiple_mutes.items():
-            await i18n.set_contextual_locales_from_guild(self.bot, guild)
-            for user, channels in users.items():
-                if len(channels) > 1:
-                    task_name = f"server-unmute-channels-{guild.id}-{user}"
-                    if task_name in self._unmute_tasks:
-                        continue
-                    log.debug(f"Creating task: {task_name}")
-                    member = guild.get_member(user)
-                    self._unmute_tasks[task_name] = asyncio.create_task(
-                        self._auto_channel_unmute_user_multi(member, guild, channels)
-                    )
-
-                else:
-                    for channel, mute_data in channels.items():
-                        task_name = f"channel-unmute-{channel}-{user}"
-                        log.debug(f"Creating task: {task_name}")
-                        if task_name in self._unmute_tasks:
-                            continue
-                        self._unmute_tasks[task_name] = asyncio.create_task(
-                            self._auto_channel_unmute_user(guild.get_channel(channel), mute_data)
-                        )
-
-        del multiple_mutes
-
     async def _auto_channel_unmute_user_multi(
         self, member: discord.Member, guild: discord.Guild, channels: Dict[int, dict]
     ):
@@ -852,6 +840,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         and rejoin no longer being muted.
         """
         if not role:
+            self._drop_mute_role_batches(ctx.guild)
             await self.config.guild(ctx.guild).mute_role.set(None)
             if ctx.guild.id in self.mute_role_cache:
                 del self.mute_role_cache[ctx.guild.id]
@@ -865,8 +854,21 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                     _("You can't set this role as it is not lower than you in the role hierarchy.")
                 )
                 return
+            self._drop_mute_role_batches(ctx.guild, keep=role)
             await self.config.guild(ctx.guild).mute_role.set(role.id)
             self.mute_role_cache[ctx.guild.id] = role.id
+            batch = self._overwrite_batches.get((ctx.guild.id, role.id))
+            if batch is not None and batch.action == "mute_role" and not batch.running:
+                # continue the setup of a role made with `[p]muteset makerole` that was cancelled
+                async with ctx.typing(), self._overwrite_progress(ctx, role):
+                    batch = await self._run_overwrite_batch(
+                        ctx.guild,
+                        role.id,
+                        "mute_role",
+                        functools.partial(self._set_mute_role_overwrites, role),
+                    )
+                if batch is not None:
+                    await self._send_mute_role_errors(ctx, batch)
             await ctx.send(_("Mute role set to {role}").format(role=role.name))
         if not await self.config.guild(ctx.guild).notification_channel():
             command_1 = f"`{ctx.clean_prefix}muteset notification`"
@@ -910,17 +912,24 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 # save the role early incase of issue later
             except discord.errors.Forbidden:
                 return await ctx.send(_("I could not create a muted role in this server."))
-            errors = []
-            tasks = []
-            for channel in ctx.guild.channels:
-                tasks.append(self._set_mute_role_overwrites(role, channel))
-            errors = await bounded_gather(*tasks)
-            if any(errors):
-                msg = _(
-                    "I could not set overwrites for the following channels: {channels}"
-                ).format(channels=humanize_list([i for i in errors if i]))
-                for page in pagify(msg, delims=[" "]):
-                    await ctx.send(page)
+            async with self._overwrite_progress(ctx, role):
+                batch = await self._run_overwrite_batch(
+                    ctx.guild,
+                    role.id,
+                    "mute_role",
+                    functools.partial(self._set_mute_role_overwrites, role),
+                )
+            await self._send_mute_role_errors(ctx, batch)
+            if not batch.finished and await self.config.guild(ctx.guild).mute_role() != role.id:
+                # the mute role was changed in the meantime, the setup won't be continued
+                self._drop_mute_role_batches(ctx.guild)
+            elif not batch.finished:
+                command = f"`{ctx.clean_prefix}muteset role {role.id}`"
+                await ctx.send(
+                    _("Use {command} to continue setting the overwrites of the role.").format(
+                        command=command
+                    )
+                )
 
             await ctx.send(_("Mute role set to {role}").format(role=role.name))
         if not await self.config.guild(ctx.guild).notification_channel():
@@ -932,6 +941,35 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 ).format(command_1=command_1)
             )
 
+    async def _send_mute_role_errors(self, ctx: commands.Context, batch: OverwriteBatch) -> None:
+        errors = []
+        for channel_id, result in batch.results.items():
+            channel = ctx.guild.get_channel(channel_id)
+            if channel is not None and isinstance(result, BaseException):
+                errors.append(channel.mention)
+            elif result:
+                errors.append(result)
+        errors.extend(channel.mention for channel in batch.remaining)
+        if any(errors):
+            msg = _("I could not set overwrites for the following channels: {channels}").format(
+                channels=humanize_list([i for i in errors if i])
+            )
+            for page in pagify(msg, delims=[" "]):
+                await ctx.send(page)
+
+    def _drop_mute_role_batches(
+        self, guild: discord.Guild, keep: Optional[discord.Role] = None
+    ) -> None:
+        """Drop the cancelled setups of roles that are no longer the mute role."""
+        for key, batch in list(self._overwrite_batches.items()):
+            if (
+                key[0] == guild.id
+                and batch.action == "mute_role"
+                and not batch.running
+                and (keep is None or key[1] != keep.id)
+            ):
+                del self._overwrite_batches[key]
+
     async def _set_mute_role_overwrites(
         self, role: discord.Role, channel: discord.abc.GuildChannel
     ) -> Optional[str]:
@@ -974,6 +1012,33 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 )
             )
 
+    @muteset.command(name="cancel")
+    @checks.mod_or_permissions(manage_roles=True)
+    async def cancel_overwrites(
+        self, ctx: commands.Context, *, target: Union[discord.Member, discord.Role]
+    ):
+        """
+        Cancel updating the channel permissions of a user or the mute role.
+
+        The channels updated so far keep their permissions.
+        Running the same mute or unmute command again continues with the rest,
+        for the mute role, that's done by setting it again with `[p]muteset role`.
+        """
+        batch = self._overwrite_batches.get((ctx.guild.id, target.id))
+        if batch is None or not batch.running:
+            return await ctx.send(
+                _("The channel permissions of {target} aren't being updated.").format(
+                    target=target
+                )
+            )
+        batch.cancel()
+        await ctx.send(
+            _(
+                "Cancelled updating the channel permissions of {target},"
+                " {done}/{total} channels were updated."
+            ).format(target=target, done=batch.done, total=batch.total)
+        )
+
     async def _check_for_mute_role(self, ctx: commands.Context) -> bool:
         """
         This explains to the user whether or not mutes are setup correctly for
@@ -1165,7 +1230,8 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             success_list = []
             issue_list = []
             for user in users:
-                success = await self.mute_user(guild, author, user, until, audit_reason)
+                async with self._overwrite_progress(ctx, user):
+                    success = await self.mute_user(guild, author, user, until, audit_reason)
                 if success["success"]:
                     success_list.append(user)
                     if success["channels"]:
@@ -1386,7 +1452,8 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             else:
                 self._channel_mute_events[guild.id] = asyncio.Event()
             for user in users:
-                success = await self.unmute_user(guild, author, user, audit_reason)
+                async with self._overwrite_progress(ctx, user):
+                    success = await self.unmute_user(guild, author, user, audit_reason)
 
                 if success["success"]:
                     success_list.append(user)
@@ -1544,6 +1611,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 "member": user.id,
                 "until": until.timestamp() if until else None,
             }
+            self._schedule_unmute(guild.id, None, self._server_mutes[guild.id][user.id])
             try:
                 await user.add_roles(role, reason=reason)
                 await self.config.guild(guild).muted_users.set(self._server_mutes[guild.id])
@@ -1556,11 +1624,23 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             return ret
         else:
             perms_cache = {}
-            tasks = []
-            for channel in guild.channels:
-                tasks.append(self.channel_mute_user(guild, channel, author, user, until, reason))
-            task_result = await bounded_gather(*tasks)
-            for task in task_result:
+            batch = await self._run_overwrite_batch(
+                guild,
+                user.id,
+                "mute",
+                functools.partial(
+                    self.channel_mute_user,
+                    guild,
+                    author=author,
+                    user=user,
+                    until=until,
+                    reason=reason,
+                ),
+            )
+            if batch is None:
+                ret["reason"] = _(MUTE_UNMUTE_ISSUES["overwrites_running"])
+                return ret
+            for task in self._get_overwrite_results(guild, batch):
                 if not task["success"]:
                     ret["channels"].append((task["channel"], task["reason"]))
                 else:
@@ -1606,6 +1686,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             if guild.id in self._server_mutes:
                 if user.id in self._server_mutes[guild.id]:
                     del self._server_mutes[guild.id][user.id]
+            self._unmute_scheduler.unschedule((guild.id, None, user.id))
             if not guild.me.guild_permissions.manage_roles or role >= guild.me.top_role:
                 ret["reason"] = _(MUTE_UNMUTE_ISSUES["permissions_issue_role"])
                 return ret
@@ -1617,18 +1698,116 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             ret["success"] = True
             return ret
         else:
-            tasks = []
-            for channel in guild.channels:
-                tasks.append(self.channel_unmute_user(guild, channel, author, user, reason))
-            results = await bounded_gather(*tasks)
-            for task in results:
+            batch = await self._run_overwrite_batch(
+                guild,
+                user.id,
+                "unmute",
+                functools.partial(
+                    self.channel_unmute_user, guild, author=author, user=user, reason=reason
+                ),
+            )
+            if batch is None:
+                ret["reason"] = _(MUTE_UNMUTE_ISSUES["overwrites_running"])
+                return ret
+            for task in self._get_overwrite_results(guild, batch):
                 if not task["success"]:
                     ret["channels"].append((task["channel"], task["reason"]))
                 else:
                     ret["success"] = True
-            await self.config.member(user).clear()
+            if batch.finished:
+                # the old overwrites of the channels left to unmute are still needed
+                await self.config.member(user).clear()
             return ret
 
+    async def _run_overwrite_batch(
+        self, guild: discord.Guild, target_id: int, action: str, apply
+    ) -> Optional[OverwriteBatch]:
+        """
+        Apply an overwrite change to all channels of the guild,
+        or to the channels left by a cancelled batch doing the same.
+
+        Returns `None` if there's already a batch running for the target.
+        """
+        key = (guild.id, target_id)
+        batch = self._overwrite_batches.get(key)
+        if batch is not None and batch.running:
+            return None
+        if batch is None or batch.action != action:
+            batch = self._overwrite_batches[key] = OverwriteBatch(
+                action, order_by_category(guild), apply
+            )
+        else:
+            batch.apply = apply
+        await batch.run()
+        if batch.finished and self._overwrite_batches.get(key) is batch:
+            del self._overwrite_batches[key]
+        return batch
+
+    def _get_overwrite_results(
+        self, guild: discord.Guild, batch: OverwriteBatch
+    ) -> Iterator[dict]:
+        """Get the results of `channel_mute_user()` or `channel_unmute_user()` from the batch."""
+        for channel_id, result in batch.results.items():
+            if not isinstance(result, BaseException):
+                yield result
+                continue
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                continue
+            if isinstance(result, discord.Forbidden):
+                reason = _(MUTE_UNMUTE_ISSUES["permissions_issue_channel"])
+            else:
+                reason = _(MUTE_UNMUTE_ISSUES["overwrite_failed"])
+            yield {"success": False, "channel": channel, "reason": reason}
+        for channel in batch.remaining:
+            yield {
+                "success": False,
+                "channel": channel,
+                "reason": _(MUTE_UNMUTE_ISSUES["overwrites_cancelled"]),
+            }
+
+    @contextlib.asynccontextmanager
+    async def _overwrite_progress(
+        self, ctx: commands.Context, target: Union[discord.Member, discord.Role]
+    ):
+        """Show the progress of the target's overwrite batch while it takes a while."""
+        task = asyncio.create_task(self._show_overwrite_progress(ctx, target))
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    async def _show_overwrite_progress(
+        self, ctx: commands.Context, target: Union[discord.Member, discord.Role]
+    ) -> None:
+        key = (ctx.guild.id, target.id)
+        message = None
+        try:
+            while True:
+                await asyncio.sleep(5)
+                batch = self._overwrite_batches.get(key)
+                if batch is None or not batch.running:
+                    continue
+                content = _(
+                    "Updating the permissions for {target} in {done}/{total} channels..."
+                    " Use `{command}` to cancel."
+                ).format(
+                    target=target,
+                    done=batch.done,
+                    total=batch.total,
+                    command=f"{ctx.clean_prefix}muteset cancel {target.id}",
+                )
+                if message is None:
+                    message = await ctx.send(content)
+                else:
+                    await message.edit(content=content)
+        except discord.HTTPException:
+            pass
+        finally:
+            if message is not None:
+                with contextlib.suppress(discord.HTTPException):
+                    await message.delete()
+
     async def channel_mute_user(
         self,
         guild: discord.Guild,
@@ -1688,6 +1867,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             "member": user.id,
             "until": until.timestamp() if until else None,
         }
+        self._schedule_unmute(guild.id, channel.id, self._channel_mutes[channel.id][user.id])
         try:
             await channel.set_permissions(user, overwrite=overwrites, reason=reason)
             async with self.config.channel(channel).muted_users() as muted_users:
@@ -1723,6 +1903,12 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 "channel": channel,
                 "reason": _(MUTE_UNMUTE_ISSUES["permissions_issue_channel"]),
             }
+        except discord.HTTPException:
+            # forget the mute, so that retrying doesn't consider the user muted already
+            if channel.id in self._channel_mutes and user.id in self._channel_mutes[channel.id]:
+                del self._channel_mutes[channel.id][user.id]
+                self._unmute_scheduler.unschedule((guild.id, channel.id, user.id))
+            raise
         if move_channel:
             try:
                 await user.move_to(channel)
@@ -1768,7 +1954,8 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
 
         overwrites.update(**old_values)
         if channel.id in self._channel_mutes and user.id in self._channel_mutes[channel.id]:
-            del self._channel_mutes[channel.id][user.id]
+            mute_data = self._channel_mutes[channel.id].pop(user.id)
+            self._unmute_scheduler.unschedule((guild.id, channel.id, user.id))
         else:
             return {
                 "success": False,
@@ -1804,6 +1991,11 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                     "channel": channel,
                     "reason": _(MUTE_UNMUTE_ISSUES["left_guild"]),
                 }
+        except discord.HTTPException:
+            # restore the mute, so that retrying doesn't consider the user unmuted already
+            self._channel_mutes[channel.id][user.id] = mute_data
+            self._schedule_unmute(guild.id, channel.id, mute_data)
+            raise
         if move_channel:
             try:
                 await user.move_to(channel)
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Iterator, List, Tuple, TypeVar, Union
+
+import aiohttp
+import discord
+from redbot.core.utils import bounded_gather_stream
+
+log = logging.getLogger("red.cogs.mutes")
+
+_T = TypeVar("_T")
+
+
+def order_by_category(guild: discord.Guild) -> List[discord.abc.GuildChannel]:
+    """
+    Get the channels of the guild in the order they're shown in the client,
+    each category followed by its channels.
+    """
+    ret = []
+    for category, channels in guild.by_category():
+        if category is not None:
+            ret.append(category)
+        ret.extend(channels)
+    return ret
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, discord.HTTPException):
+        return exc.status >= 500 or exc.status == 429
+    return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+class OverwriteBatch(Generic[_T]):
+    """
+    Applies a permission overwrite change to many channels of a guild.
+
+    The channels are processed a few at a time. discord.py waits out the rate limits
+    of each route on its own, so requests slowed down by them are detected by their latency
+    and the concurrency is lowered until they're fast again.
+    Transient failures (server errors, timeouts) are retried with a backoff.
+
+    The batch can be cancelled, the requests that are already running are finished,
+    and running it again continues with the channels that weren't processed yet.
+
+    Parameters
+    ----------
+    action : str
+        What the batch does, e.g. ``"mute"``, so that only a batch doing the same can be resumed.
+    channels : List[discord.abc.GuildChannel]
+        The channels to process, in order.
+    apply : Callable[[discord.abc.GuildChannel], Awaitable]
+        The coroutine function applying the change to a single channel.
+    """
+
+    #: The maximum amount of channels processed at once.
+    LIMIT = 4
+    #: The amount of seconds after which a request is considered slowed by rate limits.
+    LATENCY_TARGET = 2.0
+    #: The maximum amount of attempts for each channel.
+    ATTEMPTS = 3
+
+    def __init__(
+        self,
+        action: str,
+        channels: List[discord.abc.GuildChannel],
+        apply: Callable[[discord.abc.GuildChannel], Awaitable[_T]],
+    ):
+        self.action = action
+        self.apply = apply
+        self.total = len(channels)
+        #: channel ID -> the result of ``apply`` or the exception it raised
+        self.results: Dict[int, Union[_T, BaseException]] = {}
+        self.retries = 0
+        self.cancelled = False
+        self.running = False
+        self._remaining = list(channels)
+
+    @property
+    def done(self) -> int:
+        """The amount of processed channels."""
+        return len(self.results)
+
+    @property
+    def finished(self) -> bool:
+        """Whether all channels were processed."""
+        return not self._remaining
+
+    @property
+    def remaining(self) -> List[discord.abc.GuildChannel]:
+        """The channels that weren't processed yet."""
+        return list(self._remaining)
+
+    def cancel(self) -> None:
+        """Stop processing more channels, the batch can be resumed by running it again."""
+        self.cancelled = True
+
+    async def run(self) -> Dict[int, Union[_T, BaseException]]:
+        """
+        Process the remaining channels.
+
+        Returns
+        -------
+        Dict[int, Any]
+            The results for all channels processed by this batch so far.
+        """
+        self.cancelled = False
+        self.running = True
+        try:
+            async for channel, result in bounded_gather_stream(
+                self._pending(),
+                limit=self.LIMIT,
+                ordered=False,
+                adaptive=True,
+                latency_target=self.LATENCY_TARGET,
+            ):
+                self.results[channel.id] = result
+                self._remaining.remove(channel)
+        finally:
+            self.running = False
+        return self.results
+
+    def _pending(self) -> Iterator[Awaitable[Tuple[discord.abc.GuildChannel, _T]]]:
+        # channels are only taken when they're about to be started, so cancelling stops here
+        for channel in self.remaining:
+            if self.cancelled:
+                return
+            yield self._apply_with_retries(channel)
+
+    async def _apply_with_retries(
+        self, channel: discord.abc.GuildChannel
+    ) -> Tuple[discord.abc.GuildChannel, Union[_T, BaseException]]:
+        for attempt in range(self.ATTEMPTS):
+            try:
+                return channel, await self.apply(channel)
+            except Exception as exc:
+                if not _is_transient(exc) or attempt == self.ATTEMPTS - 1 or self.cancelled:
+                    log.debug("Failed to update the overwrites of %s", channel.id, exc_info=exc)
+                    return channel, exc
+                self.retries += 1
+                await asyncio.sleep(2**attempt)
@@ -5,7 +5,6 @@ from copy import copy
 from typing import Union, Optional, Dict, List, Tuple, Any, Iterator, ItemsView, Literal, cast
 
 import discord
-import yaml
 from schema import And, Or, Schema, SchemaError, Optional as UseOptional
 from redbot.core import checks, commands, config
 from redbot.core.bot import Red
@@ -637,6 +636,8 @@ class Permissions(commands.Cog):
             await ctx.send(_("You must upload a file."))
             return
 
+        import yaml
+
         try:
             await self._yaml_set_acl(ctx.message.attachments[0], guild_id=guild_id, update=update)
         except yaml.MarkedYAMLError as e:
@@ -650,6 +651,8 @@ class Permissions(commands.Cog):
 
     async def _yaml_set_acl(self, source: discord.Attachment, guild_id: int, update: bool) -> None:
         """Set rules from a YAML file."""
+        import yaml
+
         with io.BytesIO() as fp:
             await source.save(fp)
             rules = yaml.safe_load(fp)
@@ -674,6 +677,8 @@ class Permissions(commands.Cog):
 
     async def _yaml_get_acl(self, guild_id: int) -> discord.File:
         """Get a YAML file for all rules set in a guild."""
+        import yaml
+
         guild_rules = {}
         for category in (COG, COMMAND):
             guild_rules.setdefault(category, {})
@@ -9,7 +9,7 @@ import discord
 from redbot.core import Config, checks, commands
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import pagify, box
-from redbot.core.utils.antispam import AntiSpam
+from redbot.core.utils.antispam import AntiSpamManager
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n, set_contextual_locales_from_guild
 from redbot.core.utils.predicates import MessagePredicate
@@ -54,7 +54,7 @@ class Reports(commands.Cog):
         self.config.register_guild(**self.default_guild_settings)
         self.config.init_custom("REPORT", 2)
         self.config.register_custom("REPORT", **self.default_report)
-        self.antispam = {}
+        self.antispam = AntiSpamManager(self.intervals)
         self.user_cache = []
         self.tunnel_store = {}
         # (guild, ticket#):
@@ -254,11 +254,7 @@ class Reports(commands.Cog):
         g_active = await self.config.guild(guild).active()
         if not g_active:
             return await author.send(_("Reporting has not been enabled for this server"))
-        if guild.id not in self.antispam:
-            self.antispam[guild.id] = {}
-        if author.id not in self.antispam[guild.id]:
-            self.antispam[guild.id][author.id] = AntiSpam(self.intervals)
-        if self.antispam[guild.id][author.id].spammy:
+        if self.antispam.spammy((guild.id, author.id)):
             return await author.send(
                 _(
                     "You've sent too many reports recently. "
@@ -316,7 +312,7 @@ class Reports(commands.Cog):
                     )
             else:
                 await author.send(_("Your report was submitted. (Ticket #{})").format(val))
-                self.antispam[guild.id][author.id].stamp()
+                self.antispam.stamp((guild.id, author.id))
 
     @report.after_invoke
     async def report_cleanup(self, ctx: commands.Context):
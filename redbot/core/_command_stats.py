@@ -0,0 +1,195 @@
+"""
+Latency instrumentation for command invocations.
+
+`Red.invoke` records every invocation into the bot's `CommandStats`,
+which are exposed through the ``[p]commandstats`` owner command
+and the ``CORE__COMMAND_STATS`` RPC method.
+"""
+import collections
+import math
+import time
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .commands import Context
+
+__all__ = ("LatencyHistogram", "InvocationTiming", "CommandStats")
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies (in seconds) with logarithmically sized buckets.
+
+    Memory use doesn't depend on the amount of recorded values
+    and percentiles are accurate to within 10%.
+    """
+
+    __slots__ = ("_buckets", "count", "total", "max")
+
+    _MIN_VALUE = 1e-5
+    _LOG_BASE = math.log(1.1)
+
+    def __init__(self) -> None:
+        self._buckets: Dict[int, int] = collections.defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        if value <= self._MIN_VALUE:
+            idx = 0
+        else:
+            idx = int(math.log(value / self._MIN_VALUE) / self._LOG_BASE) + 1
+        self._buckets[idx] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        """Get an estimate of the given percentile (0-100) of the recorded values."""
+        if not self.count:
+            return 0.0
+        threshold = self.count * percent / 100
+        seen = 0
+        for idx in sorted(self._buckets):
+            seen += self._buckets[idx]
+            if seen >= threshold:
+                # the upper bound of the bucket, which can't be higher than the actual max
+                return min(self._MIN_VALUE * math.exp(idx * self._LOG_BASE), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class InvocationTiming:
+    """Time spent in the different phases of a single invocation, filled in as it progresses."""
+
+    __slots__ = ("start", "checks", "conversion")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.checks = 0.0
+        self.conversion = 0.0
+
+
+class _CommandHistograms:
+    __slots__ = ("total", "checks", "conversion", "errors")
+
+    def __init__(self) -> None:
+        self.total = LatencyHistogram()
+        self.checks = LatencyHistogram()
+        self.conversion = LatencyHistogram()
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.to_dict(),
+            "checks": self.checks.to_dict(),
+            "conversion": self.conversion.to_dict(),
+            "errors": self.errors,
+        }
+
+
+def _redact_arguments(ctx: "Context") -> List[str]:
+    # Only keep the types, the values may contain anything the user sent.
+    args = ctx.args[2:] if ctx.command.cog is not None else ctx.args[1:]
+    redacted = [type(arg).__name__ for arg in args]
+    redacted.extend(f"{key}={type(value).__name__}" for key, value in ctx.kwargs.items())
+    return redacted
+
+
+class CommandStats:
+    """
+    Per-command and per-cog latency histograms, along with a log of slow invocations.
+
+    Parameters
+    ----------
+    slow_threshold : float
+        Invocations taking at least this many seconds are added to the slow log.
+    slow_log_size : int
+        The maximum amount of invocations kept in the slow log.
+    """
+
+    def __init__(self, *, slow_threshold: float = 1.0, slow_log_size: int = 50) -> None:
+        self.slow_threshold = slow_threshold
+        self._commands: Dict[str, _CommandHistograms] = {}
+        self._cogs: Dict[str, LatencyHistogram] = {}
+        self._slow_log: Deque[Dict[str, Any]] = collections.deque(maxlen=slow_log_size)
+
+    def record(self, ctx: "Context", timing: InvocationTiming) -> None:
+        elapsed = time.perf_counter() - timing.start
+        command = ctx.command
+        try:
+            histograms = self._commands[command.qualified_name]
+        except KeyError:
+            histograms = self._commands[command.qualified_name] = _CommandHistograms()
+        histograms.total.record(elapsed)
+        histograms.checks.record(timing.checks)
+        histograms.conversion.record(timing.conversion)
+        if ctx.command_failed:
+            histograms.errors += 1
+
+        cog_name = command.cog_name or "No Category"
+        try:
+            cog_histogram = self._cogs[cog_name]
+        except KeyError:
+            cog_histogram = self._cogs[cog_name] = LatencyHistogram()
+        cog_histogram.record(elapsed)
+
+        if elapsed >= self.slow_threshold:
+            self._slow_log.append(
+                {
+                    "command": command.qualified_name,
+                    "cog": cog_name,
+                    "time": time.time(),
+                    "total": elapsed,
+                    "checks": timing.checks,
+                    "conversion": timing.conversion,
+                    "failed": ctx.command_failed,
+                    "guild_id": ctx.guild.id if ctx.guild is not None else None,
+                    "arguments": _redact_arguments(ctx),
+                }
+            )
+
+    def get_command(self, qualified_name: str) -> Optional[Dict[str, Any]]:
+        histograms = self._commands.get(qualified_name)
+        return histograms.to_dict() if histograms is not None else None
+
+    def slowest_commands(self, limit: int = 10, *, percent: float = 95) -> List[Dict[str, Any]]:
+        """Get the commands with the highest given percentile of total latency."""
+        ranked = sorted(
+            self._commands.items(),
+            key=lambda item: item[1].total.percentile(percent),
+            reverse=True,
+        )
+        return [{"command": name, **h.total.to_dict()} for name, h in ranked[:limit]]
+
+    @property
+    def slow_log(self) -> List[Dict[str, Any]]:
+        """The recent slow invocations, most recent first."""
+        return list(reversed(self._slow_log))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "commands": {name: h.to_dict() for name, h in self._commands.items()},
+            "cogs": {name: h.to_dict() for name, h in self._cogs.items()},
+            "slow_log": self.slow_log,
+        }
+
+    def clear(self) -> None:
+        self._commands.clear()
+        self._cogs.clear()
+        self._slow_log.clear()
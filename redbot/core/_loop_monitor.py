@@ -0,0 +1,192 @@
+"""
+Watchdog measuring event loop lag and reporting what blocked it.
+
+A heartbeat task on the loop records when it last ran, while a helper thread
+notices when the heartbeat is late and captures the stack of the loop's thread
+at that moment. Once the loop recovers, the report is attributed to the cog
+the blocking code belongs to, logged and sent to the owners.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from ._command_stats import LatencyHistogram
+from .utils.chat_formatting import box, humanize_list, pagify
+
+if TYPE_CHECKING:
+    from .bot import Red
+
+__all__ = ("LoopLagMonitor",)
+
+log = logging.getLogger("red.loop_monitor")
+
+# frames from these modules are just the machinery running the blocking callback
+_IGNORED_MODULE_PREFIXES = ("asyncio.", "uvloop", "concurrent.futures.", "threading")
+
+
+class _BlockingReport:
+    __slots__ = ("started_at", "stack", "task_name")
+
+    def __init__(
+        self,
+        started_at: float,
+        stack: List[Tuple[str, traceback.FrameSummary]],
+        task_name: Optional[str],
+    ) -> None:
+        self.started_at = started_at
+        # (module name, frame) pairs, outermost first
+        self.stack = stack
+        self.task_name = task_name
+
+
+class LoopLagMonitor:
+    """
+    Measures the lag of the event loop and reports blocking callbacks.
+
+    Parameters
+    ----------
+    bot : Red
+        The bot, used for attributing blocking code to cogs and notifying owners.
+    threshold : float
+        The lag (in seconds) above which the loop is considered blocked.
+    interval : float
+        How often (in seconds) the loop is probed.
+    owner_notification_interval : float
+        The minimum amount of seconds between notifications sent to the owners.
+    """
+
+    def __init__(
+        self,
+        bot: "Red",
+        *,
+        threshold: float,
+        interval: float = 0.5,
+        owner_notification_interval: float = 15 * 60,
+    ) -> None:
+        self.bot = bot
+        self.threshold = threshold
+        self.interval = interval
+        self.owner_notification_interval = owner_notification_interval
+        self.lag = LatencyHistogram()
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._pending_report: Optional[_BlockingReport] = None
+        self._last_owner_notification: Optional[float] = None
+
+    def start(self) -> None:
+        """Start monitoring the running loop. Has to be called from the loop's thread."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="red-loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        self._task = None
+        self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            self.lag.record(lag)
+            self._last_beat = now
+            report, self._pending_report = self._pending_report, None
+            if report is not None:
+                # reporting is done in a separate task so that the heartbeat keeps going
+                self._loop.create_task(self._handle_report(report, now - report.started_at))
+
+    def _watch(self) -> None:
+        # runs in the helper thread
+        reported_beat = None
+        while not self._stopped.wait(self.interval / 2):
+            last_beat = self._last_beat
+            if last_beat == reported_beat:
+                # already captured this stall
+                continue
+            if time.monotonic() - last_beat - self.interval < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = list(traceback.walk_stack(frame))
+            del frame
+            summaries = traceback.StackSummary.extract(iter(frames))
+            stack = [
+                (f.f_globals.get("__name__", ""), summary)
+                for (f, _lineno), summary in zip(frames, summaries)
+            ][::-1]
+            del frames
+            task = asyncio.current_task(self._loop)
+            task_name = task.get_name() if task is not None else None
+            self._pending_report = _BlockingReport(last_beat + self.interval, stack, task_name)
+            reported_beat = last_beat
+
+    def _find_cog_names(self, stack: List[Tuple[str, traceback.FrameSummary]]) -> List[str]:
+        extensions = list(self.bot.extensions)
+        for module_name, _summary in reversed(stack):
+            for ext_name in extensions:
+                if module_name == ext_name or module_name.startswith(ext_name + "."):
+                    return [
+                        cog_name
+                        for cog_name, cog in self.bot.cogs.items()
+                        if cog.__module__ == ext_name or cog.__module__.startswith(ext_name + ".")
+                    ] or [ext_name]
+        return []
+
+    async def _handle_report(self, report: _BlockingReport, blocked_for: float) -> None:
+        try:
+            await self._report(report, blocked_for)
+        except Exception:
+            log.exception("Failed to report the blocked event loop.")
+
+    async def _report(self, report: _BlockingReport, blocked_for: float) -> None:
+        cog_names = self._find_cog_names(report.stack)
+        owner = humanize_list(cog_names) if cog_names else "unknown"
+        frames = [
+            summary
+            for module_name, summary in report.stack
+            if not module_name.startswith(_IGNORED_MODULE_PREFIXES)
+        ]
+        formatted_stack = "".join(traceback.format_list(frames))
+        log.warning(
+            "The event loop was blocked for %.2fs (cog: %s, task: %s). Stack of the blocking call:\n%s",
+            blocked_for,
+            owner,
+            report.task_name,
+            formatted_stack,
+        )
+
+        now = time.monotonic()
+        if (
+            self._last_owner_notification is not None
+            and now - self._last_owner_notification < self.owner_notification_interval
+        ):
+            return
+        self._last_owner_notification = now
+        message = (
+            f"The event loop was blocked for {blocked_for:.2f}s, which stalls the whole bot."
+            f"\nOwning cog: {owner}\nTask: {report.task_name}\n"
+            "Stack of the blocking call:\n"
+        )
+        # the innermost frames are the most relevant ones
+        pages = list(pagify(formatted_stack, delims=["\n"], page_length=1500))
+        await self.bot.send_to_owners(message + box(pages[-1] if pages else "", lang="py"))
@@ -6,7 +6,9 @@ import os
 import platform
 import shutil
 import sys
+import time
 import contextlib
+import functools
 import weakref
 from collections import namedtuple
 from contextvars import ContextVar
@@ -32,6 +34,7 @@ from typing import (
     Literal,
     MutableMapping,
     Set,
+    Tuple,
     overload,
 )
 from types import MappingProxyType
@@ -41,6 +44,8 @@ from discord.ext import commands as dpy_commands
 from discord.ext.commands import when_mentioned_or
 
 from . import Config, i18n, commands, errors, drivers, modlog, bank
+from ._command_stats import CommandStats, InvocationTiming
+from ._loop_monitor import LoopLagMonitor
 from .cog_manager import CogManager, CogManagerUI
 from .core_commands import Core
 from .data_manager import cog_data_path
@@ -52,16 +57,20 @@ from .settings_caches import (
     IgnoreManager,
     WhitelistBlacklistManager,
     DisabledCogCache,
+    GuildSettingsSnapshot,
     I18nManager,
 )
 from .rpc import RPCMixin
-from .utils import common_filters, AsyncIter
+from .utils import common_filters, AsyncIter, bounded_gather
+from .utils.caching import AsyncCache
 from .utils._internal_utils import (
+    CommandIndex,
     ProxyCounter,
     deprecated_removed,
     send_to_owners_with_prefix_replaced,
 )
-from .. import json
+from .. import json, _startup_profiler
+from ..logging import log_context
 
 CUSTOM_GROUPS = "CUSTOM_GROUPS"
 COMMAND_SCOPE = "COMMAND"
@@ -87,6 +96,76 @@ LIST = {
 UserOrRole = Union[int, discord.Role, discord.Member, discord.User]
 
 
+def _get_load_dependencies(spec: ModuleSpec) -> Set[str]:
+    """Get the packages that the package should be loaded after, based on its info.json file."""
+    if spec.origin is None:
+        return set()
+    info_file = Path(spec.origin).parent / "info.json"
+    try:
+        with info_file.open(encoding="utf-8") as fp:
+            info = json.load(fp)
+    except (OSError, ValueError):
+        return set()
+    if not isinstance(info, dict):
+        return set()
+
+    dependencies = set()
+    required_cogs = info.get("required_cogs")
+    if isinstance(required_cogs, dict):
+        dependencies.update(required_cogs)
+    load_after = info.get("load_after")
+    if isinstance(load_after, list):
+        dependencies.update(name for name in load_after if isinstance(name, str))
+    return dependencies
+
+
+def _resolve_load_order(dependencies: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    """
+    Restrict the dependencies to the given packages and drop the ones forming cycles,
+    so that waiting on dependencies can't deadlock.
+    """
+    dependencies = {
+        package: {dep for dep in deps if dep in dependencies and dep != package}
+        for package, deps in dependencies.items()
+    }
+    remaining = {package: set(deps) for package, deps in dependencies.items()}
+    ready = [package for package, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for package, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(package)
+    # What's left is either in a cycle or depends on one. Only the order between packages
+    # that are in the same cycle (reachable from each other) has to be given up.
+    reachable = {package: _get_reachable(dependencies, package) for package in remaining}
+    for package in remaining:
+        circular = {dep for dep in dependencies[package] if package in reachable.get(dep, ())}
+        if circular:
+            log.warning(
+                "Ignoring the load order of package %s relative to %s"
+                " as their dependencies are circular.",
+                package,
+                ", ".join(sorted(circular)),
+            )
+            dependencies[package] -= circular
+    return dependencies
+
+
+def _get_reachable(dependencies: Dict[str, Set[str]], package: str) -> Set[str]:
+    """Get the packages that the package depends on, directly or indirectly."""
+    reachable: Set[str] = set()
+    stack = list(dependencies[package])
+    while stack:
+        dep = stack.pop()
+        if dep not in reachable:
+            reachable.add(dep)
+            stack.extend(dependencies[dep])
+    return reachable
+
+
 def _is_submodule(parent, child):
     return parent == child or child.startswith(parent + ".")
 
@@ -113,6 +192,18 @@ class RedBase(
         self.rpc_enabled = cli_flags.rpc
         self.rpc_port = cli_flags.rpc_port
         self._counter = ProxyCounter()
+        self._command_stats = CommandStats()
+        # results of `get_or_fetch_user()` and `get_or_fetch_member()`,
+        # `discord.NotFound` is cached as well so that departed users aren't fetched repeatedly
+        self._fetched_users: AsyncCache[int, Union[discord.User, discord.NotFound]] = AsyncCache(
+            name="red.fetched_users", maxsize=2000, ttl=300
+        )
+        self._fetched_members: AsyncCache[
+            Tuple[int, int], Union[discord.Member, discord.NotFound]
+        ] = AsyncCache(name="red.fetched_members", maxsize=2000, ttl=60)
+        self._loop_monitor: Optional[LoopLagMonitor] = None
+        # package name -> time it took to load at startup (in seconds)
+        self._package_load_times: Dict[str, float] = {}
         self._counter._register_core_counters_raw(
             "Red_Core",
             "on_connect",
@@ -126,6 +217,7 @@ class RedBase(
             "on_guild_join",
             "on_guild_available",
             "on_guild_remove",
+            "on_guild_channel_delete",
             "on_cog_add",
             "on_message_without_command",
             "on_modlog_case_edit",
@@ -228,6 +320,7 @@ class RedBase(
         self._ignored_cache = IgnoreManager(self._config)
         self._whiteblacklist_cache = WhitelistBlacklistManager(self._config)
         self._i18n_cache = I18nManager(self._config)
+        self._guild_settings = GuildSettingsSnapshot(self._config)
         self._bypass_cooldowns = False
 
         async def prefix_manager(bot, message) -> List[str]:
@@ -290,6 +383,7 @@ class RedBase(
 
         self._main_dir = bot_dir
         self._cog_mgr = CogManager()
+        self._command_index = CommandIndex()
         self._use_team_features = cli_flags.use_team_features
 
         # remove on startup chunking
@@ -308,6 +402,7 @@ class RedBase(
         self.add_command(commands.help.red_help)
 
         self._permissions_hooks: List[commands.CheckPredicate] = []
+        self._shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
         self._red_ready = asyncio.Event()
         self._red_before_invoke_objs: Set[PreInvokeCoroutine] = set()
 
@@ -1314,6 +1409,9 @@ class RedBase(
 
             This method may make an API call if the user is not found in the bot cache. For general usage, consider ``bot.get_user`` instead.
 
+        Results of API calls (including users that weren't found) are cached for a few minutes
+        and concurrent calls for the same user share a single API call.
+
         Parameters
         -----------
         user_id: int
@@ -1332,7 +1430,50 @@ class RedBase(
 
         if (user := self.get_user(user_id)) is not None:
             return user
-        return await self.fetch_user(user_id)
+        result = await self._fetched_users.get_or_load(
+            user_id, functools.partial(self._fetch_or_not_found, self.fetch_user, user_id)
+        )
+        if isinstance(result, discord.NotFound):
+            raise result.with_traceback(None)
+        return result
+
+    async def get_or_fetch_users(self, user_ids: Iterable[int]) -> Dict[int, discord.User]:
+        """
+        Retrieves multiple `discord.User` objects based on their IDs.
+
+        This is the same as calling `get_or_fetch_user()` for each of the IDs,
+        with a limited amount of concurrent API calls.
+
+        Parameters
+        -----------
+        user_ids: Iterable[int]
+            The IDs of the users that should be retrieved.
+
+        Raises
+        -------
+        Errors
+            Please refer to `discord.Client.fetch_user`,
+            `discord.NotFound` is never raised.
+
+        Returns
+        --------
+        Dict[int, discord.User]
+            Mapping of user IDs to the users. IDs of users that weren't found are omitted.
+        """
+        users: Dict[int, discord.User] = {}
+        to_fetch: List[int] = []
+        for user_id in dict.fromkeys(user_ids):
+            if (user := self.get_user(user_id)) is not None:
+                users[user_id] = user
+            else:
+                to_fetch.append(user_id)
+
+        async def fetch(user_id: int) -> None:
+            with contextlib.suppress(discord.NotFound):
+                users[user_id] = await self.get_or_fetch_user(user_id)
+
+        await bounded_gather(*map(fetch, to_fetch))
+        return users
 
     async def get_or_fetch_member(self, guild: discord.Guild, member_id: int) -> discord.Member:
         """
@@ -1342,6 +1483,9 @@ class RedBase(
 
             This method may make an API call if the user is not found in the bot cache. For general usage, consider ``discord.Guild.get_member`` instead.
 
+        Results of API calls (including members that weren't found) are cached for a minute
+        and concurrent calls for the same member share a single API call.
+
         Parameters
         -----------
         guild: discord.Guild
@@ -1362,7 +1506,78 @@ class RedBase(
 
         if (member := guild.get_member(member_id)) is not None:
             return member
-        return await guild.fetch_member(member_id)
+        result = await self._fetched_members.get_or_load(
+            (guild.id, member_id),
+            functools.partial(self._fetch_or_not_found, guild.fetch_member, member_id),
+            tags=(guild.id,),
+        )
+        if isinstance(result, discord.NotFound):
+            raise result.with_traceback(None)
+        return result
+
+    async def get_or_fetch_members(
+        self, guild: discord.Guild, member_ids: Iterable[int]
+    ) -> Dict[int, discord.Member]:
+        """
+        Retrieves multiple `discord.Member` objects from a guild based on their IDs.
+
+        When the members intent is enabled, members missing from the bot cache
+        are requested over the gateway in chunks of 100, without any API calls.
+        Otherwise, this is the same as calling `get_or_fetch_member()` for each of the IDs,
+        with a limited amount of concurrent API calls.
+
+        Parameters
+        -----------
+        guild: discord.Guild
+            The guild which the members should be retrieved from.
+        member_ids: Iterable[int]
+            The IDs of the members that should be retrieved.
+
+        Raises
+        -------
+        Errors
+            Please refer to `discord.Guild.query_members` and `discord.Guild.fetch_member`,
+            `discord.NotFound` is never raised.
+
+        Returns
+        --------
+        Dict[int, discord.Member]
+            Mapping of member IDs to the members. IDs of users that aren't members are omitted.
+        """
+        members: Dict[int, discord.Member] = {}
+        to_fetch: List[int] = []
+        for member_id in dict.fromkeys(member_ids):
+            if (member := guild.get_member(member_id)) is not None:
+                members[member_id] = member
+            else:
+                to_fetch.append(member_id)
+        if not to_fetch:
+            return members
+
+        if self.intents.members:
+            if not guild.chunked:
+                for idx in range(0, len(to_fetch), 100):
+                    queried = await guild.query_members(
+                        user_ids=to_fetch[idx : idx + 100], limit=100
+                    )
+                    members.update((member.id, member) for member in queried)
+            return members
+
+        async def fetch(member_id: int) -> None:
+            with contextlib.suppress(discord.NotFound):
+                members[member_id] = await self.get_or_fetch_member(guild, member_id)
+
+        await bounded_gather(*map(fetch, to_fetch))
+        return members
+
+    @staticmethod
+    async def _fetch_or_not_found(
+        fetch: Callable[[int], Awaitable[Any]], object_id: int
+    ) -> Union[Any, discord.NotFound]:
+        try:
+            return await fetch(object_id)
+        except discord.NotFound as exc:
+            return exc
 
     get_embed_colour = get_embed_color
 
@@ -1423,8 +1638,13 @@ class RedBase(
         """
         This should only be run once, prior to connecting to discord.
         """
+        if cli_flags.loop_lag_threshold:
+            # only started once Red is ready, as loading packages blocks the loop by design
+            self._loop_monitor = LoopLagMonitor(self, threshold=cli_flags.loop_lag_threshold)
+
         await self._maybe_update_config()
         self.description = await self._config.description()
+        _startup_profiler.mark("Config migrations")
 
         init_global_checks(self)
         init_events(self, cli_flags)
@@ -1446,6 +1666,7 @@ class RedBase(
 
         await modlog._init(self)
         await bank._init(self)
+        _startup_profiler.mark("Core initialization")
 
         packages = []
 
@@ -1513,34 +1734,118 @@ class RedBase(
             else:
                 packages.insert(0, "permissions")
 
-            to_remove = []
             log.info("Loading packages...")
-            for package in packages:
-                try:
-                    spec = await self._cog_mgr.find_cog(package)
-                    if spec is None:
-                        log.error(
-                            "Failed to load package %s (package was not found in any cog path)",
-                            package,
-                        )
-                        await self.remove_loaded_package(package)
-                        to_remove.append(package)
-                        continue
-                    await asyncio.wait_for(self.load_extension(spec), 30)
-                except asyncio.TimeoutError:
-                    log.exception("Failed to load package %s (timeout)", package)
-                    to_remove.append(package)
-                except Exception as e:
-                    log.exception("Failed to load package %s", package, exc_info=e)
-                    await self.remove_loaded_package(package)
-                    to_remove.append(package)
+            if cli_flags.parallel_cog_loading:
+                to_remove = await self._load_packages_concurrently(
+                    packages, cli_flags.parallel_cog_loading
+                )
+            else:
+                to_remove = await self._load_packages_sequentially(packages)
             for package in to_remove:
                 packages.remove(package)
             if packages:
                 log.info("Loaded packages: " + ", ".join(packages))
+        _startup_profiler.mark("Loading packages")
 
         if self.rpc_enabled:
             await self.rpc.initialize(self.rpc_port)
+            _startup_profiler.mark("RPC initialization")
+
+    async def _load_packages_sequentially(self, packages: List[str]) -> List[str]:
+        to_remove = []
+        for package in packages:
+            try:
+                spec = await self._cog_mgr.find_cog(package)
+                if spec is None:
+                    log.error(
+                        "Failed to load package %s (package was not found in any cog path)",
+                        package,
+                    )
+                    await self.remove_loaded_package(package)
+                    to_remove.append(package)
+                    continue
+                start = time.perf_counter()
+                try:
+                    await asyncio.wait_for(self.load_extension(spec), 30)
+                finally:
+                    self._package_load_times[package] = time.perf_counter() - start
+            except asyncio.TimeoutError:
+                log.exception("Failed to load package %s (timeout)", package)
+                to_remove.append(package)
+            except Exception as e:
+                log.exception("Failed to load package %s", package, exc_info=e)
+                await self.remove_loaded_package(package)
+                to_remove.append(package)
+        return to_remove
+
+    async def _load_packages_concurrently(self, packages: List[str], limit: int) -> List[str]:
+        """
+        Loads packages concurrently with at most ``limit`` of them loading at the same time.
+
+        Permissions (if present) are loaded before everything else.
+        Packages are loaded after the packages listed in the ``required_cogs``
+        and ``load_after`` keys of their info.json file, as long as those are being loaded too.
+        """
+        to_remove = []
+        specs: Dict[str, ModuleSpec] = {}
+        for package in packages:
+            try:
+                spec = await self._cog_mgr.find_cog(package)
+            except Exception as e:
+                log.exception("Failed to load package %s", package, exc_info=e)
+                spec = None
+            else:
+                if spec is None:
+                    log.error(
+                        "Failed to load package %s (package was not found in any cog path)",
+                        package,
+                    )
+            if spec is None:
+                await self.remove_loaded_package(package)
+                to_remove.append(package)
+            else:
+                specs[package] = spec
+
+        dependencies = _resolve_load_order(
+            {package: _get_load_dependencies(spec) for package, spec in specs.items()}
+        )
+        loaded = {package: asyncio.Event() for package in specs}
+        semaphore = asyncio.Semaphore(limit)
+
+        async def load(package: str, spec: ModuleSpec) -> Optional[Exception]:
+            try:
+                for dependency in dependencies[package]:
+                    await loaded[dependency].wait()
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        await asyncio.wait_for(self.load_extension(spec), 30)
+                    finally:
+                        self._package_load_times[package] = time.perf_counter() - start
+            except Exception as e:
+                return e
+            finally:
+                loaded[package].set()
+            return None
+
+        results = {}
+        if "permissions" in specs:
+            # Load permissions first, for security reasons
+            results["permissions"] = await load("permissions", specs.pop("permissions"))
+        results.update(
+            zip(specs, await asyncio.gather(*(load(p, spec) for p, spec in specs.items())))
+        )
+
+        for package, exc in results.items():
+            if exc is None:
+                continue
+            if isinstance(exc, asyncio.TimeoutError):
+                log.error("Failed to load package %s (timeout)", package, exc_info=exc)
+            else:
+                log.error("Failed to load package %s", package, exc_info=exc)
+                await self.remove_loaded_package(package)
+            to_remove.append(package)
+        return to_remove
 
     async def start(self, *args, **kwargs):
         """
@@ -1588,31 +1893,9 @@ class RedBase(
             :code:`True` if an embed is requested
         """
 
-        async def get_command_setting(guild_id: int) -> Optional[bool]:
-            if command is None:
-                return None
-            scope = self._config.custom(COMMAND_SCOPE, command.qualified_name, guild_id)
-            return await scope.embeds()
-
-        if isinstance(channel, discord.abc.PrivateChannel):
-            if (user_setting := await self._config.user(user).embeds()) is not None:
-                return user_setting
-        else:
-            if (channel_setting := await self._config.channel(channel).embeds()) is not None:
-                return channel_setting
-
-            if (command_setting := await get_command_setting(channel.guild.id)) is not None:
-                return command_setting
-
-            if (guild_setting := await self._config.guild(channel.guild).embeds()) is not None:
-                return guild_setting
-
-        # XXX: maybe this should be checked before guild setting?
-        if (global_command_setting := await get_command_setting(0)) is not None:
-            return global_command_setting
-
-        global_setting = await self._config.embeds()
-        return global_setting
+        return await self._guild_settings.embed_requested(
+            channel, user, command.qualified_name if command is not None else None
+        )
 
     async def is_owner(self, user: Union[discord.User, discord.Member]) -> bool:
         """
@@ -1653,35 +1936,24 @@ class RedBase(
 
     async def is_admin(self, member: discord.Member) -> bool:
         """Checks if a member is an admin of their guild."""
-        try:
-            member_snowflakes = member._roles  # DEP-WARN
-            for snowflake in await self._config.guild(member.guild).admin_role():
-                if member_snowflakes.has(snowflake):  # Dep-WARN
-                    return True
-        except AttributeError:  # someone passed a webhook to this
-            pass
-        return False
+        guild = getattr(member, "guild", None)
+        if guild is None:  # someone passed a webhook to this
+            return False
+        return (await self._guild_settings.get_guild(guild.id)).is_admin(member)
 
     async def is_mod(self, member: discord.Member) -> bool:
         """Checks if a member is a mod or admin of their guild."""
-        try:
-            member_snowflakes = member._roles  # DEP-WARN
-            for snowflake in await self._config.guild(member.guild).admin_role():
-                if member_snowflakes.has(snowflake):  # DEP-WARN
-                    return True
-            for snowflake in await self._config.guild(member.guild).mod_role():
-                if member_snowflakes.has(snowflake):  # DEP-WARN
-                    return True
-        except AttributeError:  # someone passed a webhook to this
-            pass
-        return False
+        guild = getattr(member, "guild", None)
+        if guild is None:  # someone passed a webhook to this
+            return False
+        return (await self._guild_settings.get_guild(guild.id)).is_mod(member)
 
     async def get_admin_roles(self, guild: discord.Guild) -> List[discord.Role]:
         """
         Gets the admin roles for a guild.
         """
         ret: List[discord.Role] = []
-        for snowflake in await self._config.guild(guild).admin_role():
+        for snowflake in await self.get_admin_role_ids(guild.id):
             r = guild.get_role(snowflake)
             if r:
                 ret.append(r)
@@ -1692,7 +1964,7 @@ class RedBase(
         Gets the mod roles for a guild.
         """
         ret: List[discord.Role] = []
-        for snowflake in await self._config.guild(guild).mod_role():
+        for snowflake in await self.get_mod_role_ids(guild.id):
             r = guild.get_role(snowflake)
             if r:
                 ret.append(r)
@@ -1702,13 +1974,13 @@ class RedBase(
         """
         Gets the admin role ids for a guild id.
         """
-        return await self._config.guild(discord.Object(id=guild_id)).admin_role()
+        return list((await self._guild_settings.get_guild(guild_id)).admin_role_ids)
 
     async def get_mod_role_ids(self, guild_id: int) -> List[int]:
         """
         Gets the mod role ids for a guild id.
         """
-        return await self._config.guild(discord.Object(id=guild_id)).mod_role()
+        return list((await self._guild_settings.get_guild(guild_id)).mod_role_ids)
 
     @overload
     async def get_shared_api_tokens(self, service_name: str = ...) -> Dict[str, str]:
@@ -1816,6 +2088,38 @@ class RedBase(
     async def get_context(self, message, *, cls=commands.Context):
         return await super().get_context(message, cls=cls)
 
+    async def invoke(self, ctx: commands.Context) -> None:
+        """
+        Same as base method, but records how long the invocation took
+        (along with the time spent in checks and conversion)
+        in the bot's command stats, and sets the log context for the invocation.
+        """
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        ctx._timing = timing = InvocationTiming()
+        log_context_token = log_context.set(
+            {
+                "shard_id": ctx.guild.shard_id if ctx.guild is not None else None,
+                "guild_id": ctx.guild.id if ctx.guild is not None else None,
+                "cog": ctx.command.cog_name,
+                "command": ctx.command.qualified_name,
+            }
+        )
+        try:
+            await super().invoke(ctx)
+        finally:
+            log_context.reset(log_context_token)
+            self._command_stats.record(ctx, timing)
+
+    async def can_run(self, ctx: commands.Context, *, call_once: bool = False) -> bool:
+        start = time.perf_counter()
+        try:
+            return await super().can_run(ctx, call_once=call_once)
+        finally:
+            # ``call_once`` is only set when checking the global checks in `invoke()`
+            if call_once and ctx._timing is not None:
+                ctx._timing.checks += time.perf_counter() - start
+
     async def process_commands(self, message: discord.Message):
         """
         Same as base method, but dispatches an additional event for cogs
@@ -1958,9 +2262,7 @@ class RedBase(
             else:
                 ids_to_check.append(author.id)
 
-        immune_ids = await self._config.guild(guild).autoimmune_ids()
-
-        return any(i in immune_ids for i in ids_to_check)
+        return (await self._guild_settings.get_guild(guild.id)).is_automod_immune(ids_to_check)
 
     @staticmethod
     async def send_filtered(
@@ -2047,6 +2349,7 @@ class RedBase(
             raise RuntimeError("Commands must be instances of `redbot.core.commands.Command`")
 
         super().add_command(command)
+        self._command_index.add(command)
 
         permissions_not_loaded = "permissions" not in self.extensions
         self.dispatch("command_add", command)
@@ -2062,6 +2365,9 @@ class RedBase(
         command = super().remove_command(name)
         if command is None:
             return None
+        if name not in command.aliases:
+            # when only an alias gets removed, the command itself is still registered
+            self._command_index.remove(command)
         command.requires.reset()
         if isinstance(command, commands.Group):
             for subcommand in command.walk_commands():
@@ -2118,6 +2424,43 @@ class RedBase(
         """
         self._permissions_hooks.remove(hook)
 
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[Any]]) -> None:
+        """Add a shutdown hook.
+
+        Shutdown hooks are coroutine functions which are awaited when the bot
+        is closing, before the Config driver is torn down. This is the place
+        for writing out data that is buffered in memory.
+
+        Cogs adding a hook should remove it in ``cog_unload``.
+
+        Parameters
+        ----------
+        hook
+            A coroutine function taking no arguments.
+
+        """
+        self._shutdown_hooks.append(hook)
+
+    def remove_shutdown_hook(self, hook: Callable[[], Awaitable[Any]]) -> None:
+        """Remove a shutdown hook.
+
+        Parameters are the same as those in `add_shutdown_hook`.
+
+        Raises
+        ------
+        ValueError
+            If the shutdown hook has not been added.
+
+        """
+        self._shutdown_hooks.remove(hook)
+
+    async def _run_shutdown_hooks(self) -> None:
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception:
+                log.exception("Error in shutdown hook %r", hook)
+
     async def verify_permissions_hooks(self, ctx: commands.Context) -> Optional[bool]:
         """Run permissions hooks.
 
@@ -2232,6 +2575,9 @@ class RedBase(
 
     async def close(self):
         """Logs out of Discord and closes all connections."""
+        if self._loop_monitor is not None:
+            self._loop_monitor.stop()
+        await self._run_shutdown_hooks()
         await super().close()
         await drivers.get_driver_class().teardown()
         try:
@@ -2270,6 +2616,8 @@ class RedBase(
             return
 
         await self._config.user_from_id(user_id).clear()
+        self._guild_settings.invalidate_user(user_id)
+        self._fetched_users.invalidate(user_id)
         all_guilds = await self._config.all_guilds()
 
         async for guild_id, guild_data in AsyncIter(all_guilds.items(), steps=100):
@@ -2279,6 +2627,7 @@ class RedBase(
                     # up the vals in all guilds first
                     with contextlib.suppress(ValueError):
                         ids.remove(user_id)
+                self._guild_settings.invalidate_guild(int(guild_id))
 
         await self._whiteblacklist_cache.discord_deleted_user(user_id)
 
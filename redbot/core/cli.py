@@ -2,7 +2,7 @@ import argparse
 import asyncio
 import logging
 import sys
-from typing import Optional
+from typing import Optional, Tuple
 
 import discord
 from discord import __version__ as discord_version
@@ -88,6 +88,33 @@ def non_negative_int(arg: str) -> int:
     return x
 
 
+def non_negative_float(arg: str) -> float:
+    try:
+        x = float(arg)
+    except ValueError:
+        raise argparse.ArgumentTypeError("The argument has to be a number.")
+    if x < 0:
+        raise argparse.ArgumentTypeError("The argument has to be a non-negative number.")
+    return x
+
+
+def _logger_rule(value_type):
+    def converter(arg: str) -> Tuple[str, float]:
+        logger_name, sep, value = arg.rpartition("=")
+        if not (sep and logger_name):
+            raise argparse.ArgumentTypeError("The argument has to be in the form LOGGER=VALUE.")
+        return logger_name, value_type(value)
+
+    return converter
+
+
+def sample_rate_float(arg: str) -> float:
+    x = non_negative_float(arg)
+    if x > 1:
+        raise argparse.ArgumentTypeError("The sample rate has to be between 0 and 1.")
+    return x
+
+
 def message_cache_size_int(arg: str) -> int:
     x = non_negative_int(arg)
     if x < 1000:
@@ -244,6 +271,35 @@ def parse_cli_flags(args):
     parser.add_argument(
         "--no-message-cache", action="store_true", help="Disable the internal message cache."
     )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="Write a breakdown of the time spent importing modules and in each startup phase"
+        " to the given file once the bot is ready. Defaults to `startup_profile.txt`"
+        " in the logs folder of the instance.",
+    )
+    parser.add_argument(
+        "--parallel-cog-loading",
+        type=non_negative_int,
+        default=0,
+        metavar="LIMIT",
+        help="Load cogs concurrently at startup, with at most LIMIT cogs loading at the same time."
+        " Permissions are always loaded first and cogs are loaded after the cogs listed"
+        " in the `required_cogs` and `load_after` keys of their info.json file."
+        " Disabled (0) by default.",
+    )
+    parser.add_argument(
+        "--loop-lag-threshold",
+        type=non_negative_float,
+        default=2.0,
+        help="Set the event loop lag (in seconds) above which the loop is considered blocked."
+        " When it is, the stack of the blocking code is logged and sent to the owners."
+        " The watchdog starts once the bot is ready."
+        " Set to 0 to disable the event loop watchdog.",
+    )
     parser.add_argument(
         "--disable-intent",
         action="append",
@@ -284,6 +340,51 @@ def parse_cli_flags(args):
         help="Enable showing local variables in tracebacks generated by Rich.\n"
         "Useful for development.",
     )
+    parser.add_argument(
+        "--async-logging",
+        action="store_true",
+        help="Format and write logs in batches from a background thread"
+        " instead of doing it on the event loop.\n"
+        "Log records are dropped rather than slowing the bot down"
+        " when the thread can't keep up with them.",
+    )
+    parser.add_argument(
+        "--logging-queue-size",
+        type=non_negative_int,
+        default=10_000,
+        help="The maximum amount of log records waiting to be written"
+        " when using --async-logging. Set to 0 for no limit.",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=("text", "json"),
+        default="text",
+        help="The format of the log files. With json, every line is a JSON object"
+        " which includes the shard, guild, cog and command the record was logged for,"
+        " when available.",
+    )
+    parser.add_argument(
+        "--log-rate-limit",
+        nargs="+",
+        type=_logger_rule(non_negative_float),
+        default=[],
+        dest="log_rate_limits",
+        metavar="LOGGER=RATE",
+        help="Limit the records below the WARNING level from the given loggers"
+        " (and their children) to RATE records per second.\n"
+        "Example: --log-rate-limit red.audio=20 red.streams=5",
+    )
+    parser.add_argument(
+        "--log-sample-rate",
+        nargs="+",
+        type=_logger_rule(sample_rate_float),
+        default=[],
+        dest="log_sample_rates",
+        metavar="LOGGER=FRACTION",
+        help="Only keep the given fraction of records below the WARNING level"
+        " from the given loggers (and their children).\n"
+        "Example: --log-sample-rate red.drivers=0.1",
+    )
     parser.add_argument(
         "--enable-sudo", action="store_true", help="Enable the Super User permission mechanics."
     )
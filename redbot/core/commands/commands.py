@@ -8,6 +8,7 @@ from __future__ import annotations
 import inspect
 import io
 import re
+import time
 import functools
 import weakref
 from typing import (
@@ -482,19 +483,30 @@ class Command(CogCommandMixin, DPYCommand):
         if not self.enabled:
             raise DisabledCommand(f"{self.name} command is disabled")
 
-        if not await self.can_run(ctx, change_permission_state=True):
+        start = time.perf_counter()
+        try:
+            can_run = await self.can_run(ctx, change_permission_state=True)
+        finally:
+            if ctx._timing is not None:
+                ctx._timing.checks += time.perf_counter() - start
+        if not can_run:
             raise CheckFailure(f"The check functions for command {self.qualified_name} failed.")
 
+        # `antispam_check()` only counts invocations, not every evaluation of its check
+        antispam_hook = getattr(self.callback, "__antispam_hook__", None)
+        if antispam_hook is not None:
+            antispam_hook(ctx)
+
         if self._max_concurrency is not None:
             await self._max_concurrency.acquire(ctx)
 
         try:
             if self.cooldown_after_parsing:
-                await self._parse_arguments(ctx)
+                await self._timed_parse_arguments(ctx)
                 self._prepare_cooldowns(ctx)
             else:
                 self._prepare_cooldowns(ctx)
-                await self._parse_arguments(ctx)
+                await self._timed_parse_arguments(ctx)
 
             await self.call_before_hooks(ctx)
         except:
@@ -502,6 +514,14 @@ class Command(CogCommandMixin, DPYCommand):
                 await self._max_concurrency.release(ctx)
             raise
 
+    async def _timed_parse_arguments(self, ctx: "Context") -> None:
+        start = time.perf_counter()
+        try:
+            await self._parse_arguments(ctx)
+        finally:
+            if ctx._timing is not None:
+                ctx._timing.conversion += time.perf_counter() - start
+
     async def do_conversion(
         self, ctx: "Context", converter, argument: str, param: inspect.Parameter
     ):
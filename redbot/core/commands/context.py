@@ -15,7 +15,9 @@ from ..utils import common_filters
 
 if TYPE_CHECKING:
     from .commands import Command
+    from .._command_stats import InvocationTiming
     from ..bot import Red
+    from ..utils.antispam import AntiSpam
 
 TICK = "\N{WHITE HEAVY CHECK MARK}"
 
@@ -45,6 +47,9 @@ class Context(DPYContext):
         it may still be appropriate not to use this setting.
     permission_state: PermState
         The permission state the current context is in.
+    antispam: Optional[AntiSpam]
+        The `AntiSpam` of the invoker when the command
+        is decorated with `antispam_check()`, `None` otherwise.
     """
 
     command: "Command"
@@ -55,6 +60,8 @@ class Context(DPYContext):
         self.assume_yes = attrs.pop("assume_yes", False)
         super().__init__(**attrs)
         self.permission_state: PermState = PermState.NORMAL
+        self._timing: Optional[InvocationTiming] = None
+        self.antispam: Optional[AntiSpam] = None
 
     async def send(self, content=None, **kwargs):
         """Sends a message to the destination with the content given.
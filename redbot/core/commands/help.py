@@ -29,6 +29,7 @@
 
 import abc
 import asyncio
+import functools
 from collections import namedtuple
 from dataclasses import dataclass, asdict as dc_asdict
 from typing import Union, List, AsyncIterator, Iterable, cast
@@ -712,9 +713,7 @@ class RedHelpFormatter(HelpFormatterABC):
         fuzzy_commands = await fuzzy_command_search(
             ctx,
             help_for,
-            commands=self.help_filter_func(
-                ctx, ctx.bot.walk_commands(), help_settings=help_settings
-            ),
+            filter_func=functools.partial(self.help_filter_func, ctx, help_settings=help_settings),
             min_score=75,
         )
         use_embeds = await ctx.embed_requested()
@@ -133,15 +133,12 @@ class PrivilegeLevel(enum.IntEnum):
 
         # The following is simply an optimised way to check if the user has the
         # admin or mod role.
-        guild_settings = ctx.bot._config.guild(ctx.guild)
-
-        member_snowflakes = ctx.author._roles  # DEP-WARN
-        for snowflake in await guild_settings.admin_role():
-            if member_snowflakes.has(snowflake):  # DEP-WARN
-                return cls.ADMIN
-        for snowflake in await guild_settings.mod_role():
-            if member_snowflakes.has(snowflake):  # DEP-WARN
-                return cls.MOD
+        guild_settings = await ctx.bot._guild_settings.get_guild(ctx.guild.id)
+
+        if guild_settings.is_admin(ctx.author):
+            return cls.ADMIN
+        if guild_settings.is_mod(ctx.author):
+            return cls.MOD
 
         return cls.NONE
 
@@ -9,27 +9,36 @@ import io
 import random
 from copy import copy
 
-import markdown
 import os
 import re
 import sys
 import platform
-import psutil
 import getpass
-import pip
 import traceback
 from pathlib import Path
 from redbot.core import data_manager
 from redbot.core.utils.menus import menu, DEFAULT_CONTROLS
 from redbot.core.commands import GuildConverter
 from string import ascii_letters, digits
-from typing import TYPE_CHECKING, Union, Tuple, List, Optional, Iterable, Sequence, Dict, Set
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Union,
+    Tuple,
+    List,
+    Optional,
+    Iterable,
+    Sequence,
+    Dict,
+    Set,
+)
 
 import aiohttp
 import discord
 from babel import Locale as BabelLocale, UnknownLocaleError
 
 from redbot import json
+from redbot.logging import get_queue_stats as get_logging_queue_stats
 from redbot.core import modlog, bank, Config
 from redbot.core.data_manager import storage_type
 
@@ -41,9 +50,9 @@ from . import (
     errors,
     i18n,
 )
-from ._diagnoser import IssueDiagnoser
 from .utils import AsyncIter
 from .utils._internal_utils import fetch_latest_red_version_info, is_sudo_enabled, timed_unsu
+from .utils.caching import get_cache_stats
 from .utils.predicates import MessagePredicate
 from .utils.chat_formatting import (
     box,
@@ -118,6 +127,8 @@ class CoreLogic:
         self.bot.register_rpc_handler(self._prefixes)
         self.bot.register_rpc_handler(self._version_info)
         self.bot.register_rpc_handler(self._invite_url)
+        self.bot.register_rpc_handler(self._command_stats)
+        self.bot.register_rpc_handler(self._cache_stats)
 
     async def _load(
         self, pkg_names: Iterable[str]
@@ -394,6 +405,30 @@ class CoreLogic:
         permissions = discord.Permissions(perms_int)
         return discord.utils.oauth_url(app_info.id, permissions, scopes=scopes)
 
+    async def _command_stats(self) -> Dict[str, Any]:
+        """
+        Latency statistics of command invocations.
+
+        Returns
+        -------
+        dict
+            `commands` and `cogs` keys containing latency percentiles (in seconds)
+            and a `slow_log` key containing the recent slow invocations.
+        """
+        return self.bot._command_stats.to_dict()
+
+    async def _cache_stats(self) -> List[Dict[str, Any]]:
+        """
+        Hit and miss statistics of the named caches.
+
+        Returns
+        -------
+        list
+            Stats of each cache created with `redbot.core.utils.caching.async_memoize()`
+            or `redbot.core.utils.caching.AsyncCache` with a name.
+        """
+        return get_cache_stats()
+
     @staticmethod
     async def _can_get_invite_url(ctx):
         is_owner = await ctx.bot.is_owner(ctx.author)
@@ -666,6 +701,8 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             for ext in no_statements:
                 parts.append(f"\n - {entity_transformer(ext)}")
 
+        import markdown
+
         generated = markdown.markdown("\n".join(parts), output_format="html")
 
         html = "\n".join((PRETTY_HTML_HEAD, generated, HTML_CLOSING))
@@ -1211,9 +1248,11 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         current = await self.bot._config.embeds()
         if current:
             await self.bot._config.embeds.set(False)
+            self.bot._guild_settings.invalidate_global()
             await ctx.send(_("Embeds are now disabled by default."))
         else:
             await self.bot._config.embeds.clear()
+            self.bot._guild_settings.invalidate_global()
             await ctx.send(_("Embeds are now enabled by default."))
 
     @embedset.command(name="server", aliases=["guild"])
@@ -1239,10 +1278,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         """
         if enabled is None:
             await self.bot._config.guild(ctx.guild).embeds.clear()
+            self.bot._guild_settings.invalidate_guild(ctx.guild.id)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
         await self.bot._config.guild(ctx.guild).embeds.set(enabled)
+        self.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.send(
             _("Embeds are now enabled for this guild.")
             if enabled
@@ -1317,10 +1358,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
 
         if enabled is None:
             await self.bot._config.custom("COMMAND", command_name, 0).embeds.clear()
+            self.bot._guild_settings.invalidate_command_embeds()
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
         await self.bot._config.custom("COMMAND", command_name, 0).embeds.set(enabled)
+        self.bot._guild_settings.invalidate_command_embeds()
         if enabled:
             await ctx.send(
                 _("Embeds are now enabled for {command_name} command.").format(
@@ -1362,10 +1405,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
 
         if enabled is None:
             await self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds.clear()
+            self.bot._guild_settings.invalidate_command_embeds()
             await ctx.send(_("Embeds will now fall back to the server setting."))
             return
 
         await self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds.set(enabled)
+        self.bot._guild_settings.invalidate_command_embeds()
         if enabled:
             await ctx.send(
                 _("Embeds are now enabled for {command_name} command.").format(
@@ -1402,10 +1447,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         """
         if enabled is None:
             await self.bot._config.channel(ctx.channel).embeds.clear()
+            self.bot._guild_settings.invalidate_channel(ctx.channel.id)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
         await self.bot._config.channel(ctx.channel).embeds.set(enabled)
+        self.bot._guild_settings.invalidate_channel(ctx.channel.id)
         await ctx.send(
             _("Embeds are now {} for this channel.").format(
                 _("enabled") if enabled else _("disabled")
@@ -1433,10 +1480,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         """
         if enabled is None:
             await self.bot._config.user(ctx.author).embeds.clear()
+            self.bot._guild_settings.invalidate_user(ctx.author.id)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
         await self.bot._config.user(ctx.author).embeds.set(enabled)
+        self.bot._guild_settings.invalidate_user(ctx.author.id)
         await ctx.send(
             _("Embeds are now enabled for you in DMs.")
             if enabled
@@ -2161,6 +2210,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already an admin role."))
             roles.append(role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.send(_("That role is now considered an admin role."))
 
     @_set.command()
@@ -2188,6 +2238,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already a mod role."))
             roles.append(role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.send(_("That role is now considered a mod role."))
 
     @_set.command(aliases=["remadmindrole", "deladminrole", "deleteadminrole"])
@@ -2208,6 +2259,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not an admin role to begin with."))
             roles.remove(role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.send(_("That role is no longer considered an admin role."))
 
     @_set.command(aliases=["remmodrole", "delmodrole", "deletemodrole"])
@@ -2228,6 +2280,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not a mod role to begin with."))
             roles.remove(role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.send(_("That role is no longer considered a mod role."))
 
     @_set.command(aliases=["usebotcolor"])
@@ -3573,11 +3626,121 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         msg = _("Data path: {path}").format(path=data_dir)
         await ctx.send(box(msg))
 
+    @commands.command(hidden=True)
+    @checks.is_owner()
+    async def commandstats(self, ctx: commands.Context, *, command: str = None):
+        """Shows latency statistics of command invocations.
+
+        Without a command, this shows the commands with the highest 95th percentile latency
+        and the most recent slow invocations.
+
+        **Examples:**
+            - `[p]commandstats`
+            - `[p]commandstats cleanup messages`
+
+        **Arguments:**
+            - `[command]` - The command to show detailed latency statistics for.
+        """
+
+        def fmt(seconds: float) -> str:
+            return _("{time:.1f}ms").format(time=seconds * 1000)
+
+        stats = self.bot._command_stats
+        if command is not None:
+            data = stats.get_command(command)
+            if data is None:
+                await ctx.send(_("No invocations of that command have been recorded."))
+                return
+            lines = []
+            for name, label in (
+                ("total", _("Total")),
+                ("checks", _("Checks")),
+                ("conversion", _("Conversion")),
+            ):
+                hist = data[name]
+                lines.append(
+                    _("{label}: p50 {p50}, p95 {p95}, p99 {p99}, max {max}").format(
+                        label=label,
+                        p50=fmt(hist["p50"]),
+                        p95=fmt(hist["p95"]),
+                        p99=fmt(hist["p99"]),
+                        max=fmt(hist["max"]),
+                    )
+                )
+            lines.append(
+                _("Invocations: {count}, errors: {errors}").format(
+                    count=humanize_number(data["total"]["count"]),
+                    errors=humanize_number(data["errors"]),
+                )
+            )
+            await ctx.send(box("\n".join(lines)))
+            return
+
+        slowest = stats.slowest_commands()
+        if not slowest:
+            await ctx.send(_("No command invocations have been recorded yet."))
+            return
+        msg = _("Slowest commands (by p95):") + "\n"
+        for data in slowest:
+            msg += _("{command}: p50 {p50}, p95 {p95}, p99 {p99} ({count} invocations)").format(
+                command=data["command"],
+                p50=fmt(data["p50"]),
+                p95=fmt(data["p95"]),
+                p99=fmt(data["p99"]),
+                count=humanize_number(data["count"]),
+            ) + "\n"
+        slow_log = stats.slow_log[:10]
+        if slow_log:
+            msg += "\n" + _("Recent slow invocations:") + "\n"
+            for entry in slow_log:
+                msg += _(
+                    "{command}({arguments}): {total} (checks {checks}, conversion {conversion})"
+                ).format(
+                    command=entry["command"],
+                    arguments=", ".join(entry["arguments"]),
+                    total=fmt(entry["total"]),
+                    checks=fmt(entry["checks"]),
+                    conversion=fmt(entry["conversion"]),
+                ) + "\n"
+        for page in pagify(msg):
+            await ctx.send(box(page))
+
+    @commands.command(hidden=True)
+    @checks.is_owner()
+    async def cachestats(self, ctx: commands.Context):
+        """Shows hit and miss statistics of the caches used by the bot and its cogs."""
+        stats = get_cache_stats()
+        if not stats:
+            await ctx.send(_("No caches have been created yet."))
+            return
+        lines = []
+        for data in stats:
+            lines.append(
+                _(
+                    "{name}: {size} entries, {hit_ratio:.1%} hits"
+                    " ({hits} hits, {misses} misses, {coalesced} coalesced, {evictions} evicted)"
+                ).format(
+                    name=data["name"],
+                    size=humanize_number(data["size"]),
+                    hit_ratio=data["hit_ratio"],
+                    hits=humanize_number(data["hits"]),
+                    misses=humanize_number(data["misses"]),
+                    coalesced=humanize_number(data["coalesced"]),
+                    evictions=humanize_number(data["evictions"]),
+                )
+            )
+        msg = "\n".join(lines)
+        for page in pagify(msg):
+            await ctx.send(box(page))
+
     @commands.command(hidden=True)
     @checks.is_owner()
     async def debuginfo(self, ctx: commands.Context):
         """Shows debug information useful for debugging."""
 
+        import pip
+        import psutil
+
         if sys.platform == "linux":
             import distro  # pylint: disable=import-error
 
@@ -3660,6 +3823,12 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             f"Data path: {data_path}\n"
             f"Metadata file: {config_file}"
         )
+        logging_queue_stats = get_logging_queue_stats()
+        if logging_queue_stats is not None:
+            resp_red_vars += (
+                f"\nLogging queue: {logging_queue_stats['backlog']} waiting,"
+                f" {logging_queue_stats['dropped']} dropped"
+            )
 
         response = (
             box(resp_intro, lang="md"),
@@ -3735,6 +3904,8 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
                 ).format(channel=channel.mention)
             )
             return
+        from ._diagnoser import IssueDiagnoser
+
         issue_diagnoser = IssueDiagnoser(self.bot, ctx, channel, member, command)
         await ctx.send(await issue_diagnoser.diagnose())
 
@@ -4578,6 +4749,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if user_or_role.id in ai_ids:
                 return await ctx.send(_("Already added."))
             ai_ids.append(user_or_role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.tick()
 
     @autoimmune_group.command(name="remove")
@@ -4598,6 +4770,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if user_or_role.id not in ai_ids:
                 return await ctx.send(_("Not in list."))
             ai_ids.remove(user_or_role.id)
+        ctx.bot._guild_settings.invalidate_guild(ctx.guild.id)
         await ctx.tick()
 
     @autoimmune_group.command(name="isimmune")
@@ -1,16 +1,16 @@
 import asyncio
 import contextlib
+import functools
 import platform
 import sys
 import codecs
 import logging
 import traceback
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import aiohttp
 import discord
-import pkg_resources
-from pkg_resources import DistributionNotFound
 from redbot.core import data_manager
 
 from redbot.core.commands import RedHelpFormatter, HelpSettings
@@ -21,7 +21,7 @@ from redbot.core.i18n import (
     set_contextual_locales_from_guild,
 )
 from .utils import AsyncIter
-from .. import __version__ as red_version, version_info as red_version_info
+from .. import __version__ as red_version, version_info as red_version_info, _startup_profiler
 from . import commands
 from .config import get_latest_confs
 from .utils._internal_utils import (
@@ -70,6 +70,7 @@ def init_events(bot, cli_flags):
             return
 
         bot._uptime = datetime.utcnow()
+        _startup_profiler.mark("Connecting to Discord")
 
         guilds = len(bot.guilds)
         users = len(set([m for m in bot.get_all_members()]))
@@ -90,7 +91,6 @@ def init_events(bot, cli_flags):
 
         prefixes = cli_flags.prefix or (await bot._config.prefix())
         lang = await bot._config.locale()
-        red_pkg = pkg_resources.get_distribution("Red-DiscordBot")
         dpy_version = discord.__version__
 
         table_general_info = Table(show_edge=False, show_header=False, box=box.MINIMAL)
@@ -134,6 +134,9 @@ def init_events(bot, cli_flags):
                     "needs to be done during the update.**"
                 ).format(docs="https://docs.discord.red/en/stable/update_red.html")
                 if expected_version(current_python, py_version_req):
+                    import pkg_resources
+
+                    red_pkg = pkg_resources.get_distribution("Red-DiscordBot")
                     installed_extras = []
                     for extra, reqs in red_pkg._dep_map.items():
                         if extra is None or extra in {"dev", "all"}:
@@ -210,6 +213,15 @@ def init_events(bot, cli_flags):
         rich_console.print(
             "Loaded {} cogs with {} commands".format(len(bot.cogs), len(bot.commands))
         )
+        if bot._package_load_times:
+            table_load_times = Table("Package", "Load time", show_edge=False, box=box.MINIMAL)
+            slowest = sorted(bot._package_load_times.items(), key=lambda i: i[1], reverse=True)
+            for package, load_time in slowest[:10]:
+                table_load_times.add_row(package, f"{load_time * 1000:.0f}ms")
+            table_load_times.add_row(
+                "Total", f"{sum(bot._package_load_times.values()) * 1000:.0f}ms"
+            )
+            rich_console.print(Panel(table_load_times, title="Slowest packages to load"))
 
         if invite_url:
             rich_console.print(f"\nInvite URL: {Text(invite_url, style=f'link {invite_url}')}")
@@ -227,6 +239,18 @@ def init_events(bot, cli_flags):
 
         bot._color = discord.Colour(await bot._config.color())
         bot._red_ready.set()
+        if bot._loop_monitor is not None:
+            bot._loop_monitor.start()
+        _startup_profiler.mark("Handling the ready event")
+        profiler = _startup_profiler.get_profiler()
+        if profiler is not None and cli_flags.profile_startup is not None:
+            _startup_profiler.uninstall()
+            report_path = Path(
+                cli_flags.profile_startup
+                or data_manager.core_data_path() / "logs" / "startup_profile.txt"
+            )
+            profiler.write_report(report_path)
+            log.info("Startup profile has been written to %s", report_path)
         if outdated_red_message:
             await send_to_owners_with_prefix_replaced(bot, outdated_red_message)
         # if should_create_fork_task:
@@ -328,8 +352,8 @@ def init_events(bot, cli_flags):
             help_settings = await HelpSettings.from_context(ctx)
             fuzzy_commands = await fuzzy_command_search(
                 ctx,
-                commands=RedHelpFormatter.help_filter_func(
-                    ctx, bot.walk_commands(), help_settings=help_settings
+                filter_func=functools.partial(
+                    RedHelpFormatter.help_filter_func, ctx, help_settings=help_settings
                 ),
             )
             if not fuzzy_commands:
@@ -476,6 +500,11 @@ def init_events(bot, cli_flags):
             if command_obj is not None:
                 command_obj.enable_in(guild)
 
+    @bot.event
+    async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+        bot.counter._inc_core_raw("Red_Core", "on_guild_channel_delete")
+        bot._guild_settings.invalidate_channel(channel.id)
+
     @bot.event
     async def on_cog_add(cog: commands.Cog):
         bot.counter._inc_core_raw("Red_Core", "on_cog_add")
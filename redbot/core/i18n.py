@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import contextlib
 import functools
+import hashlib
 import io
+import marshal
 import os
 import logging
 import discord
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Callable, TYPE_CHECKING, Union, Dict, Optional
+from typing import Callable, TYPE_CHECKING, Union, Dict, Optional, Tuple
 from contextvars import ContextVar
 
 import babel.localedata
@@ -46,20 +49,32 @@ MSGSTR = 'msgstr "'
 
 _translators = []
 
+#: The maximum amount of locales for which the translations are kept in memory.
+#: The least recently used locale is dropped when a new one has to be loaded,
+#: which is then loaded again from the compiled catalog cache if it's needed again.
+MAX_RESIDENT_LOCALES = 8
+# locale -> None, ordered from the least recently used locale
+_resident_locales: "OrderedDict[str, None]" = OrderedDict()
+_global_locale = "en-US"
+
+# Version of the compiled catalog format, bump on any change to it.
+_CATALOG_CACHE_VERSION = 1
+
 
 def get_locale() -> str:
     return str(_current_locale.get())
 
 
 def set_locale(locale: str) -> None:
-    global _current_locale
+    global _current_locale, _global_locale
     _current_locale = ContextVar("_current_locale", default=locale)
-    reload_locales()
+    _global_locale = locale
+    _mark_locale_used(locale)
 
 
 def set_contextual_locale(locale: str) -> None:
     _current_locale.set(locale)
-    reload_locales()
+    _mark_locale_used(locale)
 
 
 def get_regional_format() -> str:
@@ -78,10 +93,32 @@ def set_contextual_regional_format(regional_format: Optional[str]) -> None:
 
 
 def reload_locales() -> None:
+    # Translations are loaded lazily when they're first needed,
+    # this just makes sure that the current locale is loaded already.
     for translator in _translators:
         translator.load_translations()
 
 
+def _mark_locale_used(locale: str) -> None:
+    if locale in _resident_locales:
+        _resident_locales.move_to_end(locale)
+
+
+def _add_resident_locale(locale: str) -> None:
+    _resident_locales[locale] = None
+    _resident_locales.move_to_end(locale)
+    excess = len(_resident_locales) - MAX_RESIDENT_LOCALES
+    if excess <= 0:
+        return
+    # the global locale is used whenever a guild doesn't have its own, never unload it
+    evictable = [name for name in _resident_locales if name not in (_global_locale, locale)]
+    for evicted in evictable[:excess]:
+        del _resident_locales[evicted]
+        log.debug("Unloading the translations for the %s locale.", evicted)
+        for translator in _translators:
+            translator.translations.pop(evicted, None)
+
+
 async def get_locale_from_guild(bot: Red, guild: Optional[discord.Guild]) -> str:
     """
     Get locale set for the given guild.
@@ -140,7 +177,7 @@ async def set_contextual_locales_from_guild(bot: Red, guild: Optional[discord.Gu
     set_contextual_regional_format(regional_format)
 
 
-def _parse(translation_file: io.TextIOWrapper) -> Dict[str, str]:
+def _parse(translation_file: io.TextIOWrapper, locale: Optional[str] = None) -> Dict[str, str]:
     """
     Custom gettext parsing of translation files.
 
@@ -148,6 +185,8 @@ def _parse(translation_file: io.TextIOWrapper) -> Dict[str, str]:
     ----------
     translation_file : io.TextIOWrapper
         An open text file containing translations.
+    locale : Optional[str]
+        The locale of the translations, defaults to the current locale.
 
     Returns
     -------
@@ -160,7 +199,8 @@ def _parse(translation_file: io.TextIOWrapper) -> Dict[str, str]:
     untranslated = ""
     translated = ""
     translations = {}
-    locale = get_locale()
+    if locale is None:
+        locale = get_locale()
 
     translations[locale] = {}
 
@@ -192,7 +232,62 @@ def _parse(translation_file: io.TextIOWrapper) -> Dict[str, str]:
     return translations
 
 
+def _get_catalog_cache_path(po_path: Path) -> Optional[Path]:
+    # The compiled catalogs are stored in the data path, cog folders may not be writable.
+    from . import data_manager
+
+    try:
+        cache_dir = data_manager.core_data_path() / "i18n_cache"
+    except RuntimeError:
+        # the basic configuration isn't loaded
+        return None
+    key = hashlib.sha1(str(po_path).encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.catalog"
+
+
+def _load_catalog(po_path: Path, locale: str) -> Dict[str, str]:
+    """
+    Load the translations for the locale from the given ``.po`` file.
+
+    A compiled version of the catalog is used instead of parsing the file,
+    as long as the file hasn't been modified since the catalog was compiled.
+    An empty dict is returned when the file doesn't exist.
+    """
+    try:
+        stat = po_path.stat()
+    except OSError:
+        return {}
+    validator: Tuple[int, int, int] = (_CATALOG_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    cache_path = _get_catalog_cache_path(po_path)
+    if cache_path is not None:
+        with contextlib.suppress(OSError, EOFError, ValueError, TypeError):
+            with cache_path.open("rb") as fp:
+                cached_validator, translations = marshal.load(fp)
+            if tuple(cached_validator) == validator:
+                return translations
+
+    try:
+        with po_path.open(encoding="utf-8") as file:
+            translations = _parse(file, locale)[locale]
+    except OSError:
+        return {}
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("wb") as fp:
+                marshal.dump((validator, translations), fp)
+            os.replace(tmp_path, cache_path)
+        except OSError as exc:
+            log.debug("Couldn't save the compiled catalog for %s: %s", po_path, exc)
+    return translations
+
+
 def _unescape(string):
+    if "\\" not in string:
+        return string
     string = string.replace(r"\\", "\\")
     string = string.replace(r"\t", "\t")
     string = string.replace(r"\r", "\r")
@@ -233,12 +328,11 @@ class Translator(Callable[[str], str]):
         """
         self.cog_folder = Path(file_location).resolve().parent
         self.cog_name = name
-        self.translations = {}
+        # locale -> translations, loaded when the locale is first used
+        self.translations: Dict[str, Dict[str, str]] = {}
 
         _translators.append(self)
 
-        self.load_translations()
-
     def __call__(self, untranslated: str) -> str:
         """Translate the given string.
 
@@ -247,28 +341,28 @@ class Translator(Callable[[str], str]):
         """
         locale = get_locale()
         try:
-            return self.translations[locale][untranslated]
+            translations = self.translations[locale]
         except KeyError:
-            return untranslated
+            translations = self._load_locale(locale)
+        return translations.get(untranslated, untranslated)
 
     def load_translations(self):
         """
         Loads the current translations.
         """
         locale = get_locale()
+        if locale not in self.translations:
+            self._load_locale(locale)
 
+    def _load_locale(self, locale: str) -> Dict[str, str]:
         if locale.lower() == "en-us":
             # Red is written in en-US, no point in loading it
-            return
-        if locale in self.translations:
-            # Locales cannot be loaded twice as they have an entry in
-            # self.translations
-            return
-
-        locale_path = get_locale_path(self.cog_folder, "po")
-        with contextlib.suppress(IOError, FileNotFoundError):
-            with locale_path.open(encoding="utf-8") as file:
-                self._parse(file)
+            translations = {}
+        else:
+            translations = _load_catalog(self.cog_folder / "locales" / f"{locale}.po", locale)
+            _add_resident_locale(locale)
+        self.translations[locale] = translations
+        return translations
 
     def _parse(self, translation_file):
         self.translations.update(_parse(translation_file))
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Literal, Union, Optional, cast, TYPE_CHECKING
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Union,
+    Optional,
+    cast,
+    TYPE_CHECKING,
+)
 
 import discord
 
@@ -31,6 +42,9 @@ __all__ = [
     "get_case",
     "get_all_cases",
     "get_cases_for_member",
+    "get_case_numbers_for_member",
+    "iter_cases",
+    "rebuild_case_index",
     "create_case",
     "get_casetype",
     "get_all_casetypes",
@@ -46,6 +60,8 @@ _bot_ref: Optional[Red] = None
 
 _CASETYPES = "CASETYPES"
 _CASES = "CASES"
+# guild ID -> user ID -> the sorted numbers of the cases for the user
+_USER_CASES = "USER_CASES"
 _SCHEMA_VERSION = 4
 
 _data_deletion_lock = asyncio.Lock()
@@ -71,17 +87,25 @@ async def _process_data_deletion(
                     if (case.get(keyname, 0) or 0) == user_id:  # this could be None...
                         key_paths.append((guild_id_str, case_num_str))
 
+        # guild ID -> the numbers of the cases that have to be moved to the anonymized user
+        anonymized: Dict[str, List[int]] = {}
         async with _config.custom(_CASES).all() as all_cases:
             for guild_id_str, case_num_str in key_paths:
                 case = all_cases[guild_id_str][case_num_str]
                 if (case.get("user", 0) or 0) == user_id:
                     case["user"] = 0xDE1
                     case.pop("last_known_username", None)
+                    anonymized.setdefault(guild_id_str, []).append(int(case_num_str))
                 if (case.get("moderator", 0) or 0) == user_id:
                     case["moderator"] = 0xDE1
                 if (case.get("amended_by", 0) or 0) == user_id:
                     case["amended_by"] = 0xDE1
 
+        for guild_id_str, case_numbers in anonymized.items():
+            await _config.custom(_USER_CASES, guild_id_str, str(user_id)).clear()
+            for case_number in case_numbers:
+                await _index_case(guild_id_str, 0xDE1, case_number)
+
 
 async def _init(bot: Red):
     global _config
@@ -89,11 +113,15 @@ async def _init(bot: Red):
     _bot_ref = bot
     _config = Config.get_conf(None, 1354799444, cog_name="ModLog")
     _config.register_global(schema_version=1)
-    _config.register_guild(mod_log=None, casetypes={}, latest_case_number=0)
+    _config.register_guild(
+        mod_log=None, casetypes={}, latest_case_number=0, user_cases_indexed=False
+    )
     _config.init_custom(_CASETYPES, 1)
     _config.init_custom(_CASES, 2)
+    _config.init_custom(_USER_CASES, 2)
     _config.register_custom(_CASETYPES)
     _config.register_custom(_CASES)
+    _config.register_custom(_USER_CASES, cases=[])
     await _migrate_config(from_version=await _config.schema_version(), to_version=_SCHEMA_VERSION)
     await register_casetypes(all_generics)
 
@@ -347,6 +375,7 @@ class Case:
         """
         # We don't want case_number to be changed
         data.pop("case_number", None)
+        old_user_id = self._user_id
         # last username is set based on passed user object
         data.pop("last_known_username", None)
         for item, value in data.items():
@@ -361,6 +390,9 @@ class Case:
             self.last_known_username = f"{self.user.name}#{self.user.discriminator}"
 
         await _config.custom(_CASES, str(self.guild.id), str(self.case_number)).set(self.to_json())
+        if self._user_id != old_user_id:
+            await _unindex_case(self.guild.id, old_user_id, self.case_number)
+            await _index_case(self.guild.id, self._user_id, self.case_number)
         self.bot.counter._inc_core_raw("Red_Core", "on_modlog_case_edit")
         self.bot.dispatch("modlog_case_edit", self)
         if not self.message:
@@ -539,6 +571,10 @@ class Case:
                 case_text += _("**Last modified at:** {}\n").format(last_modified)
             return case_text.strip()
 
+    @property
+    def _user_id(self) -> int:
+        return self.user if isinstance(self.user, int) else self.user.id
+
     def to_json(self) -> dict:
         """Transform the object to a dict
 
@@ -556,16 +592,12 @@ class Case:
             amended_by = self.amended_by
         else:
             amended_by = self.amended_by.id
-        if isinstance(self.user, int):
-            user_id = self.user
-        else:
-            user_id = self.user.id
         data = {
             "case_number": self.case_number,
             "action_type": self.action_type,
             "guild": self.guild.id,
             "created_at": self.created_at,
-            "user": user_id,
+            "user": self._user_id,
             "last_known_username": self.last_known_username,
             "moderator": mod,
             "reason": self.reason,
@@ -864,29 +896,145 @@ async def get_cases_for_member(
         Fetching the user failed.
     """
 
-    cases = await _config.custom(_CASES, str(guild.id)).all()
+    case_numbers = await get_case_numbers_for_member(guild, member=member, member_id=member_id)
+
+    if not member_id:
+        member_id = member.id
+
+    if not member:
+        member = bot.get_user(member_id) or member_id
+
+    return [case async for case in iter_cases(guild, bot, case_numbers, user=member)]
+
+
+async def get_case_numbers_for_member(
+    guild: discord.Guild, *, member: discord.Member = None, member_id: int = None
+) -> List[int]:
+    """
+    Gets the numbers of the cases for the specified member or member id in a guild.
+
+    This only reads the index of the member's cases,
+    the cases can be loaded when they're needed with `iter_cases()`.
 
+    .. note::
+        If the index for the guild wasn't built yet, it's built first,
+        which means reading all cases of the guild once.
+
+    Parameters
+    ----------
+    guild: `discord.Guild`
+        The guild to get the case numbers from
+    member: `discord.Member`
+        The member to get case numbers for
+    member_id: int
+        The id of the member to get case numbers for
+
+    Returns
+    -------
+    List[int]
+        The case numbers, in ascending order.
+
+    Raises
+    ------
+    ValueError
+        If at least one of member or member_id is not provided
+    """
     if not (member_id or member):
         raise ValueError("Expected a member or a member id to be provided.") from None
 
     if not member_id:
         member_id = member.id
 
-    if not member:
-        member = bot.get_user(member_id) or member_id
+    if not await _config.guild(guild).user_cases_indexed():
+        await rebuild_case_index(guild)
+
+    return await _config.custom(_USER_CASES, str(guild.id), str(member_id)).cases()
+
+
+async def iter_cases(
+    guild: discord.Guild, bot: Red, case_numbers: Iterable[int], **kwargs
+) -> AsyncIterator[Case]:
+    """
+    Loads the cases with the specified numbers one at a time, as they're iterated over.
+
+    Case numbers that don't exist (anymore) are skipped.
+
+    Parameters
+    ----------
+    guild: `discord.Guild`
+        The guild to get the cases from
+    bot: Red
+        The bot's instance
+    case_numbers: Iterable[int]
+        The numbers of the cases to load
+    **kwargs
+        Extra attributes for the Case instances, see `Case.from_json()`.
 
+    Yields
+    ------
+    Case
+        The cases, in the order of the case numbers.
+    """
     try:
         modlog_channel = await get_modlog_channel(guild)
     except RuntimeError:
         modlog_channel = None
 
-    cases = [
-        await Case.from_json(modlog_channel, bot, case_number, case_data, user=member, guild=guild)
-        for case_number, case_data in cases.items()
-        if case_data["user"] == member_id
-    ]
+    for case_number in case_numbers:
+        case_data = await _config.custom(_CASES, str(guild.id), str(case_number)).all()
+        if not case_data:
+            continue
+        yield await Case.from_json(
+            modlog_channel, bot, case_number, case_data, guild=guild, **kwargs
+        )
+
+
+async def rebuild_case_index(guild: discord.Guild) -> int:
+    """
+    Rebuilds the index of the cases for each user in a guild from all of its cases.
+
+    The index is kept up to date when cases are created or edited,
+    this is only needed when the cases were changed in some other way.
+
+    Parameters
+    ----------
+    guild: `discord.Guild`
+        The guild to rebuild the index for
 
-    return cases
+    Returns
+    -------
+    int
+        The amount of indexed cases.
+    """
+    # creating cases waits for this lock, so that no case is missed
+    async with _config.guild(guild).latest_case_number.get_lock():
+        cases = await _config.custom(_CASES, str(guild.id)).all()
+        index: Dict[str, Dict[str, List[int]]] = {}
+        async for case_number, case_data in AsyncIter(cases.items(), steps=500):
+            user_cases = index.setdefault(str(case_data["user"]), {"cases": []})["cases"]
+            user_cases.append(int(case_number))
+        for user_cases in index.values():
+            user_cases["cases"].sort()
+        await _config.custom(_USER_CASES, str(guild.id)).set(index)
+        await _config.guild(guild).user_cases_indexed.set(True)
+    return len(cases)
+
+
+async def _index_case(guild_id: Union[int, str], user_id: int, case_number: int) -> None:
+    async with _config.custom(_USER_CASES, str(guild_id), str(user_id)).cases() as cases:
+        if case_number not in cases:
+            bisect.insort(cases, case_number)
+
+
+async def _unindex_case(guild_id: Union[int, str], user_id: int, case_number: int) -> None:
+    value = _config.custom(_USER_CASES, str(guild_id), str(user_id)).cases
+    cases = await value()
+    if case_number in cases:
+        cases.remove(case_number)
+        if cases:
+            await value.set(cases)
+        else:
+            await value.clear()
 
 
 async def create_case(
@@ -968,6 +1116,10 @@ async def create_case(
         )
         await _config.custom(_CASES, str(guild.id), str(next_case_number)).set(case.to_json())
         await _config.guild(guild).latest_case_number.set(next_case_number)
+        if next_case_number == 1:
+            # there are no older cases, so the index of a new guild is complete from the start
+            await _config.guild(guild).user_cases_indexed.set(True)
+        await _index_case(guild.id, case._user_id, next_case_number)
     bot.counter._inc_core_raw("Red_Core", "on_modlog_case_create")
     await set_contextual_locales_from_guild(bot, guild)
     bot.dispatch("modlog_case_create", case)
@@ -1211,7 +1363,9 @@ async def reset_cases(guild: discord.Guild) -> None:
 
     """
     await _config.custom(_CASES, str(guild.id)).clear()
+    await _config.custom(_USER_CASES, str(guild.id)).clear()
     await _config.guild(guild).latest_case_number.clear()
+    await _config.guild(guild).user_cases_indexed.clear()
 
 
 def _strfdelta(delta):
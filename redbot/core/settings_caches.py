@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Union, Set, Iterable, Tuple, overload
+from typing import Dict, FrozenSet, List, Optional, Union, Set, Iterable, Tuple, overload
 import asyncio
+import itertools
 from argparse import Namespace
 from collections import defaultdict
 
@@ -9,6 +10,7 @@ import discord
 
 from .config import Config
 from .utils import AsyncIter
+from .utils.caching import AsyncCache
 
 
 class PrefixManager:
@@ -498,3 +500,171 @@ class DisabledCogCache:
         self._disable_map[cog_name][guild_id] = False
         await self._config.custom("COG_DISABLE_SETTINGS", cog_name, guild_id).disabled.set(False)
         return True
+
+
+class ResolvedGuildSettings:
+    """
+    Core settings of a single guild, resolved so that they can be checked without awaiting.
+
+    Instances are replaced rather than updated when the settings change,
+    so they should not be held onto.
+    """
+
+    __slots__ = ("guild_id", "admin_role_ids", "mod_role_ids", "autoimmune_ids", "embeds")
+
+    def __init__(self, guild_id: int, data: dict):
+        self.guild_id: int = guild_id
+        self.admin_role_ids: Tuple[int, ...] = tuple(data.get("admin_role", ()))
+        self.mod_role_ids: Tuple[int, ...] = tuple(data.get("mod_role", ()))
+        self.autoimmune_ids: FrozenSet[int] = frozenset(data.get("autoimmune_ids", ()))
+        self.embeds: Optional[bool] = data.get("embeds")
+
+    def is_admin(self, member: discord.Member) -> bool:
+        try:
+            member_snowflakes = member._roles  # DEP-WARN
+        except AttributeError:  # someone passed a webhook to this
+            return False
+        return any(member_snowflakes.has(snowflake) for snowflake in self.admin_role_ids)
+
+    def is_mod(self, member: discord.Member) -> bool:
+        try:
+            member_snowflakes = member._roles  # DEP-WARN
+        except AttributeError:  # someone passed a webhook to this
+            return False
+        return any(
+            member_snowflakes.has(snowflake)
+            for snowflake in itertools.chain(self.admin_role_ids, self.mod_role_ids)
+        )
+
+    def is_automod_immune(self, ids_to_check: Iterable[int]) -> bool:
+        return not self.autoimmune_ids.isdisjoint(ids_to_check)
+
+
+class GuildSettingsSnapshot:
+    """
+    In-memory snapshot of the core settings that are checked on hot paths:
+    embed settings, automod immunity and the admin and mod roles.
+
+    Once a setting has been loaded, it's answered without touching Config.
+    The code changing these settings has to call the matching ``invalidate_*`` method.
+    """
+
+    def __init__(self, config: Config):
+        self._config: Config = config
+        self._guilds: Dict[int, ResolvedGuildSettings] = {}
+        # bounded, since every channel and user that ever ran a command would stay cached otherwise
+        self._channel_embeds: AsyncCache[int, Optional[bool]] = AsyncCache(
+            name="red.channel_embeds", maxsize=10000
+        )
+        self._user_embeds: AsyncCache[int, Optional[bool]] = AsyncCache(
+            name="red.user_embeds", maxsize=10000
+        )
+        # guild ID (0 for the global setting) -> command's qualified name -> embeds setting
+        self._command_embeds: Optional[Dict[int, Dict[str, bool]]] = None
+        self._global_embeds: Optional[bool] = None
+        # Bumped on every invalidation, so that a load that was in progress
+        # while the settings changed doesn't put stale data in the cache.
+        self._generation: int = 0
+
+    def get_cached_guild(self, guild_id: int) -> Optional[ResolvedGuildSettings]:
+        """Get the guild's settings, if they are already loaded."""
+        return self._guilds.get(guild_id)
+
+    async def get_guild(self, guild_id: int) -> ResolvedGuildSettings:
+        try:
+            return self._guilds[guild_id]
+        except KeyError:
+            pass
+        generation = self._generation
+        settings = ResolvedGuildSettings(
+            guild_id, await self._config.guild_from_id(guild_id).all()
+        )
+        if generation == self._generation:
+            self._guilds[guild_id] = settings
+        return settings
+
+    async def _get_channel_embeds(self, channel_id: int) -> Optional[bool]:
+        return await self._channel_embeds.get_or_load(
+            channel_id, self._config.channel_from_id(channel_id).embeds
+        )
+
+    async def _get_user_embeds(self, user_id: int) -> Optional[bool]:
+        return await self._user_embeds.get_or_load(
+            user_id, self._config.user_from_id(user_id).embeds
+        )
+
+    async def _get_command_embeds(self) -> Dict[int, Dict[str, bool]]:
+        if self._command_embeds is not None:
+            return self._command_embeds
+        generation = self._generation
+        ret: Dict[int, Dict[str, bool]] = defaultdict(dict)
+        all_data = await self._config.custom("COMMAND").all()
+        for command_name, command_data in all_data.items():
+            for guild_id, data in command_data.items():
+                embeds = data.get("embeds")
+                if embeds is not None:
+                    ret[int(guild_id)][command_name] = embeds
+        if generation == self._generation:
+            self._command_embeds = ret
+        return ret
+
+    async def _get_global_embeds(self) -> bool:
+        if self._global_embeds is not None:
+            return self._global_embeds
+        generation = self._generation
+        ret = await self._config.embeds()
+        if generation == self._generation:
+            self._global_embeds = ret
+        return ret
+
+    async def embed_requested(
+        self,
+        channel: Union[discord.abc.GuildChannel, discord.abc.PrivateChannel],
+        user: discord.abc.User,
+        command_name: Optional[str] = None,
+    ) -> bool:
+        """
+        Resolve the embed setting, going from the most specific scope to the global one.
+
+        This doesn't await anything once the relevant settings are cached.
+        """
+        if isinstance(channel, discord.abc.PrivateChannel):
+            if (user_setting := await self._get_user_embeds(user.id)) is not None:
+                return user_setting
+            command_embeds = await self._get_command_embeds()
+        else:
+            if (channel_setting := await self._get_channel_embeds(channel.id)) is not None:
+                return channel_setting
+
+            guild_id = channel.guild.id
+            command_embeds = await self._get_command_embeds()
+            if command_name is not None and guild_id in command_embeds:
+                if (command_setting := command_embeds[guild_id].get(command_name)) is not None:
+                    return command_setting
+
+            if (guild_setting := (await self.get_guild(guild_id)).embeds) is not None:
+                return guild_setting
+
+        if command_name is not None and 0 in command_embeds:
+            if (global_command_setting := command_embeds[0].get(command_name)) is not None:
+                return global_command_setting
+
+        return await self._get_global_embeds()
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self._generation += 1
+        self._guilds.pop(guild_id, None)
+
+    def invalidate_channel(self, channel_id: int) -> None:
+        self._channel_embeds.invalidate(channel_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._user_embeds.invalidate(user_id)
+
+    def invalidate_command_embeds(self) -> None:
+        self._generation += 1
+        self._command_embeds = None
+
+    def invalidate_global(self) -> None:
+        self._generation += 1
+        self._global_embeds = None
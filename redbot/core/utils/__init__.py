@@ -11,6 +11,7 @@ from typing import (
     AsyncIterable,
     Awaitable,
     Callable,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -29,6 +30,7 @@ from ._internal_utils import _is_unsafe_on_strict_config
 __all__ = (
     "bounded_gather",
     "bounded_gather_iter",
+    "bounded_gather_stream",
     "deduplicate_iterables",
     "AsyncIter",
     "is_safe_for_strict_config",
@@ -249,6 +251,145 @@ def bounded_gather(
     return asyncio.gather(*tasks, return_exceptions=return_exceptions)
 
 
+def _is_rate_limited(exc: Optional[BaseException]) -> bool:
+    return getattr(exc, "status", None) == 429
+
+
+async def bounded_gather_stream(
+    coros_or_futures: Iterable[Awaitable[_T]],
+    *,
+    limit: int = 4,
+    ordered: bool = True,
+    return_exceptions: bool = False,
+    cancel_on_error: bool = True,
+    rate: Optional[float] = None,
+    adaptive: bool = False,
+    latency_target: Optional[float] = None,
+) -> AsyncIterator[Union[_T, BaseException]]:
+    """
+    An async generator running awaitables concurrently and yielding their results.
+
+    Awaitables are taken from ``coros_or_futures`` only when they can be started,
+    so it can be a (possibly infinite) lazy iterable. When the results aren't consumed,
+    no more than ``2 * limit`` awaitables are started ahead of the consumer.
+
+    Stopping the iteration early (e.g. with ``break``) cancels the running awaitables.
+
+    Parameters
+    ----------
+    coros_or_futures : Iterable[Awaitable]
+        The awaitables to run in a bounded concurrent fashion.
+    limit : int
+        The maximum number of concurrent tasks.
+    ordered : bool
+        If true, results are yielded in the order of ``coros_or_futures``,
+        otherwise they are yielded as soon as they're ready.
+    return_exceptions : bool
+        If true, exceptions are yielded in place of results instead of being raised.
+    cancel_on_error : bool
+        If true, the other running awaitables are cancelled when an exception is raised.
+        Otherwise, they're left running, like with :func:`asyncio.gather`.
+    rate : Optional[float]
+        The maximum number of awaitables started per second.
+    adaptive : bool
+        If true, the concurrency is halved whenever an awaitable raises
+        an exception with a ``status`` of 429 (e.g. :class:`discord.HTTPException`)
+        or takes longer than ``latency_target``, and then slowly raised back up to ``limit``.
+    latency_target : Optional[float]
+        The amount of seconds over which an awaitable is considered too slow,
+        only used when ``adaptive`` is true.
+
+    Raises
+    ------
+    TypeError
+        When invalid parameters are passed
+
+    Example
+    -------
+    .. code-block:: python
+
+        async for result in bounded_gather_stream(
+            (self.notify(m) for m in members), limit=5, rate=2.0, adaptive=True
+        ):
+            ...
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise TypeError("limit must be an int > 0")
+    if rate is not None and rate <= 0:
+        raise TypeError("rate must be > 0")
+
+    loop = asyncio.get_running_loop()
+    source = iter(coros_or_futures)
+    exhausted = False
+    current_limit = limit
+    # task -> (index, start time)
+    running: Dict[asyncio.Future, Tuple[int, float]] = {}
+    finished: Dict[int, asyncio.Future] = {}
+    started = yielded = 0
+    next_start = loop.time()
+    last_decrease = next_start
+    successes = 0
+
+    try:
+        while True:
+            while not exhausted and len(running) < current_limit and started - yielded < 2 * limit:
+                if rate is not None:
+                    delay = next_start - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    next_start = max(next_start, loop.time()) + 1 / rate
+                try:
+                    aw = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                running[asyncio.ensure_future(aw)] = (started, loop.time())
+                started += 1
+
+            if not (yielded in finished if ordered else finished):
+                if not running:
+                    return
+                done, _pending = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                now = loop.time()
+                for task in done:
+                    index, start = running.pop(task)
+                    exc = task.exception()
+                    if exc is not None and not return_exceptions:
+                        if not cancel_on_error:
+                            running.clear()
+                        raise exc
+                    if adaptive:
+                        if _is_rate_limited(exc) or (
+                            latency_target is not None and now - start > latency_target
+                        ):
+                            # only react once to the tasks that were running at the same time
+                            if start >= last_decrease:
+                                current_limit = max(1, current_limit // 2)
+                                last_decrease = now
+                                successes = 0
+                        else:
+                            successes += 1
+                            if successes >= current_limit and current_limit < limit:
+                                current_limit += 1
+                                successes = 0
+                    finished[index] = task
+
+            ready = []
+            if ordered:
+                while yielded + len(ready) in finished:
+                    ready.append(finished.pop(yielded + len(ready)))
+            else:
+                ready.extend(finished.values())
+                finished.clear()
+            for task in ready:
+                yielded += 1
+                exc = task.exception()
+                yield task.result() if exc is None else exc
+    finally:
+        for task in running:
+            task.cancel()
+
+
 class AsyncIter(AsyncIterator[_T], Awaitable[List[_T]]):  # pylint: disable=duplicate-bases
     """Asynchronous iterator yielding items from ``iterable``
     that sleeps for ``delay`` seconds every ``steps`` items.
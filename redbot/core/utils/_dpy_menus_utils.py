@@ -18,7 +18,7 @@ log = logging.getLogger("red.menus")
 
 async def dpymenu(
     ctx: commands.Context,
-    pages: Iterable[Union[str, discord.Embed]],
+    pages: Union[Iterable[Union[str, discord.Embed]], _dpy_menus.PageSource],
     controls: Optional[Dict] = None,
     message: discord.Message = None,
     page: int = 0,
@@ -27,8 +27,10 @@ async def dpymenu(
     delete_message_after: bool = True,
     clear_reactions_after: bool = True,
 ):
+    if not isinstance(pages, _dpy_menus.PageSource):
+        pages = SimpleSource(pages=pages)
     await SimpleHybridMenu(
-        source=SimpleSource(pages=pages),
+        source=pages,
         cog=ctx.cog,
         message=message,
         delete_message_after=delete_message_after,
@@ -149,7 +151,8 @@ class HybridMenu(_dpy_menus.MenuPages, inherit_buttons=False):
     def _skip_single_arrows(self):
         max_pages = self._source.get_max_pages()
         if max_pages is None:
-            return True
+            # the amount of pages isn't known yet
+            return not self._source.is_paginating()
         return max_pages == 1
 
     def _skip_single_arrows_has_external_emojis_perm(self):
@@ -358,6 +361,8 @@ class HybridMenu(_dpy_menus.MenuPages, inherit_buttons=False):
         except AttributeError:
             pass
 
+        # buttons depend on the amount of pages which lazy sources only know after this
+        await self._source._prepare_once()
         self.bot = bot = ctx.bot
         self.ctx = ctx
         self._author_id = ctx.author.id
@@ -402,10 +407,11 @@ class HybridMenu(_dpy_menus.MenuPages, inherit_buttons=False):
 
         This implementation shows the first page of the source.
         """
-        if isinstance(self._source, AsyncIteratorPageSource):
+        max_pages = self._source.get_max_pages()
+        if isinstance(self._source, AsyncIteratorPageSource) and max_pages is None:
             self.current_page = 0
         else:
-            self.current_page = min(page, self._source.get_max_pages() - 1)
+            self.current_page = min(page, max_pages - 1)
         page = await self._source.get_page(self.current_page)
         kwargs = await self._get_kwargs_from_page(page)
         return await channel.send(**kwargs)
@@ -36,9 +36,8 @@ from typing import (
 
 import aiohttp
 import discord
-import pkg_resources
 from discord.ext.commands import Cog, check
-from fuzzywuzzy import fuzz, process
+from fuzzywuzzy import fuzz, utils as fuzz_utils
 from rich.progress import ProgressColumn
 from rich.progress_bar import ProgressBar
 
@@ -55,6 +54,7 @@ main_log = logging.getLogger("red")
 __all__ = (
     "timed_unsu",
     "safe_delete",
+    "CommandIndex",
     "fuzzy_command_search",
     "format_fuzzy_results",
     "create_backup",
@@ -97,12 +97,146 @@ def _fuzzy_log_filter(record):
 logging.getLogger().addFilter(_fuzzy_log_filter)
 
 
+def _default_fuzzy_scorer(term: str, name: str) -> int:
+    # Both strings are already processed by the index, no need to do it again.
+    return fuzz.QRatio(term, name, full_process=False)
+
+
+class CommandIndex:
+    """Bigram index over qualified command names, used by `fuzzy_command_search`.
+
+    The index is kept up to date by `Red.add_command` and `Red.remove_command`
+    so that looking up candidates for a mistyped command doesn't require walking
+    and scoring every command the bot has.
+
+    Candidates are pruned with a q-gram bound derived from the minimum score,
+    which holds for any scorer that is at most the LCS-based similarity ratio
+    (such as the default, `fuzz.QRatio`).
+    """
+
+    __slots__ = ("_commands", "_names", "_postings")
+
+    def __init__(self) -> None:
+        # qualified name -> command
+        self._commands: Dict[str, Command] = {}
+        # qualified name -> processed name
+        self._names: Dict[str, str] = {}
+        # bigram -> {qualified name: occurrences of the bigram}
+        self._postings: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __iter__(self) -> Iterator[Command]:
+        return iter(self._commands.values())
+
+    @staticmethod
+    def process(text: str) -> str:
+        return fuzz_utils.full_process(text, force_ascii=True)
+
+    @staticmethod
+    def _bigrams(processed: str) -> Dict[str, int]:
+        padded = f"\0{processed}\0"
+        return collections.Counter(padded[i : i + 2] for i in range(len(padded) - 1))
+
+    def add(self, command: Command) -> None:
+        """Add the command and all of its subcommands to the index."""
+        self._add_one(command)
+        if hasattr(command, "walk_commands"):
+            for subcommand in command.walk_commands():
+                self._add_one(subcommand)
+
+    def remove(self, command: Command) -> None:
+        """Remove the command and all of its subcommands from the index."""
+        self._remove_one(command)
+        if hasattr(command, "walk_commands"):
+            for subcommand in command.walk_commands():
+                self._remove_one(subcommand)
+
+    def _add_one(self, command: Command) -> None:
+        qualified_name = command.qualified_name
+        if qualified_name in self._commands:
+            self._remove_one(self._commands[qualified_name])
+        processed = self.process(qualified_name)
+        self._commands[qualified_name] = command
+        self._names[qualified_name] = processed
+        for bigram, count in self._bigrams(processed).items():
+            self._postings.setdefault(bigram, {})[qualified_name] = count
+
+    def _remove_one(self, command: Command) -> None:
+        qualified_name = command.qualified_name
+        if self._commands.get(qualified_name) is not command:
+            return
+        del self._commands[qualified_name]
+        processed = self._names.pop(qualified_name)
+        for bigram in self._bigrams(processed):
+            posting = self._postings.get(bigram)
+            if posting is None:
+                continue
+            posting.pop(qualified_name, None)
+            if not posting:
+                del self._postings[bigram]
+
+    def search(
+        self,
+        term: str,
+        *,
+        min_score: int = 80,
+        scorer: Callable[[str, str], int] = _default_fuzzy_scorer,
+    ) -> List[Tuple[Command, int]]:
+        """Find the indexed commands whose name scores at least ``min_score`` against ``term``.
+
+        Returns
+        -------
+        List[Tuple[`commands.Command <redbot.core.commands.Command>`, int]]
+            Matched commands with their score, sorted in order of decreasing score.
+
+        """
+        processed_term = self.process(term)
+        if not processed_term:
+            return []
+        term_len = len(processed_term)
+        # scores are rounded ratios, so this is the lowest ratio that can still reach `min_score`
+        min_ratio = (min_score - 0.5) / 100
+
+        if min_ratio <= 2 / 3:
+            # The q-gram bound doesn't exclude anything at such low scores.
+            candidates = self._names.keys()
+        else:
+            overlaps: Dict[str, int] = collections.defaultdict(int)
+            for bigram, count in self._bigrams(processed_term).items():
+                for qualified_name, name_count in self._postings.get(bigram, {}).items():
+                    overlaps[qualified_name] += min(count, name_count)
+
+            candidates = []
+            for qualified_name, overlap in overlaps.items():
+                total_len = term_len + len(self._names[qualified_name])
+                # The names need to share a common subsequence at least this long...
+                min_common = math.ceil(min_ratio * total_len / 2)
+                if min_common > min(term_len, total_len - term_len):
+                    continue
+                # ...which in turn leaves at least this many padded bigrams intact.
+                if overlap < 3 * min_common - total_len + 1:
+                    continue
+                candidates.append(qualified_name)
+
+        extracted = []
+        for qualified_name in candidates:
+            score = scorer(processed_term, self._names[qualified_name])
+            if score >= min_score:
+                extracted.append((self._commands[qualified_name], score))
+        extracted.sort(key=lambda item: item[1], reverse=True)
+        return extracted
+
+
 async def fuzzy_command_search(
     ctx: Context,
     term: Optional[str] = None,
     *,
     commands: Optional[Union[AsyncIterator[Command], Iterator[Command]]] = None,
     min_score: int = 80,
+    scorer: Optional[Callable[[str, str], int]] = None,
+    filter_func: Optional[Callable[[Iterable[Command]], AsyncIterator[Command]]] = None,
 ) -> Optional[List[Command]]:
     """Search for commands which are similar in name to the one invoked.
 
@@ -118,9 +252,17 @@ async def fuzzy_command_search(
         `Context.invoked_with` will be used instead.
     commands : Optional[Union[AsyncIterator[commands.Command], Iterator[commands.Command]]]
         The commands available to choose from when doing a fuzzy match.
-        When omitted, `Bot.walk_commands` will be used instead.
+        When omitted, the bot's command index will be used instead,
+        which is much cheaper than scoring every command.
     min_score : int
         The minimum score for matched commands to reach. Defaults to 80.
+    scorer : Optional[Callable[[str, str], int]]
+        The function used to score the processed term against a processed
+        command name. Defaults to `fuzz.QRatio`.
+    filter_func : Optional[Callable[[Iterable[commands.Command]], AsyncIterator[commands.Command]]]
+        A function filtering the matched commands, applied lazily in order of
+        decreasing score. This is preferred over pre-filtering ``commands``
+        as only the commands that actually matched need to be checked.
 
     Returns
     -------
@@ -139,6 +281,27 @@ async def fuzzy_command_search(
 
     if term is None:
         term = ctx.invoked_with
+    if scorer is None:
+        scorer = _default_fuzzy_scorer
+
+    # Do the scoring. `extracted` is a list of tuples in the form `(command, score)`
+    if commands is None:
+        extracted = ctx.bot._command_index.search(term, min_score=min_score, scorer=scorer)
+    else:
+        if isinstance(commands, collections.abc.AsyncIterator):
+            choices = {c async for c in commands}
+        else:
+            choices = set(commands)
+        processed_term = CommandIndex.process(term)
+        extracted = []
+        for command in choices:
+            score = scorer(processed_term, CommandIndex.process(command.qualified_name))
+            if score >= min_score:
+                extracted.append((command, score))
+        extracted.sort(key=lambda item: item[1], reverse=True)
+
+    if not extracted:
+        return None
 
     # If the term is an alias or CC, we don't want to send a supplementary fuzzy search.
     alias_cog = ctx.bot.get_cog("Alias")
@@ -158,28 +321,20 @@ async def fuzzy_command_search(
         else:
             return None
 
-    if commands is None:
-        choices = set(ctx.bot.walk_commands())
-    elif isinstance(commands, collections.abc.AsyncIterator):
-        choices = {c async for c in commands}
+    candidates = [command for command, score in extracted]
+    if filter_func is not None:
+        filtered = []
+        async for command in filter_func(candidates):
+            filtered.append(command)
+            if len(filtered) == 5:
+                break
+        candidates = filtered
     else:
-        choices = set(commands)
-
-    # Do the scoring. `extracted` is a list of tuples in the form `(command, score)`
-    extracted = process.extract(term, choices, limit=5, scorer=fuzz.QRatio)
-    if not extracted:
-        return None
+        candidates = candidates[:5]
 
     # Filter through the fuzzy-matched commands.
-    matched_commands = []
-    for command, score in extracted:
-        if score < min_score:
-            # Since the list is in decreasing order of score, we can exit early.
-            break
-        if await command.can_see(ctx):
-            matched_commands.append(command)
-
-    return matched_commands
+    visible = await asyncio.gather(*(command.can_see(ctx) for command in candidates))
+    return [command for command, can_see in zip(candidates, visible) if can_see]
 
 
 async def format_fuzzy_results(
@@ -328,6 +483,8 @@ async def send_to_owners_with_prefix_replaced(bot: Red, content: str, **kwargs):
 
 
 def expected_version(current: str, expected: str) -> bool:
+    import pkg_resources
+
     # `pkg_resources` needs a regular requirement string, so "x" serves as requirement's name here
     return current in pkg_resources.Requirement.parse(f"x{expected}")
 
@@ -1,7 +1,19 @@
-from datetime import datetime, timedelta
-from typing import Tuple, List
+import collections
+import functools
+import time
+from datetime import timedelta
+from typing import Callable, Deque, Hashable, List, Optional, Tuple, TYPE_CHECKING
 from collections import namedtuple
 
+from ..i18n import Translator
+
+if TYPE_CHECKING:
+    from ..commands import Context
+
+__all__ = ("AntiSpam", "AntiSpamManager", "antispam_check")
+
+_ = Translator("AntiSpam", __file__)
+
 Interval = Tuple[timedelta, int]
 AntiSpamInterval = namedtuple("AntiSpamInterval", ["period", "frequency"])
 
@@ -19,10 +31,6 @@ class AntiSpam:
     something should be allowed in an interval.
     """
 
-    # TODO : Decorator interface for command check using `spammy`
-    # with insertion of the antispam element into context
-    # for manual stamping on successful command completion
-
     default_intervals = [
         (timedelta(seconds=5), 3),
         (timedelta(minutes=1), 5),
@@ -31,30 +39,197 @@ class AntiSpam:
     ]
 
     def __init__(self, intervals: List[Interval]):
-        self.__event_timestamps = []
         _itvs = intervals if intervals else self.default_intervals
         self.__intervals = [AntiSpamInterval(*x) for x in _itvs]
+        # (period in seconds, frequency) pairs, the intervals are checked on every use
+        self.__checks = [(x.period.total_seconds(), x.frequency) for x in self.__intervals]
         self.__discard_after = max([x.period for x in self.__intervals])
-
-    def __interval_check(self, interval: AntiSpamInterval):
-        return (
-            len([t for t in self.__event_timestamps if (t + interval.period) > datetime.utcnow()])
-            >= interval.frequency
+        # An interval is exceeded when the stamp that is `frequency` stamps back
+        # is still inside of its period, so only the most recent stamps are needed.
+        self.__event_timestamps: Deque[float] = collections.deque(
+            maxlen=max(0, max(x.frequency for x in self.__intervals))
         )
+        # called on every stamp, used by `AntiSpamManager` to keep its order up to date
+        self._on_stamp: Optional[Callable[[], None]] = None
 
     @property
     def spammy(self):
         """
         use this to check if any interval criteria are met
         """
-        return any(self.__interval_check(x) for x in self.__intervals)
+        timestamps = self.__event_timestamps
+        now = time.monotonic()
+        for period, frequency in self.__checks:
+            if frequency <= 0:
+                # nothing is allowed in this interval
+                return True
+            if len(timestamps) >= frequency and timestamps[-frequency] + period > now:
+                return True
+        return False
 
     def stamp(self):
         """
         Use this to mark an event that counts against the intervals
         as happening now
         """
-        self.__event_timestamps.append(datetime.utcnow())
-        self.__event_timestamps = [
-            t for t in self.__event_timestamps if t + self.__discard_after > datetime.utcnow()
-        ]
+        self.__event_timestamps.append(time.monotonic())
+        if self._on_stamp is not None:
+            self._on_stamp()
+
+    @property
+    def last_stamp(self) -> Optional[float]:
+        """
+        The `time.monotonic()` time of the most recent event,
+        or `None` if nothing was stamped yet.
+        """
+        return self.__event_timestamps[-1] if self.__event_timestamps else None
+
+    @property
+    def discard_after(self) -> timedelta:
+        """The longest of the intervals, events older than this don't matter anymore."""
+        return self.__discard_after
+
+
+def _default_key(ctx: "Context") -> Hashable:
+    return (ctx.guild.id if ctx.guild is not None else None, ctx.author.id)
+
+
+class AntiSpamManager:
+    """
+    Keeps an `AntiSpam` per key, e.g. per ``(guild_id, user_id)`` pair.
+
+    Instances for keys that haven't been stamped during the longest interval
+    are discarded as they can't be spammy anymore. When there are more than
+    ``max_size`` instances, the ones stamped least recently are discarded first.
+
+    Parameters
+    ----------
+    intervals : List[Tuple[datetime.timedelta, int]]
+        The intervals for the created `AntiSpam` instances.
+        If empty, `AntiSpam.default_intervals` are used.
+    max_size : int
+        The maximum amount of kept `AntiSpam` instances.
+    """
+
+    def __init__(self, intervals: Optional[List[Interval]] = None, *, max_size: int = 10_000):
+        self.intervals = intervals or AntiSpam.default_intervals
+        self.max_size = max_size
+        self._ttl = max(x[0] for x in self.intervals).total_seconds()
+        # ordered from the least recently stamped
+        self._instances: "collections.OrderedDict[Hashable, AntiSpam]" = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._instances
+
+    def get(self, key: Hashable) -> AntiSpam:
+        """Get the `AntiSpam` for the given key, creating it if needed."""
+        try:
+            return self._instances[key]
+        except KeyError:
+            pass
+        self._evict()
+        antispam = self._instances[key] = AntiSpam(self.intervals)
+        # stamps made directly on the instance (e.g. `ctx.antispam.stamp()`) count as recent too
+        antispam._on_stamp = functools.partial(self._touch, key, antispam)
+        return antispam
+
+    def spammy(self, key: Hashable) -> bool:
+        """Check whether the given key meets any of the interval criteria."""
+        antispam = self._instances.get(key)
+        return antispam is not None and antispam.spammy
+
+    def stamp(self, key: Hashable) -> None:
+        """Mark an event for the given key as happening now."""
+        self.get(key).stamp()
+
+    def _touch(self, key: Hashable, antispam: AntiSpam) -> None:
+        # the instance could have been discarded while something still holds it
+        if self._instances.get(key) is antispam:
+            self._instances.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        self._instances.pop(key, None)
+
+    def clear(self) -> None:
+        self._instances.clear()
+
+    def _evict(self) -> None:
+        instances = self._instances
+        expired_before = time.monotonic() - self._ttl
+        while instances:
+            oldest = next(iter(instances.values()))
+            last_stamp = oldest.last_stamp
+            if last_stamp is not None and last_stamp > expired_before:
+                break
+            instances.popitem(last=False)
+        while len(instances) >= self.max_size:
+            instances.popitem(last=False)
+
+
+def antispam_check(
+    intervals: Optional[List[Interval]] = None,
+    *,
+    key: Callable[["Context"], Hashable] = _default_key,
+    stamp: bool = True,
+    max_size: int = 10_000,
+):
+    """
+    A decorator adding a check that fails when the invoker is being spammy.
+
+    The `AntiSpam` for the invocation is put into `Context.antispam`.
+    Only actual invocations are counted, evaluating the check
+    (e.g. when the help command checks which commands to show) doesn't count.
+
+    Parameters
+    ----------
+    intervals : List[Tuple[datetime.timedelta, int]]
+        The intervals to check, `AntiSpam.default_intervals` are used if not given.
+    key : Callable[[Context], Hashable]
+        Function returning the key the invocations are counted for.
+        Defaults to the pair of the guild's and the author's IDs.
+    stamp : bool
+        If `True`, every invocation that passes the check counts against the intervals.
+        Set this to `False` to only count what the command stamps itself,
+        e.g. to only count successful invocations with ``ctx.antispam.stamp()``.
+    max_size : int
+        The maximum amount of keys to keep track of.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @commands.command()
+        @antispam_check([(timedelta(minutes=5), 3)], stamp=False)
+        async def suggest(self, ctx, *, suggestion: str):
+            await self.send_suggestion(ctx, suggestion)
+            ctx.antispam.stamp()
+    """
+    from .. import commands
+
+    manager = AntiSpamManager(intervals, max_size=max_size)
+
+    async def predicate(ctx: "Context") -> bool:
+        if manager.spammy(key(ctx)):
+            raise commands.UserFeedbackCheckFailure(
+                _("You're doing this too often, try again later.")
+            )
+        return True
+
+    def on_invoke(ctx: "Context") -> None:
+        # called by `Command.prepare()` once the checks passed
+        ctx_key = key(ctx)
+        ctx.antispam = manager.get(ctx_key)
+        if stamp:
+            manager.stamp(ctx_key)
+
+    def decorator(func):
+        func = commands.check(predicate)(func)
+        callback = func.callback if isinstance(func, commands.Command) else func
+        callback.__antispam_hook__ = on_invoke
+        callback.__antispam_manager__ = manager
+        return func
+
+    return decorator
@@ -1,9 +1,37 @@
+import asyncio
 import collections
-from typing import MutableMapping, TypeVar, Iterator, KeysView, ItemsView, ValuesView
+import functools
+import sys
+import time
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    TypeVar,
+    Iterator,
+    KeysView,
+    ItemsView,
+    ValuesView,
+)
+
+__all__ = ("LRUDict", "CacheStats", "AsyncCache", "async_memoize", "get_cache_stats")
 
 _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
 
+_MISSING = object()
+# all named `AsyncCache` instances, for `get_cache_stats()`
+_caches: "weakref.WeakSet[AsyncCache]" = weakref.WeakSet()
+
 
 class LRUDict(MutableMapping[_KT, _VT]):
     """
@@ -71,3 +99,303 @@ class LRUDict(MutableMapping[_KT, _VT]):
 
     def values(self) -> ValuesView[_VT]:
         return self._dict.values()
+
+
+class CacheStats:
+    """Hit and miss counters of an `AsyncCache`."""
+
+    __slots__ = ("hits", "misses", "coalesced", "evictions", "expirations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        #: misses which waited for an already running load instead of starting a new one
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        ret = {name: getattr(self, name) for name in self.__slots__}
+        ret["hit_ratio"] = self.hit_ratio
+        return ret
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int, tags: frozenset):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class AsyncCache(Generic[_KT, _VT]):
+    """
+    Cache for the results of coroutines with LRU-eviction and optional expiry.
+
+    Concurrent loads of the same missing key are coalesced,
+    i.e. only the first one calls the loader and the rest wait for its result.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        The name under which the stats of this cache are reported by `get_cache_stats()`.
+        Caches without a name aren't reported.
+    maxsize : Optional[int]
+        The maximum amount of cached values, or `None` for no limit.
+    max_bytes : Optional[int]
+        The maximum total size of cached values, as measured by ``sizeof``,
+        or `None` for no limit.
+    ttl : Optional[float]
+        The amount of seconds after which cached values expire, or `None` to never expire them.
+    sizeof : Optional[Callable[[Any], int]]
+        Function measuring the size of a cached value, defaults to `sys.getsizeof`.
+        It's only used when ``max_bytes`` is set.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: Optional[str] = None,
+        maxsize: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or sys.getsizeof
+        self._entries: "collections.OrderedDict[_KT, _CacheEntry]" = collections.OrderedDict()
+        self._tags: Dict[Hashable, Set[_KT]] = {}
+        self._pending: Dict[_KT, "asyncio.Future[_VT]"] = {}
+        self._total_bytes = 0
+        # bumped on invalidation, so that loads started before it don't store stale values
+        self._generation = 0
+        self.stats = CacheStats()
+        if name is not None:
+            _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: _KT) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of cached values, only tracked when ``max_bytes`` is set."""
+        return self._total_bytes
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= time.monotonic()
+
+    def get(self, key: _KT, default: Any = None) -> Any:
+        """Get the cached value for the given key, or ``default`` if it isn't cached."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry):
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+            self._remove(key)
+            self.stats.expirations += 1
+        self.stats.misses += 1
+        return default
+
+    def set(self, key: _KT, value: _VT, *, tags: Iterable[Hashable] = ()) -> None:
+        """
+        Cache a value for the given key.
+
+        Values can be invalidated together with `invalidate_tag()` by any of the given tags.
+        """
+        if key in self._entries:
+            self._remove(key)
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        entry = _CacheEntry(value, expires_at, size, frozenset(tags))
+        self._entries[key] = entry
+        self._total_bytes += size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+            self.max_bytes is not None and self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    async def get_or_load(
+        self, key: _KT, loader: Callable[[], Awaitable[_VT]], *, tags: Iterable[Hashable] = ()
+    ) -> _VT:
+        """
+        Get the cached value for the given key, loading it with ``loader`` if it isn't cached.
+
+        If the key is already being loaded, this waits for that load instead.
+        Exceptions raised by the loader are propagated and aren't cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        try:
+            task = self._pending[key]
+        except KeyError:
+            task = asyncio.ensure_future(
+                self._load(key, loader, frozenset(tags), self._generation)
+            )
+            self._pending[key] = task
+        else:
+            self.stats.coalesced += 1
+        # the load continues for the other waiters if this one gets cancelled
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: _KT,
+        loader: Callable[[], Awaitable[_VT]],
+        tags: frozenset,
+        generation: int,
+    ) -> _VT:
+        try:
+            value = await loader()
+        finally:
+            if self._pending.get(key) is asyncio.current_task():
+                del self._pending[key]
+        if generation == self._generation:
+            self.set(key, value, tags=tags)
+        return value
+
+    def _remove(self, key: _KT) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate(self, key: _KT) -> bool:
+        """Remove the cached value for the given key, returning whether there was one."""
+        self._generation += 1
+        self._pending.pop(key, None)
+        if key in self._entries:
+            self._remove(key)
+            return True
+        return False
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Remove all cached values with the given tag, returning how many were removed."""
+        self._generation += 1
+        keys = self._tags.get(tag, ())
+        count = len(keys)
+        for key in list(keys):
+            self._remove(key)
+        return count
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._generation += 1
+        self._pending.clear()
+        self._entries.clear()
+        self._tags.clear()
+        self._total_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        ret = self.stats.to_dict()
+        ret.update(name=self.name, size=len(self._entries), bytes=self._total_bytes)
+        return ret
+
+
+def _make_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    if kwargs:
+        return args + (_MISSING,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+def async_memoize(
+    maxsize: Optional[int] = 128,
+    *,
+    ttl: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    sizeof: Optional[Callable[[Any], int]] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    tags: Optional[Callable[..., Iterable[Hashable]]] = None,
+    name: Optional[str] = None,
+):
+    """
+    Decorator caching the results of a coroutine function in an `AsyncCache`.
+
+    Concurrent calls with the same arguments are coalesced into a single call.
+    When used on a method, ``self`` is a part of the key.
+
+    The decorated function gets these additional attributes:
+
+    - ``cache`` - the `AsyncCache`
+    - ``invalidate(*args, **kwargs)`` - removes the cached result of a call with given arguments
+    - ``invalidate_tag(tag)`` - removes the cached results tagged with the given tag
+    - ``cache_clear()`` - removes all cached results
+
+    Parameters
+    ----------
+    maxsize, ttl, max_bytes, sizeof
+        Passed to `AsyncCache`.
+    key : Optional[Callable[..., Hashable]]
+        Function called with the arguments of the call returning the key to cache the result under.
+        By default, all arguments are used.
+    tags : Optional[Callable[..., Iterable[Hashable]]]
+        Function called with the arguments of the call returning the tags of the result.
+    name : Optional[str]
+        The name of the cache, defaults to the qualified name of the function.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @async_memoize(maxsize=1000, ttl=300, tags=lambda self, guild_id: (guild_id,))
+        async def get_guild_data(self, guild_id: int):
+            return await self.config.guild_from_id(guild_id).all()
+    """
+
+    def decorator(func: Callable[..., Awaitable[_VT]]):
+        cache: AsyncCache[Hashable, _VT] = AsyncCache(
+            name=name or f"{func.__module__}.{func.__qualname__}",
+            maxsize=maxsize,
+            max_bytes=max_bytes,
+            ttl=ttl,
+            sizeof=sizeof,
+        )
+        make_key = key or (lambda *args, **kwargs: _make_key(args, kwargs))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> _VT:
+            return await cache.get_or_load(
+                make_key(*args, **kwargs),
+                functools.partial(func, *args, **kwargs),
+                tags=tags(*args, **kwargs) if tags is not None else (),
+            )
+
+        wrapper.cache = cache
+        wrapper.invalidate = lambda *args, **kwargs: cache.invalidate(make_key(*args, **kwargs))
+        wrapper.invalidate_tag = cache.invalidate_tag
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> List[Dict[str, Any]]:
+    """
+    Get the stats of all named `AsyncCache` instances, sorted by name.
+
+    Caches with the same name (e.g. one per cog instance) are reported separately.
+    """
+    return sorted((cache.to_dict() for cache in _caches), key=lambda d: d["name"])
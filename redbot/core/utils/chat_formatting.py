@@ -1,8 +1,9 @@
 import datetime
 import itertools
+import re
 import textwrap
 from io import BytesIO
-from typing import Iterator, List, Optional, Sequence, SupportsInt, Union
+from typing import Iterable, Iterator, List, Optional, Sequence, SupportsInt, Union
 
 import discord
 from babel.lists import format_list as babel_list
@@ -252,24 +253,32 @@ def bordered(*columns: Sequence[str], ascii_border: bool = False) -> str:
     return "\n".join(lines).format(**borders)
 
 
+_CODE_FENCE_RE = re.compile(r"```[\w+#.-]*")
+
+
 def pagify(
-    text: str,
+    text: Union[str, Iterable[str]],
     delims: Sequence[str] = ["\n"],
     *,
     priority: bool = False,
     escape_mass_mentions: bool = True,
     shorten_by: int = 8,
     page_length: int = 2000,
+    balance_code_blocks: bool = False,
 ) -> Iterator[str]:
     """Generate multiple pages from the given text.
 
+    The text can also be given as an iterable of chunks (e.g. a generator),
+    which is only consumed as far as it's needed to generate the next page.
+
     Note
     ----
-    This does not respect code blocks or inline code.
+    Unless ``balance_code_blocks`` is set, this does not respect code blocks.
+    Inline code is never respected.
 
     Parameters
     ----------
-    text : str
+    text : `str` or `iterable` of `str`
         The content to pagify and send.
     delims : `sequence` of `str`, optional
         Characters where page breaks will occur. If no delimiters are found
@@ -289,6 +298,9 @@ def pagify(
         How much to shorten each page by. Defaults to 8.
     page_length : `int`
         The maximum length of each page. Defaults to 2000.
+    balance_code_blocks : `bool`
+        If :code:`True`, a code block that is still open at the end of a page
+        is closed on it and reopened (with the same language) on the next page.
 
     Yields
     ------
@@ -296,33 +308,86 @@ def pagify(
         Pages of the given text.
 
     """
-    in_text = text
+    if isinstance(text, str):
+        buffer = text
+        chunks: Iterator[str] = iter(())
+        exhausted = True
+    else:
+        buffer = ""
+        chunks = iter(text)
+        exhausted = False
+    # Instead of slicing off each page, the position in the buffer is tracked,
+    # the buffer is only rebuilt when more chunks have to be read into it.
+    start = 0
     page_length -= shorten_by
-    while len(in_text) > page_length:
-        this_page_len = page_length
+    # the fence (with its language) of the code block that's open at the page break
+    open_fence = ""
+
+    while True:
+        # the language is dropped if it would take up too much of the page
+        if open_fence and len(open_fence) >= page_length // 4:
+            reopen_fence = "```"
+        else:
+            reopen_fence = open_fence
+        prefix = f"{reopen_fence}\n" if reopen_fence else ""
+        max_length = page_length - len(prefix)
+        if not exhausted and len(buffer) - start <= max_length:
+            parts = [buffer[start:]]
+            missing = max_length + 1 - len(parts[0])
+            for chunk in chunks:
+                parts.append(chunk)
+                missing -= len(chunk)
+                if missing <= 0:
+                    break
+            else:
+                exhausted = True
+            buffer = "".join(parts)
+            start = 0
+        if len(buffer) - start <= max_length:
+            break
+
+        this_page_len = max_length
         if escape_mass_mentions:
-            this_page_len -= in_text.count("@here", 0, page_length) + in_text.count(
-                "@everyone", 0, page_length
+            this_page_len -= buffer.count("@here", start, start + page_length) + buffer.count(
+                "@everyone", start, start + page_length
             )
-        closest_delim = (in_text.rfind(d, 1, this_page_len) for d in delims)
+        if balance_code_blocks:
+            # room for closing the code block
+            this_page_len -= 4
+        end = start + max(this_page_len, 1)
+        closest_delim = (buffer.rfind(d, start + 1, end) for d in delims)
         if priority:
-            closest_delim = next((x for x in closest_delim if x > 0), -1)
+            closest_delim = next((x for x in closest_delim if x != -1), -1)
         else:
             closest_delim = max(closest_delim)
-        closest_delim = closest_delim if closest_delim != -1 else this_page_len
-        if escape_mass_mentions:
-            to_send = escape(in_text[:closest_delim], mass_mentions=True)
-        else:
-            to_send = in_text[:closest_delim]
+        if closest_delim != -1:
+            end = closest_delim
+
+        to_send = buffer[start:end]
+        start = end
+        page_fence = reopen_fence
+        if balance_code_blocks:
+            for match in _CODE_FENCE_RE.finditer(to_send):
+                open_fence = "" if open_fence else match.group(0)
         if len(to_send.strip()) > 0:
-            yield to_send
-        in_text = in_text[closest_delim:]
-
-    if len(in_text.strip()) > 0:
-        if escape_mass_mentions:
-            yield escape(in_text, mass_mentions=True)
-        else:
-            yield in_text
+            yield _finish_page(to_send, escape_mass_mentions, page_fence, open_fence)
+
+    to_send = buffer[start:]
+    if len(to_send.strip()) > 0:
+        yield _finish_page(to_send, escape_mass_mentions, reopen_fence, "")
+
+
+def _finish_page(text: str, escape_mass_mentions: bool, start_fence: str, end_fence: str) -> str:
+    if escape_mass_mentions:
+        text = escape(text, mass_mentions=True)
+    if start_fence:
+        # the page most likely starts with the delimiter the previous one was broken at
+        if text.startswith("\n"):
+            text = text[1:]
+        text = f"{start_fence}\n{text}"
+    if end_fence:
+        text += "```" if text.endswith("\n") else "\n```"
+    return text
 
 
 def strikethrough(text: str, escape_formatting: bool = True) -> str:
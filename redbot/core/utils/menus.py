@@ -6,24 +6,188 @@ import asyncio
 import contextlib
 import functools
 import logging
-from typing import Iterable, List, Optional, Union, Dict
+import math
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    Dict,
+)
 import discord
+from discord.embeds import _EmptyEmbed
 
 from .. import commands
+from .caching import LRUDict
 from .predicates import ReactionPredicate
 from ..i18n import Translator
 from ._dpy_menus_utils import dpymenu
+from ...vendored.discord.ext import menus as _dpy_menus
 
 _ReactableEmoji = Union[str, discord.Emoji]
+_Page = Union[str, discord.Embed]
 
 _ = Translator("Menus", __file__)
 
 log = logging.getLogger("red.menus")
 
 
+class LazyPageSource(_dpy_menus.PageSource):
+    """
+    Base class for page sources that render pages only when they're shown.
+
+    The most recently shown rendered pages are kept,
+    so going back and forth between pages doesn't render them again.
+
+    Subclasses must implement `render_page()`, `get_max_pages()`
+    and `is_paginating() <redbot.vendored.discord.ext.menus.PageSource.is_paginating>`.
+
+    Parameters
+    ----------
+    cache_size: int
+        The amount of rendered pages to keep.
+    """
+
+    def __init__(self, *, cache_size: int = 8):
+        self._rendered: LRUDict[int, _Page] = LRUDict(size=cache_size)
+
+    async def render_page(self, page_number: int) -> _Page:
+        """
+        Render the page with the given (zero-indexed) number.
+
+        Raises
+        ------
+        IndexError
+            The page doesn't exist.
+        """
+        raise NotImplementedError
+
+    async def get_page(self, page_number: int) -> _Page:
+        try:
+            return self._rendered[page_number]
+        except KeyError:
+            pass
+        page = await self.render_page(page_number)
+        self._rendered[page_number] = page
+        return page
+
+    async def format_page(self, menu: _dpy_menus.Menu, page: _Page) -> _Page:
+        if isinstance(page, discord.Embed) and isinstance(page.colour, _EmptyEmbed):
+            page.colour = await menu.ctx.embed_colour()
+        return page
+
+
+class IndexedPageSource(LazyPageSource):
+    """
+    Page source with a known amount of pages which are rendered by a function.
+
+    Parameters
+    ----------
+    page_count: int
+        The amount of pages.
+    render: Callable[[int], Union[str, discord.Embed]]
+        The (possibly async) function rendering the page with the given (zero-indexed) number.
+    cache_size: int
+        The amount of rendered pages to keep.
+
+    Example
+    -------
+    .. code-block:: python
+
+        def render(page_number):
+            chunk = entries[page_number * 10 : (page_number + 1) * 10]
+            return box("\\n".join(chunk))
+
+        await menu(ctx, IndexedPageSource(math.ceil(len(entries) / 10), render), DEFAULT_CONTROLS)
+    """
+
+    def __init__(
+        self,
+        page_count: int,
+        render: Callable[[int], Union[_Page, Awaitable[_Page]]],
+        *,
+        cache_size: int = 8,
+    ):
+        super().__init__(cache_size=cache_size)
+        self._page_count = page_count
+        self._render = render
+
+    def get_max_pages(self) -> int:
+        return self._page_count
+
+    def is_paginating(self) -> bool:
+        return self._page_count > 1
+
+    async def render_page(self, page_number: int) -> _Page:
+        if not 0 <= page_number < self._page_count:
+            raise IndexError("Page number out of range.")
+        return await discord.utils.maybe_coroutine(self._render, page_number)
+
+
+class AsyncIterPageSource(LazyPageSource, _dpy_menus.AsyncIteratorPageSource):
+    """
+    Page source consuming entries from an async iterable only as far as the shown pages need.
+
+    The amount of pages is unknown until the iterable is exhausted.
+
+    Parameters
+    ----------
+    iterable: AsyncIterable[Any]
+        The entries to paginate.
+    per_page: int
+        The amount of entries on a page.
+    render: Callable[[List[Any], int], Union[str, discord.Embed]]
+        The (possibly async) function rendering the entries of a page
+        and the (zero-indexed) page number to the page.
+    cache_size: int
+        The amount of rendered pages to keep.
+    """
+
+    def __init__(
+        self,
+        iterable: AsyncIterable[Any],
+        *,
+        per_page: int,
+        render: Callable[[List[Any], int], Union[_Page, Awaitable[_Page]]],
+        cache_size: int = 8,
+    ):
+        LazyPageSource.__init__(self, cache_size=cache_size)
+        _dpy_menus.AsyncIteratorPageSource.__init__(self, iterable, per_page=per_page)
+        self._render = render
+
+    def get_max_pages(self) -> Optional[int]:
+        if not self._exhausted:
+            return None
+        return max(1, math.ceil(len(self._cache) / self.per_page))
+
+    async def render_page(self, page_number: int) -> _Page:
+        entries = await self._get_page_range(page_number)
+        return await discord.utils.maybe_coroutine(self._render, entries, page_number)
+
+
+async def _get_source_page(source: LazyPageSource, page: int) -> Tuple[int, _Page]:
+    await source._prepare_once()
+    try:
+        return page, await source.get_page(page)
+    except IndexError:
+        # went past the end of a source with an unknown amount of pages
+        return 0, await source.get_page(0)
+
+
+def _get_page_count(pages: Union[List[_Page], LazyPageSource]) -> Optional[int]:
+    if isinstance(pages, LazyPageSource):
+        return pages.get_max_pages()
+    return len(pages)
+
+
 async def menu(
     ctx: commands.Context,
-    pages: Union[List[str], List[discord.Embed]],
+    pages: Union[List[str], List[discord.Embed], LazyPageSource],
     controls: Dict,
     message: discord.Message = None,
     page: int = 0,
@@ -34,6 +198,9 @@ async def menu(
 
     .. note:: All pages should be of the same type
 
+    .. note:: Instead of a list of pages, a `LazyPageSource` can be passed
+              to only render the pages that are shown
+
     .. note:: All functions for handling what a particular emoji does
               should be coroutines (i.e. :code:`async def`). Additionally,
               they must take all of the parameters of this function, in
@@ -45,7 +212,7 @@ async def menu(
     ----------
     ctx: commands.Context
         The command context
-    pages: `list` of `str` or `discord.Embed`
+    pages: `list` of `str` or `discord.Embed`, or `LazyPageSource`
         The pages of the menu.
     controls: dict
         A mapping of emoji to the function which handles the action for the
@@ -71,9 +238,11 @@ async def menu(
         await dpymenu(ctx, pages, controls, message, page, timeout)
         return
 
-    if not isinstance(pages[0], (discord.Embed, str)):
+    if isinstance(pages, LazyPageSource):
+        pass
+    elif not isinstance(pages[0], (discord.Embed, str)):
         raise RuntimeError("Pages must be of type discord.Embed or str")
-    if not all(isinstance(x, discord.Embed) for x in pages) and not all(
+    elif not all(isinstance(x, discord.Embed) for x in pages) and not all(
         isinstance(x, str) for x in pages
     ):
         raise RuntimeError("All pages must be of the same type")
@@ -83,7 +252,10 @@ async def menu(
             maybe_coro = value.func
         if not asyncio.iscoroutinefunction(maybe_coro):
             raise RuntimeError("Function must be a coroutine")
-    current_page = pages[page]
+    if isinstance(pages, LazyPageSource):
+        page, current_page = await _get_source_page(pages, page)
+    else:
+        current_page = pages[page]
 
     if not message:
         if isinstance(current_page, discord.Embed):
@@ -150,7 +322,8 @@ async def next_page(
     timeout: float,
     emoji: str,
 ):
-    if page == len(pages) - 1:
+    page_count = _get_page_count(pages)
+    if page_count is not None and page == page_count - 1:
         page = 0  # Loop around to the first item
     else:
         page = page + 1
@@ -167,7 +340,8 @@ async def prev_page(
     emoji: str,
 ):
     if page == 0:
-        page = len(pages) - 1  # Loop around to the last item
+        # Loop around to the last item, if it's known
+        page = max(0, (_get_page_count(pages) or 1) - 1)
     else:
         page = page - 1
     return await menu(ctx, pages, controls, message=message, page=page, timeout=timeout)
@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+__all__ = ("Scheduler",)
+
+_KT = TypeVar("_KT", bound=Hashable)
+
+log = logging.getLogger("red.scheduling")
+
+
+class Scheduler(Generic[_KT]):
+    """
+    Calls a coroutine function with keys once the times they're scheduled for come,
+    e.g. to lift temporary punishments when they expire.
+
+    The keys are kept in a heap ordered by their times and a single task
+    sleeps until the earliest one is due, so the cost doesn't grow with
+    the amount of scheduled keys that aren't due yet.
+
+    All keys that are due at once are passed to the callback together,
+    so that related keys (e.g. the same member's channel mutes) can be handled in one go.
+    Exceptions raised by the callback are logged.
+
+    Parameters
+    ----------
+    callback : Callable[[List[Hashable]], Awaitable[Any]]
+        The coroutine function called with the keys that are due.
+    max_sleep : float
+        The longest time (in seconds) to sleep at once.
+        The times are UNIX timestamps, so this keeps changes of the system clock
+        from delaying the keys for too long.
+    """
+
+    def __init__(self, callback: Callable[[List[_KT]], Awaitable], *, max_sleep: float = 300.0):
+        self._callback = callback
+        self.max_sleep = max_sleep
+        # (time, insertion order, key) - entries whose time doesn't match `_times`
+        # were rescheduled or unscheduled and are skipped
+        self._heap: List[Tuple[float, int, _KT]] = []
+        self._times: Dict[_KT, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __contains__(self, key: _KT) -> bool:
+        return key in self._times
+
+    def get(self, key: _KT) -> Optional[float]:
+        """Get the time the key is scheduled for, or `None` if it isn't scheduled."""
+        return self._times.get(key)
+
+    def schedule(self, key: _KT, when: float) -> None:
+        """
+        Schedule the key for the given UNIX timestamp, replacing its previous time.
+
+        Times in the past are due immediately.
+        """
+        self._times[key] = when
+        entry = (when, next(self._counter), key)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            # the new time is the earliest, the sleeping task has to recompute its timeout
+            self._wakeup.set()
+        if len(self._heap) > 2 * len(self._times) + 64:
+            self._compact()
+
+    def unschedule(self, key: _KT) -> None:
+        """Unschedule the key, if it's scheduled."""
+        self._times.pop(key, None)
+
+    def clear(self) -> None:
+        """Unschedule all keys."""
+        self._times.clear()
+        self._heap.clear()
+
+    def start(self) -> None:
+        """Start calling the callback, if it isn't started already."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """
+        Stop calling the callback, the scheduled keys are kept.
+
+        Use `close()` to also wait for the task calling the callback to finish.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def close(self) -> None:
+        """Stop calling the callback and wait until it's stopped, the scheduled keys are kept."""
+        task = self._task
+        self.stop()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _compact(self) -> None:
+        self._heap = [entry for entry in self._heap if self._times.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> List[_KT]:
+        heap = self._heap
+        times = self._times
+        due = []
+        while heap and heap[0][0] <= now:
+            when, __, key = heapq.heappop(heap)
+            if times.get(key) == when:
+                del times[key]
+                due.append(key)
+        # drop skipped entries, so that the first one is the next due key
+        while heap and times.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            due = self._pop_due(time.time())
+            if due:
+                try:
+                    await self._callback(due)
+                except Exception:
+                    log.exception("Error in the callback of a scheduler.")
+                continue
+            self._wakeup.clear()
+            timeout = self.max_sleep
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -1,10 +1,15 @@
 import argparse
+import contextvars
+import json
 import logging.handlers
 import pathlib
+import queue
+import random
 import re
 import sys
+import time
 
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from logging import LogRecord
 from datetime import datetime  # This clearly never leads to confusion...
 from os import isatty
@@ -86,6 +91,12 @@ class RotatingFileHandler(logging.handlers.RotatingFileHandler):
             filename = directory / f"{stem}-part{highest_part}.log"
         else:
             filename = directory / f"{stem}.log"
+        # when set, the stream is only flushed by explicit calls to `flush_buffer()`
+        self.defer_flush = False
+        # the size of the file in bytes, tracked without asking the stream
+        self._stream_size = 0
+        # the size of the record that triggered the rollover, written after reopening
+        self._rollover_record_size = 0
         super().__init__(
             filename,
             mode="a",
@@ -95,6 +106,34 @@ class RotatingFileHandler(logging.handlers.RotatingFileHandler):
             delay=False,
         )
 
+    def _open(self):
+        stream = super()._open()
+        stream.seek(0, 2)
+        self._stream_size = stream.tell()
+        return stream
+
+    def shouldRollover(self, record: LogRecord) -> bool:
+        # Unlike the stdlib handler, this doesn't seek the stream for every record
+        # as that flushes it, which would make batching the writes pointless.
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        msg = self.format(record) + self.terminator
+        msg_length = len(msg.encode(self.stream.encoding or "utf-8", errors="replace"))
+        if self._stream_size + msg_length >= self.maxBytes:
+            self._rollover_record_size = msg_length
+            return True
+        self._stream_size += msg_length
+        return False
+
+    def flush(self) -> None:
+        if not self.defer_flush:
+            super().flush()
+
+    def flush_buffer(self) -> None:
+        super().flush()
+
     def doRollover(self):
         if self.stream:
             self.stream.close()
@@ -125,6 +164,8 @@ class RotatingFileHandler(logging.handlers.RotatingFileHandler):
             )
 
         self.stream = self._open()
+        self._stream_size += self._rollover_record_size
+        self._rollover_record_size = 0
 
 
 SYNTAX_THEME = {
@@ -280,6 +321,281 @@ class RedRichHandler(RichHandler):
             self.console.print(traceback)
 
 
+#: Information about what is being processed in the current task, set by the bot
+#: while invoking a command. Included in the records when using the JSON log format.
+log_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "red_log_context", default=None
+)
+
+_LOG_CONTEXT_FIELDS = ("shard_id", "guild_id", "cog", "command")
+
+
+def _install_context_record_factory() -> None:
+    # The context has to be captured when the record is created,
+    # records may be formatted in a different thread (see `--async-logging`).
+    old_factory = logging.getLogRecordFactory()
+
+    def record_factory(*args, **kwargs) -> LogRecord:
+        record = old_factory(*args, **kwargs)
+        context = log_context.get()
+        if context is not None:
+            for key, value in context.items():
+                setattr(record, key, value)
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats the records as JSON objects, one per line."""
+
+    def format(self, record: LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in _LOG_CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                data[key] = value
+        suppressed = getattr(record, "suppressed_records", 0)
+        if suppressed:
+            data["suppressed_records"] = suppressed
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _LoggerLimit:
+    __slots__ = ("rate_limit", "sample_rate", "tokens", "last_refill", "suppressed")
+
+    def __init__(self) -> None:
+        self.rate_limit: Optional[float] = None
+        self.sample_rate: float = 1.0
+        self.tokens = 0.0
+        self.last_refill = time.monotonic()
+        self.suppressed = 0
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Handler filter limiting the amount of records from the configured loggers.
+
+    A rule applies to its logger and all of its children, the most specific rule wins.
+    Records with a level of WARNING or above are always let through.
+
+    The amount of records suppressed since the last one that was let through
+    is stored in its ``suppressed_records`` attribute.
+
+    Parameters
+    ----------
+    rate_limits : Dict[str, float]
+        Maximum amount of records per second, keyed by logger name.
+    sample_rates : Dict[str, float]
+        Fraction of records (between 0 and 1) to keep, keyed by logger name.
+    """
+
+    def __init__(self, rate_limits: Dict[str, float], sample_rates: Dict[str, float]) -> None:
+        super().__init__()
+        self._limits: Dict[str, _LoggerLimit] = {}
+        for name, rate_limit in rate_limits.items():
+            limit = self._limits.setdefault(name, _LoggerLimit())
+            limit.rate_limit = rate_limit
+            limit.tokens = rate_limit
+        for name, sample_rate in sample_rates.items():
+            self._limits.setdefault(name, _LoggerLimit()).sample_rate = sample_rate
+        # logger name -> the limit that applies to it, or None
+        self._resolved: Dict[str, Optional[_LoggerLimit]] = {}
+
+    def _get_limit(self, name: str) -> Optional[_LoggerLimit]:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        candidate = name
+        while True:
+            if candidate in self._limits:
+                limit = self._limits[candidate]
+                break
+            if "." not in candidate:
+                limit = None
+                break
+            candidate = candidate.rpartition(".")[0]
+        self._resolved[name] = limit
+        return limit
+
+    def filter(self, record: LogRecord) -> bool:
+        # The record can go through multiple handlers with this filter,
+        # the decision has to be made only once.
+        try:
+            return record._red_sampled
+        except AttributeError:
+            pass
+        record._red_sampled = keep = self._should_keep(record)
+        return keep
+
+    def _should_keep(self, record: LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        limit = self._get_limit(record.name)
+        if limit is None:
+            return True
+
+        if limit.sample_rate < 1.0 and random.random() >= limit.sample_rate:
+            limit.suppressed += 1
+            return False
+        if limit.rate_limit is not None:
+            now = time.monotonic()
+            limit.tokens = min(
+                limit.rate_limit, limit.tokens + (now - limit.last_refill) * limit.rate_limit
+            )
+            limit.last_refill = now
+            if limit.tokens < 1.0:
+                limit.suppressed += 1
+                return False
+            limit.tokens -= 1.0
+
+        if limit.suppressed:
+            record.suppressed_records = limit.suppressed
+            limit.suppressed = 0
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which drops records instead of blocking when the queue is full.
+
+    Only the message is rendered when the record is enqueued,
+    formatting and writing it is left to the `BatchingQueueListener`.
+    """
+
+    def __init__(self, queue_: queue.Queue) -> None:
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The arguments have to be merged now as they could change before the listener
+        # gets to the record, the rest can be done in the listener's thread.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener passing records to its handlers from a background thread.
+
+    All records that are waiting in the queue are handled together,
+    and the file handlers are only flushed once per batch.
+    """
+
+    def __init__(
+        self,
+        queue_: queue.Queue,
+        queue_handler: DroppingQueueHandler,
+        *handlers: logging.Handler,
+        batch_size: int = 512,
+    ) -> None:
+        super().__init__(queue_, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.batch_size = batch_size
+        self.processed = 0
+        self._reported_dropped = 0
+
+    def _monitor(self) -> None:
+        q = self.queue
+        file_handlers = [h for h in self.handlers if isinstance(h, RotatingFileHandler)]
+        for handler in file_handlers:
+            handler.defer_flush = True
+        try:
+            stop = False
+            while not stop:
+                batch = [q.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                self._report_dropped()
+                for record in batch:
+                    if record is self._sentinel:
+                        stop = True
+                        continue
+                    self.handle(record)
+                    self.processed += 1
+                for handler in file_handlers:
+                    handler.flush_buffer()
+                for _ in batch:
+                    q.task_done()
+        finally:
+            for handler in file_handlers:
+                handler.defer_flush = False
+
+    def _report_dropped(self) -> None:
+        dropped = self.queue_handler.dropped
+        if dropped == self._reported_dropped:
+            return
+        record = logging.makeLogRecord(
+            {
+                "name": "red.logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "%s log records were dropped because the logging queue was full.",
+                "args": (dropped - self._reported_dropped,),
+            }
+        )
+        self._reported_dropped = dropped
+        self.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full, this waits for the thread to make room.
+        self.queue.put(self._sentinel)
+
+
+_queue_listener: Optional[BatchingQueueListener] = None
+
+
+def get_queue_stats() -> Optional[Dict[str, Any]]:
+    """Get the stats of the logging queue, or `None` if logging isn't queued."""
+    listener = _queue_listener
+    if listener is None:
+        return None
+    return {
+        "backlog": listener.queue.qsize(),
+        "max_size": listener.queue.maxsize,
+        "dropped": listener.queue_handler.dropped,
+        "processed": listener.processed,
+    }
+
+
+def shutdown_queue_logging() -> None:
+    """Write out all queued records and stop the listener thread, if there is one."""
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    logging.getLogger().removeHandler(listener.queue_handler)
+    listener.stop()
+    # the handlers can be used directly now that the listener is gone
+    for handler in listener.handlers:
+        logging.getLogger().addHandler(handler)
+
+
 def init_logging(level: int, location: pathlib.Path, cli_flags: argparse.Namespace) -> None:
     root_logger = logging.getLogger()
 
@@ -340,7 +656,7 @@ def init_logging(level: int, location: pathlib.Path, cli_flags: argparse.Namespa
         stdout_handler = logging.StreamHandler(sys.stdout)
         stdout_handler.setFormatter(file_formatter)
 
-    root_logger.addHandler(stdout_handler)
+    handlers: List[logging.Handler] = [stdout_handler]
     logging.captureWarnings(True)
 
     if not location.exists():
@@ -378,6 +694,33 @@ def init_logging(level: int, location: pathlib.Path, cli_flags: argparse.Namespa
         encoding="utf-8",
     )
 
+    if cli_flags.log_format == "json":
+        _install_context_record_factory()
+        fhandler_formatter = JSONFormatter()
+    else:
+        fhandler_formatter = file_formatter
     for fhandler in (latest_fhandler, all_fhandler):
-        fhandler.setFormatter(file_formatter)
-        root_logger.addHandler(fhandler)
+        fhandler.setFormatter(fhandler_formatter)
+        handlers.append(fhandler)
+
+    sampling_filter = None
+    if cli_flags.log_rate_limits or cli_flags.log_sample_rates:
+        sampling_filter = SamplingFilter(
+            dict(cli_flags.log_rate_limits), dict(cli_flags.log_sample_rates)
+        )
+        for handler in handlers:
+            handler.addFilter(sampling_filter)
+
+    if cli_flags.async_logging:
+        global _queue_listener
+        log_queue: queue.Queue = queue.Queue(cli_flags.logging_queue_size)
+        queue_handler = DroppingQueueHandler(log_queue)
+        if sampling_filter is not None:
+            # drop the records before they even get to the queue
+            queue_handler.addFilter(sampling_filter)
+        _queue_listener = BatchingQueueListener(log_queue, queue_handler, *handlers)
+        _queue_listener.start()
+        root_logger.addHandler(queue_handler)
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import namedtuple
+
+import pytest
+
+from redbot.cogs.filter import Filter
+from redbot.cogs.filter.matcher import WordMatcher
+from redbot.core import Config
+
+
+def test_word_matcher_word_boundaries():
+    matcher = WordMatcher(["bad", "bad word", "!cmd"])
+    assert matcher.find_all("a BAD Word, badly") == {"BAD", "BAD Word"}
+    # same as regex's \b, so words starting with a non-word character need a word character before
+    assert matcher.find_all("run !cmd now") == set()
+    assert matcher.find_all("x!cmd") == {"!cmd"}
+    assert matcher.find_all("nothing here") == set()
+
+
+def test_word_matcher_normalization():
+    matcher = WordMatcher(["bad", "straße"])
+    # Cyrillic "а", fullwidth letters and case-folding
+    assert matcher.find_all("bаd") == {"bаd"}
+    assert matcher.find_all("ＢＡＤ") == {"ＢＡＤ"}
+    assert matcher.find_all("STRASSE straße") == {"STRASSE", "straße"}
+    # "ß" can't match half of the word
+    assert WordMatcher(["s"]).find_all("ß") == set()
+
+
+@pytest.fixture()
+def filter_cog(config, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(Config, "get_conf", lambda *args, **kwargs: config)
+        return Filter(None)
+
+
+@pytest.mark.asyncio
+async def test_filter_hits_channel_overlay(filter_cog, empty_guild):
+    channel = namedtuple("Channel", "id guild")(1234, empty_guild)
+    await filter_cog.config.guild(empty_guild).filter.set(["bad"])
+    await filter_cog.config.channel(channel).filter.set(["worse"])
+
+    assert await filter_cog.filter_hits("bad, worse", empty_guild) == {"bad"}
+    assert await filter_cog.filter_hits("bad, worse", channel) == {"bad", "worse"}
+
+    # changing the guild's list doesn't require rebuilding the channel's matcher
+    await filter_cog.config.guild(empty_guild).filter.set(["worst"])
+    filter_cog.invalidate_cache(empty_guild)
+    assert channel.id in filter_cog._channel_matchers
+    assert await filter_cog.filter_hits("bad, worse, worst", channel) == {"worse", "worst"}
+
+
+@pytest.mark.asyncio
+async def test_sweep_names_checkpoints(filter_cog, empty_guild, monkeypatch):
+    from redbot.cogs.filter.filter import NameSweep
+
+    Member = namedtuple("Member", "id display_name")
+    members = [Member(i, "bad name" if i % 3 == 0 else "good name") for i in range(1, 11)]
+    guild = namedtuple("Guild", "id members")(empty_guild.id, members)
+    await filter_cog.config.guild(guild).filter.set(["bad"])
+
+    renamed = []
+
+    async def maybe_filter_name(member):
+        renamed.append(member.id)
+        return True
+
+    monkeypatch.setattr(filter_cog, "maybe_filter_name", maybe_filter_name)
+    monkeypatch.setattr(filter_cog, "NAME_SWEEP_CHUNK_SIZE", 4)
+    # resumed after the member with ID 3
+    sweep = NameSweep({"last_id": 3, "checked": 3, "renamed": 1}, len(members))
+    filter_cog._name_sweeps[guild.id] = sweep
+    await filter_cog._sweep_names(guild, sweep)
+
+    assert renamed == [6, 9]
+    assert sweep.progress == {"last_id": 10, "checked": 10, "renamed": 3}
+    assert guild.id not in filter_cog._name_sweeps
+    assert await filter_cog.config.guild(guild).name_sweep() is None
+
+
+@pytest.mark.asyncio
+async def test_filter_hit_counts(filter_cog, member_factory, monkeypatch):
+    member = member_factory.get()
+    key = (member.guild.id, member.id)
+    now = time.time()
+
+    # the time frame starts at the first hit, not at the first message
+    assert not await filter_cog._count_filter_hit(member, now + 100, 3, 10)
+    assert not await filter_cog._count_filter_hit(member, now + 105, 3, 10)
+    assert await filter_cog._count_filter_hit(member, now + 109, 3, 10)
+    # a hit after the time frame ended starts a new one
+    assert not await filter_cog._count_filter_hit(member, now + 110, 3, 10)
+    assert filter_cog._filter_counts[key] == {"filter_count": 1, "next_reset_time": now + 120}
+
+    await filter_cog.checkpoint_filter_counts()
+    assert not filter_cog._dirty_filter_counts
+    assert await filter_cog.config.member(member).all() == filter_cog._filter_counts[key]
+    # counters whose time frame ended are dropped from memory once they're written
+    filter_cog._filter_counts[key]["next_reset_time"] = now - 1
+    await filter_cog.checkpoint_filter_counts()
+    assert key not in filter_cog._filter_counts
+
+    # counters that weren't written when the checkpoint was cancelled are kept for the next one
+    other = member_factory.get()
+    await filter_cog._count_filter_hit(member, now + 111, 3, 10)
+    # the dropped counter was loaded from Config again
+    assert filter_cog._filter_counts[key]["filter_count"] == 2
+    await filter_cog._count_filter_hit(other, now + 111, 3, 10)
+
+    def cancelled(*args):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(filter_cog.config, "member_from_ids", cancelled)
+    with pytest.raises(asyncio.CancelledError):
+        await filter_cog.checkpoint_filter_counts()
+    assert filter_cog._dirty_filter_counts == {key, (other.guild.id, other.id)}
+    monkeypatch.undo()
+    await filter_cog.checkpoint_filter_counts()
+    assert not filter_cog._dirty_filter_counts
+    assert await filter_cog.config.member(other).filter_count() == 1
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from redbot.pytest.mod import *
@@ -37,3 +39,112 @@ async def test_modlog_case_create(mod, ctx, member_factory):
 async def test_modlog_set_modlog_channel(mod, ctx):
     await mod.set_modlog_channel(ctx.guild, ctx.channel)
     assert await mod.get_modlog_channel(ctx.guild) == ctx.channel.id
+
+
+@pytest.mark.asyncio
+async def test_modlog_user_case_index(mod, ctx, member_factory):
+    from datetime import datetime, timezone
+
+    await test_modlog_register_casetype(mod)
+
+    guild = ctx.guild
+    bot = ctx.bot
+    usr = member_factory.get()
+    other = member_factory.get()
+    created_at = datetime.now(timezone.utc)
+    for user in (usr, other, usr):
+        case = await mod.create_case(bot, guild, created_at, "ban", user, ctx.author, "Test")
+
+    assert await mod.get_case_numbers_for_member(guild, member=usr) == [1, 3]
+    assert await mod.get_case_numbers_for_member(guild, member_id=other.id) == [2]
+
+    await case.edit({"user": other.id})
+    assert await mod.get_case_numbers_for_member(guild, member=usr) == [1]
+    assert await mod.get_case_numbers_for_member(guild, member=other) == [2, 3]
+
+    # an index that isn't built is built from the existing cases
+    await mod._config.custom(mod._USER_CASES).clear()
+    await mod._config.guild(guild).user_cases_indexed.clear()
+    assert await mod.get_case_numbers_for_member(guild, member=other) == [2, 3]
+    assert await mod.rebuild_case_index(guild) == 3
+
+    await mod.reset_cases(guild)
+    assert await mod.get_case_numbers_for_member(guild, member=usr) == []
+
+
+def test_repeat_tracker():
+    from redbot.cogs.mod.utils import RepeatTracker
+
+    tracker = RepeatTracker(3, max_size=2)
+    assert not tracker.add(1, "spam")
+    assert not tracker.add(1, "spam")
+    assert not tracker.add(2, "hello")
+    assert tracker.add(1, "spam")
+    # repeats beyond the limit keep being reported
+    assert tracker.add(1, "spam")
+    assert not tracker.add(1, "other")
+    # member 2 is the least recently active and gets evicted
+    tracker.add(3, "hello")
+    assert len(tracker) == 2
+    assert not tracker.add(2, "hello")
+    assert tracker.memory_usage() > 0
+
+    tracker = RepeatTracker(2, ttl=-1)
+    tracker.add(1, "spam")
+    # the previous message is already too old
+    assert not tracker.add(1, "spam")
+
+
+@pytest.mark.asyncio
+async def test_name_history_buffer(config):
+    from redbot.cogs.mod.events import Events
+    from redbot.cogs.mod.utils import MAX_NAME_HISTORY, buffer_name, merge_name_history
+
+    config.register_user(past_names=[])
+    await config.user_from_id(1).past_names.set(["a", None, "b"])
+    pending = {}
+    for name in ("b", "c", "a", "c"):
+        buffer_name(pending, 1, name)
+    buffer_name(pending, 2, "x")
+    assert list(pending[1]) == ["b", "a", "c"]
+
+    flushing, pending = pending, {}
+    await Events._flush_name_buffer(
+        flushing, pending, lambda user_id: config.user_from_id(user_id).past_names
+    )
+    assert not flushing and not pending
+    assert await config.user_from_id(1).past_names() == ["b", "a", "c"]
+    assert await config.user_from_id(2).past_names() == ["x"]
+
+    # merging what was already written doesn't change anything
+    assert merge_name_history(["b", "a", "c"], ["a", "c"]) == ["b", "a", "c"]
+    names = [str(i) for i in range(MAX_NAME_HISTORY + 5)]
+    assert merge_name_history([], names) == names[-MAX_NAME_HISTORY:]
+
+
+@pytest.mark.asyncio
+async def test_name_history_flushed_on_close(config, red, monkeypatch):
+    from redbot.cogs.mod import Mod
+    from redbot.cogs.mod.utils import buffer_name
+    from redbot.core import Config, drivers
+
+    class FakeDriver:
+        @classmethod
+        async def teardown(cls):
+            # nothing can be written after the driver is torn down
+            assert await config.user_from_id(1).past_names() == ["a"]
+
+    monkeypatch.setattr(Config, "get_conf", lambda *args, **kwargs: config)
+    monkeypatch.setattr(drivers, "get_driver_class", lambda: FakeDriver)
+    cog = Mod(red)
+    await cog.initialize()
+    buffer_name(cog._pending_names, 1, "a")
+    buffer_name(cog._pending_nicks, (2, 3), "b")
+
+    await red.close()
+    assert await config.user_from_id(1).past_names() == ["a"]
+    assert await config.member_from_ids(2, 3).past_nicks() == ["b"]
+
+    cog.cog_unload()
+    assert not red._shutdown_hooks
+    await asyncio.gather(cog.tban_expiry_task, cog._flush_names_task, return_exceptions=True)
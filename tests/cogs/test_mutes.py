@@ -0,0 +1,39 @@
+import asyncio
+from collections import namedtuple
+
+import pytest
+
+from redbot.cogs.mutes.overwrites import OverwriteBatch
+
+FakeChannel = namedtuple("FakeChannel", "id")
+
+
+@pytest.mark.asyncio
+async def test_overwrite_batch_cancel_resume_retry():
+    channels = [FakeChannel(idx) for idx in range(10)]
+    calls = []
+    batch = None
+
+    async def apply(channel):
+        calls.append(channel.id)
+        if channel.id == 3 and calls.count(3) == 1:
+            raise asyncio.TimeoutError
+        if channel.id == 4:
+            raise ValueError
+        if channel.id == 5:
+            batch.cancel()
+        return channel.id * 2
+
+    batch = OverwriteBatch("mute", channels, apply)
+    await batch.run()
+    assert not batch.finished
+    assert 0 < len(batch.remaining) < 10
+    assert batch.done + len(batch.remaining) == batch.total == 10
+
+    await batch.run()
+    assert batch.finished
+    assert batch.retries == 1
+    assert batch.results[3] == 6
+    assert isinstance(batch.results[4], ValueError)
+    # every channel is only applied once, apart from the retried one
+    assert sorted(calls) == sorted([*range(10), 3])
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from redbot.core.utils.caching import AsyncCache, async_memoize, get_cache_stats
+
+
+@pytest.mark.asyncio
+async def test_async_memoize_coalesces_calls():
+    calls = []
+
+    @async_memoize(maxsize=2, tags=lambda guild_id, user_id: (guild_id,))
+    async def fetch(guild_id, user_id):
+        calls.append((guild_id, user_id))
+        await asyncio.sleep(0)
+        return guild_id + user_id
+
+    assert await asyncio.gather(*(fetch(1, 2) for _ in range(5))) == [3] * 5
+    assert calls == [(1, 2)]
+    assert fetch.cache.stats.coalesced == 4
+
+    assert await fetch(1, 2) == 3
+    assert fetch.cache.stats.hits == 1
+
+    await fetch(1, 3)
+    await fetch(2, 3)
+    # evicted as the least recently used
+    assert (1, 2) not in fetch.cache
+    assert fetch.invalidate_tag(1) == 1
+    assert len(fetch.cache) == 1
+    assert fetch.invalidate(2, 3)
+    assert len(fetch.cache) == 0
+
+    assert any(s["name"] == fetch.cache.name for s in get_cache_stats())
+
+
+@pytest.mark.asyncio
+async def test_async_cache_errors_and_invalidation():
+    cache = AsyncCache(max_bytes=100, sizeof=len)
+
+    async def fail():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("a", fail)
+    assert "a" not in cache
+
+    cache.set("a", "x" * 60)
+    cache.set("b", "x" * 60)
+    assert "a" not in cache and cache.total_bytes == 60
+    cache.set("c", "x" * 101)
+    assert "c" not in cache
+
+    event = asyncio.Event()
+
+    async def slow():
+        await event.wait()
+        return "old"
+
+    task = asyncio.ensure_future(cache.get_or_load("d", slow))
+    await asyncio.sleep(0)
+    cache.invalidate("d")
+    event.set()
+    assert await task == "old"
+    # the value loaded before the invalidation isn't cached
+    assert "d" not in cache
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_user_coalesced(red, monkeypatch):
+    calls = []
+
+    async def fetch_user(user_id):
+        calls.append(user_id)
+        await asyncio.sleep(0)
+        if user_id == 404:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown User")
+        return SimpleNamespace(id=user_id)
+
+    monkeypatch.setattr(red, "fetch_user", fetch_user)
+
+    users = await red.get_or_fetch_users([1, 404, 1, 2])
+    assert sorted(users) == [1, 2]
+    for _ in range(2):
+        with pytest.raises(discord.NotFound):
+            await red.get_or_fetch_user(404)
+    assert (await red.get_or_fetch_user(1)).id == 1
+    assert sorted(calls) == [1, 2, 404]
@@ -49,3 +49,24 @@ async def test_remove_path(cog_mgr, tmpdir):
     await cog_mgr.add_path(path)
     await cog_mgr.remove_path(path)
     assert path not in await cog_mgr.paths()
+
+
+def test_resolve_load_order():
+    from redbot.core.bot import _resolve_load_order
+
+    dependencies = _resolve_load_order(
+        {
+            "a": set(),
+            "b": {"a", "not_loaded"},
+            "c": {"d"},
+            "d": {"c"},
+            "e": {"e", "b"},
+        }
+    )
+    assert dependencies == {"a": set(), "b": {"a"}, "c": set(), "d": set(), "e": {"b"}}
+
+    # only the dependencies between the members of a cycle are dropped
+    dependencies = _resolve_load_order(
+        {"a": {"b"}, "b": {"a", "d"}, "c": {"a"}, "d": set(), "e": {"c"}}
+    )
+    assert dependencies == {"a": set(), "b": {"d"}, "c": {"a"}, "d": set(), "e": {"c"}}
@@ -0,0 +1,21 @@
+import pytest
+
+from redbot.core._command_stats import LatencyHistogram
+
+
+def test_latency_histogram_percentiles():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(ms / 1000)
+
+    assert hist.count == 1000
+    assert hist.max == 1.0
+    assert hist.percentile(50) == pytest.approx(0.5, rel=0.1)
+    assert hist.percentile(99) == pytest.approx(0.99, rel=0.1)
+    assert hist.percentile(100) == 1.0
+
+
+def test_latency_histogram_empty():
+    hist = LatencyHistogram()
+    assert hist.percentile(95) == 0.0
+    assert hist.to_dict()["count"] == 0
@@ -7,6 +7,7 @@ from discord.ext import commands as dpy_commands
 
 from redbot.core import commands
 from redbot.core.commands import converter
+from redbot.core.utils._internal_utils import CommandIndex
 
 
 @pytest.fixture(scope="session")
@@ -65,3 +66,21 @@ def test_converter_relativedelta():
     assert converter.parse_relativedelta("1 year 10 days 3 seconds") == relativedelta(
         years=1, days=10, seconds=3
     )
+
+
+def test_command_index_search(coroutine):
+    index = CommandIndex()
+    grp = commands.group(name="cleanup")(coroutine)
+    grp.command(name="messages")(coroutine)
+    index.add(grp)
+    index.add(commands.command(name="ping")(coroutine))
+    index.add(commands.command(name="serverinfo")(coroutine))
+    assert len(index) == 4
+
+    assert [c.qualified_name for c, _ in index.search("pingg")] == ["ping"]
+    assert [c.qualified_name for c, _ in index.search("cleanup mesages")] == ["cleanup messages"]
+    assert index.search("userinfo") == []
+
+    index.remove(grp)
+    assert len(index) == 2
+    assert index.search("cleanup mesages", min_score=50) == []
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from contextvars import ContextVar
+
+import pytest
+
+from redbot.core import i18n
+
+
+def _write_po(path, translations):
+    lines = ['msgid ""', 'msgstr ""', ""]
+    for untranslated, translated in translations.items():
+        lines += [f'msgid "{untranslated}"', f'msgstr "{translated}"', ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+@pytest.fixture()
+def catalog_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(
+        i18n, "_get_catalog_cache_path", lambda po_path: cache_dir / f"{po_path.stem}.catalog"
+    )
+    return cache_dir
+
+
+def test_catalog_cache(tmp_path, catalog_cache, monkeypatch):
+    po_path = tmp_path / "fr-FR.po"
+    _write_po(po_path, {"Hello": "Bonjour"})
+    # the catalog is keyed by the locale it was asked for, not the current one
+    assert i18n.get_locale() != "fr-FR"
+    assert i18n._load_catalog(po_path, "fr-FR") == {"Hello": "Bonjour"}
+    assert (catalog_cache / "fr-FR.catalog").is_file()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the compiled catalog should have been used")
+
+    with monkeypatch.context() as m:
+        m.setattr(i18n, "_parse", fail)
+        assert i18n._load_catalog(po_path, "fr-FR") == {"Hello": "Bonjour"}
+
+    # modifying the file invalidates the compiled catalog
+    _write_po(po_path, {"Hello": "Salut", "Bye": "Au revoir"})
+    assert i18n._load_catalog(po_path, "fr-FR") == {"Hello": "Salut", "Bye": "Au revoir"}
+    assert i18n._load_catalog(tmp_path / "de-DE.po", "de-DE") == {}
+
+
+def test_resident_locales_eviction(tmp_path, catalog_cache, monkeypatch):
+    locales = ["fr-FR", "de-DE", "pl-PL"]
+    (tmp_path / "locales").mkdir()
+    for locale in locales:
+        _write_po(tmp_path / "locales" / f"{locale}.po", {"Hello": f"Hello in {locale}"})
+
+    monkeypatch.setattr(i18n, "MAX_RESIDENT_LOCALES", 2)
+    monkeypatch.setattr(i18n, "_resident_locales", OrderedDict())
+    monkeypatch.setattr(i18n, "_translators", [])
+    monkeypatch.setattr(i18n, "_global_locale", "fr-FR")
+    # contextual locales set by the test don't leak into the other tests
+    monkeypatch.setattr(i18n, "_current_locale", ContextVar("_current_locale", default="en-US"))
+    translator = i18n.Translator("Test", tmp_path / "test.py")
+
+    for locale in locales:
+        i18n.set_contextual_locale(locale)
+        assert translator("Hello") == f"Hello in {locale}"
+    # the global locale is never unloaded, the least recently used one is
+    assert set(translator.translations) == {"fr-FR", "pl-PL"}
+    assert list(i18n._resident_locales) == ["fr-FR", "pl-PL"]
+
+    # an unloaded locale is loaded again when it's needed
+    i18n.set_contextual_locale("de-DE")
+    assert translator("Hello") == "Hello in de-DE"
+    assert set(translator.translations) == {"fr-FR", "de-DE"}
@@ -0,0 +1,76 @@
+import logging
+import queue
+
+from redbot.logging import BatchingQueueListener, DroppingQueueHandler, RotatingFileHandler
+
+
+def _make_record(msg, *args):
+    return logging.makeLogRecord(
+        {"name": "red.test", "levelno": logging.INFO, "levelname": "INFO", "msg": msg, "args": args}
+    )
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_rotating_file_handler_counts_bytes(tmp_path):
+    handler = RotatingFileHandler(
+        stem="red", directory=tmp_path, maxBytes=100, backupCount=3, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        # 30 characters, but 60 bytes (61 with the newline)
+        handler.emit(_make_record("é" * 30))
+        assert handler._stream_size == 61
+        # wouldn't fit when counting bytes, so it starts a new file
+        handler.emit(_make_record("é" * 30))
+        assert handler.baseFilename.endswith("red-part2.log")
+        # the record that triggered the rollover is counted in the new file
+        assert handler._stream_size == 61
+        handler.emit(_make_record("abc"))
+        handler.flush()
+        assert handler._stream_size == 65
+    finally:
+        handler.close()
+    for path in tmp_path.iterdir():
+        assert path.stat().st_size <= 100
+    assert (tmp_path / "red-part1.log").read_bytes() == "é".encode() * 30 + b"\n"
+    assert (tmp_path / "red-part2.log").stat().st_size == 65
+
+
+def test_dropping_queue_handler():
+    q = queue.Queue(1)
+    handler = DroppingQueueHandler(q)
+    args = ["a"]
+    handler.handle(_make_record("%s", args))
+    # the message is rendered when the record is enqueued
+    args.append("b")
+    handler.handle(_make_record("dropped"))
+    assert handler.dropped == 1
+    record = q.get_nowait()
+    assert record.msg == "['a']" and record.args is None
+
+
+def test_batching_queue_listener():
+    q = queue.Queue(2)
+    queue_handler = DroppingQueueHandler(q)
+    target = _ListHandler()
+    listener = BatchingQueueListener(q, queue_handler, target, batch_size=8)
+    for idx in range(3):
+        queue_handler.handle(_make_record("record %s", idx))
+    listener.start()
+    queue_handler.handle(_make_record("record %s", 3))
+    listener.stop()
+    assert target.messages == [
+        "1 log records were dropped because the logging queue was full.",
+        "record 0",
+        "record 1",
+        "record 3",
+    ]
+    assert listener.processed == 3
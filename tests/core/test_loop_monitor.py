@@ -0,0 +1,40 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from redbot.core._loop_monitor import LoopLagMonitor
+
+
+def _block_the_loop():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_reports_blocking_call():
+    sent = []
+
+    async def send_to_owners(content):
+        sent.append(content)
+
+    bot = SimpleNamespace(extensions={}, cogs={}, send_to_owners=send_to_owners)
+    monitor = LoopLagMonitor(bot, threshold=0.1, interval=0.02)
+    monitor.start()
+    task = monitor._task
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop()
+        # the heartbeat notices the report once the loop recovers
+        for __ in range(50):
+            await asyncio.sleep(0.02)
+            if sent:
+                break
+    finally:
+        monitor.stop()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert len(sent) == 1
+    assert "_block_the_loop" in sent[0]
+    assert "Owning cog: unknown" in sent[0]
+    assert monitor.lag.count > 0
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import pytest
+
+from redbot.core.settings_caches import GuildSettingsSnapshot
+
+mock_channel = namedtuple("Channel", "id guild")
+
+
+@pytest.mark.asyncio
+async def test_guild_settings_embed_requested(red, empty_guild, empty_user):
+    snapshot = GuildSettingsSnapshot(red._config)
+    channel = mock_channel(1234, empty_guild)
+
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is True
+
+    # cached until invalidated
+    await red._config.embeds.set(False)
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is True
+    snapshot.invalidate_global()
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is False
+
+    await red._config.custom("COMMAND", "ping", 0).embeds.set(True)
+    snapshot.invalidate_command_embeds()
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is True
+    assert await snapshot.embed_requested(channel, empty_user, "info") is False
+
+    await red._config.guild(empty_guild).embeds.set(False)
+    snapshot.invalidate_guild(empty_guild.id)
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is False
+
+    await red._config.custom("COMMAND", "ping", empty_guild.id).embeds.set(True)
+    snapshot.invalidate_command_embeds()
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is True
+
+    await red._config.channel_from_id(channel.id).embeds.set(False)
+    snapshot.invalidate_channel(channel.id)
+    assert await snapshot.embed_requested(channel, empty_user, "ping") is False
+
+
+@pytest.mark.asyncio
+async def test_guild_settings_automod_immune(red, empty_guild):
+    snapshot = GuildSettingsSnapshot(red._config)
+    assert snapshot.get_cached_guild(empty_guild.id) is None
+
+    await red._config.guild(empty_guild).autoimmune_ids.set([1, 2])
+    settings = await snapshot.get_guild(empty_guild.id)
+    assert snapshot.get_cached_guild(empty_guild.id) is settings
+    assert settings.is_automod_immune([3, 2])
+    assert not settings.is_automod_immune([3, 4])
+
+    await red._config.guild(empty_guild).autoimmune_ids.set([])
+    snapshot.invalidate_guild(empty_guild.id)
+    assert not (await snapshot.get_guild(empty_guild.id)).is_automod_immune([2])
+
+
+@pytest.mark.asyncio
+async def test_guild_settings_embeds_bounded(red, empty_guild, empty_user):
+    snapshot = GuildSettingsSnapshot(red._config)
+    snapshot._channel_embeds.maxsize = 2
+    channels = [mock_channel(channel_id, empty_guild) for channel_id in range(1, 4)]
+
+    await red._config.channel_from_id(1).embeds.set(False)
+    for channel in channels:
+        await snapshot.embed_requested(channel, empty_user)
+    # the least recently used channel is evicted, and loaded again when it's needed
+    assert 1 not in snapshot._channel_embeds
+    assert len(snapshot._channel_embeds) == 2
+    assert await snapshot.embed_requested(channels[0], empty_user) is False
+
+    snapshot.invalidate_channel(1)
+    assert 1 not in snapshot._channel_embeds
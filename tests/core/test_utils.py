@@ -2,13 +2,24 @@ import asyncio
 import pytest
 import random
 import textwrap
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from discord.ext.commands.view import StringView
+
+from redbot.core import commands
 from redbot.core.utils import (
     chat_formatting,
     bounded_gather,
     bounded_gather_iter,
+    bounded_gather_stream,
     deduplicate_iterables,
     common_filters,
 )
+from redbot.core.utils.antispam import AntiSpam, AntiSpamManager, antispam_check
+from redbot.core.utils.menus import AsyncIterPageSource, IndexedPageSource
+from redbot.core.utils.scheduling import Scheduler
 
 
 def test_bordered_symmetrical():
@@ -65,6 +76,25 @@ def test_bordered_ascii():
     assert chat_formatting.bordered(col1, col2, ascii_border=True) == expected
 
 
+def test_pagify_chunks():
+    text = "".join(f"line {i}\n" for i in range(500))
+    expected = list(chat_formatting.pagify(text, page_length=200))
+    assert all(len(page) <= 192 for page in expected)
+    assert "".join(expected) == text
+    chunks = (f"line {i}\n" for i in range(500))
+    assert list(chat_formatting.pagify(chunks, page_length=200)) == expected
+
+
+def test_pagify_balance_code_blocks():
+    text = "Output:\n```py\n" + "print('hello')\n" * 100 + "```\nDone."
+    pages = list(chat_formatting.pagify(text, page_length=300, balance_code_blocks=True))
+    assert len(pages) > 1
+    for page in pages:
+        assert len(page) <= 292
+        assert page.count("```") % 2 == 0
+    assert all(page.startswith("```py\n") for page in pages[1:])
+
+
 def test_deduplicate_iterables():
     expected = [1, 2, 3, 4, 5]
     inputs = [[1, 2, 1], [3, 1, 2, 4], [5, 1, 2]]
@@ -193,6 +223,173 @@ async def test_bounded_gather_iter_cancel():
     assert num_failed <= num_fail
 
 
+@pytest.mark.asyncio
+async def test_bounded_gather_stream():
+    status = [0, 0]  # started, running
+
+    async def wait_task(i, delay):
+        status[0] += 1
+        status[1] += 1
+        assert status[1] <= 3
+        await asyncio.sleep(delay)
+        status[1] -= 1
+        if i % 10 == 9:
+            raise RuntimeError
+        return i
+
+    def tasks():
+        i = 0
+        while True:
+            yield wait_task(i, random.random() / 1000)
+            i += 1
+
+    results = []
+    async for result in bounded_gather_stream(tasks(), limit=3, return_exceptions=True):
+        results.append(result)
+        if len(results) == 30:
+            break
+    assert [r for r in results if not isinstance(r, RuntimeError)] == [
+        i for i in range(30) if i % 10 != 9
+    ]
+    # no more than 2 * limit awaitables are taken ahead of the consumer
+    assert status[0] <= 36
+
+    with pytest.raises(RuntimeError):
+        async for result in bounded_gather_stream(tasks(), limit=3):
+            pass
+
+
 def test_normalize_smartquotes():
     assert common_filters.normalize_smartquotes("Should\u2018 normalize") == "Should' normalize"
     assert common_filters.normalize_smartquotes("Same String") == "Same String"
+
+
+def test_antispam_intervals():
+    antispam = AntiSpam([(timedelta(hours=1), 3), (timedelta(seconds=-1), 1)])
+    assert antispam.last_stamp is None
+    antispam.stamp()
+    antispam.stamp()
+    # the negative period can never be exceeded
+    assert not antispam.spammy
+    antispam.stamp()
+    assert antispam.spammy
+
+    # nothing is allowed in an interval with a frequency of 0
+    assert AntiSpam([(timedelta(seconds=5), 0)]).spammy
+
+
+def test_antispam_manager_max_size():
+    manager = AntiSpamManager([(timedelta(hours=1), 1)], max_size=2)
+    manager.stamp(1)
+    manager.stamp(2)
+    manager.stamp(1)
+    manager.stamp(3)
+    assert len(manager) == 2
+    assert 2 not in manager
+    assert manager.spammy(1) and manager.spammy(3)
+    assert not manager.spammy(4)
+    assert 4 not in manager
+
+    # stamping the instance directly (like `ctx.antispam.stamp()`) keeps the key too
+    manager.get(1).stamp()
+    manager.stamp(5)
+    assert 1 in manager and 3 not in manager
+
+
+@pytest.mark.asyncio
+async def test_antispam_check_counts_invocations(red, monkeypatch):
+    @commands.command()
+    @antispam_check([(timedelta(hours=1), 1)])
+    async def spam(ctx):
+        pass
+
+    async def verify(ctx):
+        return True
+
+    monkeypatch.setattr(spam.requires, "verify", verify)
+    red._red_ready.set()
+    manager = spam.callback.__antispam_manager__
+
+    def make_ctx():
+        return SimpleNamespace(
+            bot=red,
+            command=None,
+            guild=SimpleNamespace(id=1),
+            author=SimpleNamespace(id=2),
+            antispam=None,
+            view=StringView(""),
+            args=[],
+            kwargs={},
+            _timing=None,
+            permission_state=commands.PermState.NORMAL,
+        )
+
+    ctx = make_ctx()
+    # checking whether the command can be used (e.g. by help) doesn't stamp
+    for _ in range(3):
+        assert await spam.can_see(ctx)
+    assert ctx.antispam is None
+    assert not manager.spammy((1, 2))
+
+    await spam.prepare(ctx)
+    assert ctx.antispam is manager.get((1, 2))
+    assert manager.spammy((1, 2))
+    assert not await spam.can_see(make_ctx())
+
+
+@pytest.mark.asyncio
+async def test_lazy_page_sources():
+    rendered = []
+
+    def render(page_number):
+        rendered.append(page_number)
+        return str(page_number)
+
+    source = IndexedPageSource(1000, render, cache_size=2)
+    assert [await source.get_page(n) for n in (0, 1, 0, 2, 1)] == ["0", "1", "0", "2", "1"]
+    assert rendered == [0, 1, 2, 1]
+    with pytest.raises(IndexError):
+        await source.get_page(1000)
+
+    consumed = []
+
+    async def entries():
+        for i in range(25):
+            consumed.append(i)
+            yield i
+
+    source = AsyncIterPageSource(entries(), per_page=10, render=lambda e, n: f"{n}: {sum(e)}")
+    await source.prepare()
+    assert source.get_max_pages() is None and source.is_paginating()
+    assert await source.get_page(1) == f"1: {sum(range(10, 20))}"
+    assert len(consumed) < 25
+    assert await source.get_page(2) == f"2: {sum(range(20, 25))}"
+    assert source.get_max_pages() == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduler():
+    calls = []
+    done = asyncio.Event()
+
+    async def callback(keys):
+        calls.append(sorted(keys))
+        if len(calls) == 2:
+            done.set()
+
+    scheduler = Scheduler(callback)
+    now = time.time()
+    scheduler.schedule("a", now + 60)
+    scheduler.schedule("b", now - 1)
+    scheduler.schedule("c", now - 1)
+    scheduler.schedule("d", now + 60)
+    scheduler.unschedule("d")
+    scheduler.start()
+    await asyncio.sleep(0.01)
+    assert calls == [["b", "c"]]
+    # rescheduling to an earlier time wakes the sleeping scheduler up
+    scheduler.schedule("a", time.time() + 0.01)
+    await asyncio.wait_for(done.wait(), 1)
+    await scheduler.close()
+    assert calls == [["b", "c"], ["a"]]
+    assert len(scheduler) == 0
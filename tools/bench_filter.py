@@ -0,0 +1,84 @@
+#!/usr/bin/env python3.8
+"""Script to benchmark the word matching of the Filter cog.
+
+What this script does
+---------------------
+For a range of word list sizes, it generates random filtered words and
+messages, and measures building and matching with:
+
+- the alternation regex (``\\bword1\\b|\\bword2\\b|...``) the Filter cog used before,
+- `WordMatcher`, which the Filter cog uses now.
+
+It also checks that `WordMatcher` finds everything the regex does.
+
+Usage
+-----
+    python tools/bench_filter.py --sizes 10 100 1000 10000 --messages 1000
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from redbot.cogs.filter.matcher import WordMatcher
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+
+
+def generate_message(rng: random.Random, words: list, length: int) -> str:
+    parts = []
+    while sum(map(len, parts)) < length:
+        if rng.random() < 0.01:
+            parts.append(rng.choice(words).upper())
+        else:
+            parts.append(random_word(rng))
+    return " ".join(parts)
+
+
+def timed(func):
+    start = time.perf_counter()
+    ret = func()
+    return ret, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the word matching of Filter.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--messages", type=int, default=1000, help="Messages per size.")
+    parser.add_argument("--length", type=int, default=200, help="Characters per message.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'words':>8} | {'regex build':>12} {'regex/msg':>10} |"
+        f" {'matcher build':>14} {'matcher/msg':>12} | {'speedup':>8}"
+    )
+    for size in args.sizes:
+        words = list({random_word(rng) for _ in range(size)})
+        messages = [generate_message(rng, words, args.length) for _ in range(args.messages)]
+
+        pattern, regex_build = timed(
+            lambda: re.compile("|".join(rf"\b{re.escape(w)}\b" for w in words), flags=re.I)
+        )
+        regex_hits, regex_time = timed(lambda: [set(pattern.findall(m)) for m in messages])
+
+        matcher, matcher_build = timed(lambda: WordMatcher(words))
+        matcher_hits, matcher_time = timed(lambda: [matcher.find_all(m) for m in messages])
+
+        for expected, found in zip(regex_hits, matcher_hits):
+            assert expected <= found, (expected, found)
+
+        print(
+            f"{len(words):>8} | {regex_build * 1000:>10.1f}ms"
+            f" {regex_time / len(messages) * 1e6:>8.1f}us |"
+            f" {matcher_build * 1000:>12.1f}ms {matcher_time / len(messages) * 1e6:>10.1f}us |"
+            f" {regex_time / matcher_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3.8
+"""Script to benchmark loading of translations.
+
+What this script does
+---------------------
+It generates a number of fake cogs with translation files for a few locales
+in a temporary directory, creates a `Translator` for each of them (just like
+cogs do when they're imported), and measures:
+
+- creating the translators,
+- loading a locale for the first time, when the catalogs have to be parsed and compiled,
+- loading a locale from the compiled catalog cache (e.g. on the next startup),
+- switching the contextual locale between guilds with different locales
+  and translating a string, as it's done for every command.
+
+Usage
+-----
+    python tools/bench_i18n.py --cogs 40 --strings 400
+"""
+import argparse
+import pathlib
+import tempfile
+import time
+
+from redbot.core import data_manager, i18n
+
+LOCALES = ("de-DE", "fr-FR", "pl-PL", "es-ES", "ru-RU")
+
+
+def generate_cog(folder: pathlib.Path, strings: int) -> None:
+    locales_folder = folder / "locales"
+    locales_folder.mkdir(parents=True)
+    for locale in LOCALES:
+        lines = ['msgid ""', 'msgstr ""', f'"Language: {locale}\\n"', ""]
+        for i in range(strings):
+            lines += [
+                f"#: {folder.name}.py:{i}",
+                f'msgid "String number {i}\\n"',
+                '"with a second line."',
+                f'msgstr "{locale} string {i}\\n"',
+                f'"{locale} second line."',
+                "",
+            ]
+        (locales_folder / f"{locale}.po").write_text("\n".join(lines), encoding="utf-8")
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:>45}: {(time.perf_counter() - start) * 1000:>9.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark loading of translations.")
+    parser.add_argument("--cogs", type=int, default=40, help="Number of translators.")
+    parser.add_argument("--strings", type=int, default=400, help="Strings per catalog.")
+    parser.add_argument("--switches", type=int, default=10_000, help="Locale switches.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = pathlib.Path(tmpdir)
+        data_manager.basic_config = data_manager.basic_config_default.copy()
+        data_manager.basic_config["DATA_PATH"] = str(base / "data")
+        cog_files = []
+        for i in range(args.cogs):
+            cog_folder = base / "cogs" / f"cog{i}"
+            generate_cog(cog_folder, args.strings)
+            cog_files.append(cog_folder / "__init__.py")
+
+        translators = []
+        timed(
+            f"Creating {args.cogs} translators",
+            lambda: translators.extend(
+                i18n.Translator(f"Cog{i}", path) for i, path in enumerate(cog_files)
+            ),
+        )
+
+        def load_all() -> None:
+            for locale in LOCALES:
+                i18n.set_contextual_locale(locale)
+                for translator in translators:
+                    translator("String number 0\nwith a second line.")
+
+        timed(f"Loading {len(LOCALES)} locales (parsing)", load_all)
+        for translator in translators:
+            translator.translations.clear()
+        timed(f"Loading {len(LOCALES)} locales (compiled cache)", load_all)
+
+        def switch_locales() -> None:
+            for i in range(args.switches):
+                i18n.set_contextual_locale(LOCALES[i % len(LOCALES)])
+                translators[i % len(translators)]("String number 1\nwith a second line.")
+
+        timed(f"{args.switches} locale switches with a lookup", switch_locales)
+
+
+if __name__ == "__main__":
+    main()
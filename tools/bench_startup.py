@@ -0,0 +1,141 @@
+#!/usr/bin/env python3.8
+"""Script to benchmark Red's startup time.
+
+What this script does
+---------------------
+It starts a number of fresh interpreters, each of which brings up Red on
+a throwaway instance (JSON storage in a temporary directory) up to the point
+where it would connect to Discord. The median time of every startup phase
+is then printed, and optionally compared against a baseline saved earlier,
+so that regressions in the import time or the pre-flight can be caught.
+
+The Discord gateway is never contacted - startup stops right before ``Red.start()``
+would be called, with the given cogs (``--load-cogs``) loaded by the pre-flight.
+
+Usage
+-----
+Save a baseline before making changes::
+
+    python tools/bench_startup.py --save-baseline startup_baseline.json
+
+and compare against it afterwards::
+
+    python tools/bench_startup.py --baseline startup_baseline.json
+
+The exit code is 1 when any phase got slower than the baseline by more than
+the allowed tolerance (20% by default) and by at least 10ms.
+"""
+import argparse
+import json
+import statistics
+import subprocess as sp
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PHASES = ("interpreter", "imports", "bot_creation", "driver_init", "pre_flight", "total")
+
+
+def run_child(load_cogs: List[str]) -> None:
+    import_start = time.perf_counter()
+    import asyncio
+    import tempfile
+
+    import redbot.__main__  # noqa: F401 - the import is what is being measured
+    from redbot.core import data_manager, drivers
+    from redbot.core.bot import Red
+    from redbot.core.cli import parse_cli_flags
+
+    timings = {"imports": time.perf_counter() - import_start}
+
+    tmpdir = tempfile.TemporaryDirectory()
+    data_manager.basic_config = data_manager.basic_config_default.copy()
+    data_manager.basic_config["DATA_PATH"] = tmpdir.name
+    data_manager.basic_config["STORAGE_TYPE"] = "JSON"
+    data_manager.basic_config["STORAGE_DETAILS"] = {}
+    data_manager.instance_name = "bench_startup"
+
+    async def bring_up() -> None:
+        args = ["bench_startup", "--no-prompt", "--loop-lag-threshold", "0"]
+        if load_cogs:
+            args += ["--load-cogs", *load_cogs]
+        cli_flags = parse_cli_flags(args)
+
+        start = time.perf_counter()
+        red = Red(cli_flags=cli_flags, description="Red V3", dm_help=None)
+        timings["bot_creation"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        driver_cls = drivers.get_driver_class()
+        await driver_cls.initialize(**data_manager.storage_details())
+        timings["driver_init"] = time.perf_counter() - start
+        # normally created by run_bot()
+        (data_manager.cog_data_path(raw_name="Downloader") / "lib").mkdir(parents=True)
+
+        start = time.perf_counter()
+        await red.pre_flight(cli_flags=cli_flags)
+        timings["pre_flight"] = time.perf_counter() - start
+
+        await driver_cls.teardown()
+
+    asyncio.run(bring_up())
+    tmpdir.cleanup()
+    print(json.dumps(timings))
+
+
+def run_once(load_cogs: List[str]) -> Dict[str, float]:
+    args = [sys.executable, __file__, "--child"]
+    if load_cogs:
+        args += ["--load-cogs", *load_cogs]
+    start = time.perf_counter()
+    proc = sp.run(args, stdout=sp.PIPE, check=True)
+    total = time.perf_counter() - start
+    timings = json.loads(proc.stdout.decode().strip().splitlines()[-1])
+    timings["total"] = total
+    timings["interpreter"] = total - sum(timings[phase] for phase in PHASES[1:-1])
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Red's startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of startups to measure.")
+    parser.add_argument("--load-cogs", nargs="+", default=[], help="Cogs loaded during startup.")
+    parser.add_argument("--save-baseline", type=Path, help="Save the results to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare the results against this file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown compared to the baseline, as a fraction.",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.load_cogs)
+        return 0
+
+    results = [run_once(args.load_cogs) for _ in range(args.runs)]
+    medians = {phase: statistics.median(r[phase] for r in results) for phase in PHASES}
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    regressed = False
+    for phase in PHASES:
+        line = f"{phase:>14}: {medians[phase] * 1000:>9.1f}ms"
+        if phase in baseline:
+            change = medians[phase] / baseline[phase] - 1
+            line += f"  ({change:+.1%} vs baseline)"
+            # tiny phases are too noisy to be compared relatively
+            if change > args.tolerance and medians[phase] - baseline[phase] > 0.01:
+                line += "  REGRESSION"
+                regressed = True
+        print(line)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(medians, indent=4))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())